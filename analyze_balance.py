@@ -10,12 +10,92 @@ This script analyzes the difficulty balance of each chapter and wave by:
 5. Grading each wave on difficulty
 """
 
+import argparse
+import bisect
+import csv
+import fnmatch
+import hashlib
 import json
 import math
 import os
+import re
+import sys
 from pathlib import Path
 from typing import Dict, List, Tuple
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass, field
+
+try:
+    import numpy as np
+except ImportError:  # Only the batch (vectorized) modes need NumPy
+    np = None
+
+# Grade bands, best first: a ratio gets the first label whose threshold it reaches
+WAVE_GRADE_THRESHOLDS = (2.0, 1.5, 1.2, 1.0, 0.8, 0.6)
+WAVE_GRADE_LABELS = (
+    "A+ (Very Easy)",
+    "A (Easy)",
+    "B (Balanced)",
+    "C (Challenging)",
+    "D (Hard)",
+    "E (Very Hard)",
+    "F (Nearly Impossible)",
+)
+BULLET_GRADE_THRESHOLDS = (3.0, 2.0, 1.5, 1.2, 1.0, 0.8)
+BULLET_GRADE_LABELS = (
+    "A+ (Plenty of Ammo)",
+    "A (Comfortable)",
+    "B (Adequate)",
+    "C (Tight)",
+    "D (Very Tight)",
+    "E (Insufficient)",
+    "F (Critical Shortage)",
+)
+SPAWN_PRESSURE_TAG = " [Spawn Pressure!]"
+
+# Problem waves each summary list keeps when streaming a corpus (--stream)
+STREAM_LISTED_WAVES = 50
+
+# Timer points a (perfect) player adds per second while catching a timer
+CATCH_POINTS_PER_SECOND = 8.0
+
+def wave_catch_speed(wave: Dict) -> float:
+    """Timer catch speed for a wave: the value a calibration profile fitted for it, else the default"""
+    return wave.get('calibration', {}).get('catchPointsPerSecond', CATCH_POINTS_PER_SECOND)
+
+def wave_calibrations(chapters) -> List[Dict]:
+    """Every wave's calibration block (None if uncalibrated), in campaign order"""
+    return [wave.get('calibration') for chapter in chapters for wave in chapter['waves']]
+
+def restore_calibrations(analyzer: "BalanceAnalyzer", calibrations: List[Dict]):
+    """Re-apply wave_calibrations output to a freshly loaded analyzer, e.g. in a worker process"""
+    if not any(calibrations):
+        return
+    # Decode any lazily loaded chapters so the edits stick
+    analyzer.chapters = list(analyzer.chapters)
+    waves = (wave for chapter in analyzer.chapters for wave in chapter['waves'])
+    for wave, calibration in zip(waves, calibrations):
+        if calibration is not None:
+            wave['calibration'] = calibration
+
+def without_calibration(chapter: Dict) -> Dict:
+    """Copy of a chapter with the analysis-only calibration blocks dropped, fit to write out as game config"""
+    waves = [{key: value for key, value in wave.items() if key != 'calibration'} for wave in chapter['waves']]
+    return {**chapter, 'waves': waves}
+
+def pattern_columns(pattern: Dict) -> int:
+    """Columns a zomboid pattern spawns across (both when unspecified)"""
+    return max(len(pattern.get('columns', ('left', 'right'))), 1)
+
+def grade_index(ratio: float, thresholds: Tuple[float, ...]) -> int:
+    """Index of the first grade band whose threshold the ratio reaches"""
+    for index, threshold in enumerate(thresholds):
+        if ratio >= threshold:
+            return index
+    return len(thresholds)
+
+def require_numpy():
+    if np is None:
+        raise ImportError("NumPy is required for batch analysis (pip install numpy)")
 
 @dataclass
 class WeaponStats:
@@ -25,6 +105,9 @@ class WeaponStats:
     fire_rate: float  # Time between shots in seconds
     damage: int
     projectile_count: int
+    penetration_damage: int = 0  # Damage a projectile can pass on through targets (0 = stops at first hit)
+    projectile_speed: float = 400  # Pixels per second up the screen
+    projectile_size: int = 8
 
     def dps(self) -> float:
         """Damage per second"""
@@ -38,6 +121,181 @@ class ZomboidStats:
     id: str
     health: int
     speed: int
+    half_width: float = 15  # Collision box half width (see zomboid_half_width)
+
+def zomboid_half_width(zomboid: Dict) -> float:
+    """Collision half width: circles and hexagons by radius, squares by width (Zomboid.renderShape defaults)"""
+    if zomboid.get('shape') == 'square':
+        return zomboid.get('width', 30) / 2
+    return zomboid.get('radius', 18 if zomboid.get('shape') == 'hexagon' else 15)
+
+@dataclass
+class TimerStats:
+    id: str
+    start_value: int
+    speed: float          # Pixels per second down the screen
+    height: int
+    instant_reward: str   # 'hero' or 'weapon_upgrade'
+    reward_count: int
+
+@dataclass(frozen=True)
+class HeroLimits:
+    """Squad size bounds from heroes.json"""
+    default_count: int = 1
+    min_count: int = 1
+    max_count: int = 5
+    spacing: int = 15                # Vertical gap between heroes in the column
+    position_from_bottom: int = 100  # Column centre, measured up from the bottom of the screen
+
+@dataclass
+class FieldGeometry:
+    """Playfield layout from game-settings.json"""
+    screen_height: int = 1280
+    safe_zone_height: int = 150
+    spawn_zone_height: int = 100
+    fps: int = 60
+    screen_width: int = 720
+    boundary_padding: int = 60
+
+    SNAP_COUNT = 12  # HeroManager snap positions; WaveManager spawns a column on half of them
+
+    @property
+    def lane_length(self) -> int:
+        """Distance a zomboid walks from spawning to reaching the safe zone"""
+        return self.screen_height - self.safe_zone_height + self.spawn_zone_height
+
+    @property
+    def snap_spacing(self) -> float:
+        return (self.screen_width - 2 * self.boundary_padding) / (self.SNAP_COUNT - 1)
+
+    def snap_lanes(self, reach: float) -> int:
+        """Snap positions of one column a straight shot overlaps, for projectile + zomboid half widths `reach`"""
+        beside = max(math.ceil(reach / self.snap_spacing) - 1, 0)
+        return min(1 + 2 * beside, self.SNAP_COUNT // 2)
+
+@dataclass
+class ZomboidRecord:
+    type: str
+    count: int
+    hp_per_unit: int  # None for a type missing from zomboids.json
+
+    @property
+    def total_hp(self) -> int:
+        return self.count * self.hp_per_unit if self.hp_per_unit is not None else 0
+
+@dataclass
+class SegmentRecord:
+    """One timeline phase: shooting with a weapon tier, or catching a timer"""
+    tier: int
+    length: float
+    is_catch: bool = False
+    weapon_name: str = None  # None while catching, or if the tier has no weapon
+    dps: float = 0.0
+    damage: float = 0.0
+    shots: float = 0.0
+    projectile_count: int = 0
+    bullets: float = 0.0
+
+@dataclass
+class PressureRecord:
+    phase_name: str
+    spawn_hp_per_sec: float
+    dps: float
+
+@dataclass
+class KillRecord:
+    type: str
+    count: int
+    health: int
+    bullets: int
+    overkill: int
+    tier: int = None  # Weapon tier the pattern is costed against
+
+@dataclass(frozen=True)
+class KillCost:
+    """
+    Steady-state kill cost: `bullets` projectiles kill `kills` zomboids, wasting `waste` damage.
+    A projectile hits each zomboid at most once, so no group dies in fewer than
+    `hits_to_kill` projectiles however far they penetrate.
+    """
+    bullets: int
+    kills: int
+    waste: int
+    hits_to_kill: int = 1
+
+    def bullets_for(self, count: int) -> int:
+        if count <= 0:
+            return 0
+        return max(-(-count * self.bullets // self.kills), self.hits_to_kill)
+
+    def waste_for(self, count: int) -> int:
+        return count * self.waste // self.kills
+
+def simulate_kill_cost(health: int, damage: int, penetration: int, depth: int = None,
+                       max_bullets: int = 100000) -> KillCost:
+    """
+    Bullets per kill against a column of identical zomboids, following
+    CollisionManager.handleCollisions: a projectile hits the front-most live
+    zomboids once each, and each hit absorbs min(remaining HP, damage). A
+    penetrating projectile keeps going until the absorbed damage reaches its
+    penetrationDamage; any other stops at its first hit. Only `depth`
+    zomboids are alive in the column at once (None = no limit), so no
+    projectile hits more than that. Penetration only charges absorbed
+    damage, so the excess of a kill is waste only on the projectile's last
+    hit.
+
+    The front of the column is kept as runs of [hp, count] for damaged
+    zomboids (full-health ones follow); the cost is measured over the first
+    repeated state, so it is exact for the steady state.
+    """
+    damage = max(damage, 1)
+    hits_to_kill = -(-health // damage)
+    runs: List[Tuple[int, int]] = []
+    seen = {}
+    bullets = kills = waste = 0
+    while True:
+        state = tuple(runs)
+        if state in seen:
+            first_bullets, first_kills, first_waste = seen[state]
+            return KillCost(bullets - first_bullets, kills - first_kills, waste - first_waste, hits_to_kill)
+        if bullets >= max_bullets:
+            return KillCost(bullets, kills, waste, hits_to_kill)
+        seen[state] = (bullets, kills, waste)
+
+        bullets += 1
+        budget = penetration
+        reach = math.inf if depth is None else max(depth, 1)
+        hit_runs = []
+        index = 0
+        while True:
+            if index < len(runs):
+                hp, count = runs[index]
+            else:
+                hp, count = health, math.inf
+            index += 1
+            absorbed = min(hp, damage)
+            hits = min(count, reach, -(-budget // absorbed)) if penetration > 0 else 1
+            budget -= hits * absorbed
+            reach -= hits
+            if hp <= damage:
+                kills += hits
+            else:
+                hit_runs.append((hp - damage, hits))
+            if hits < count or budget <= 0 or reach <= 0 or penetration <= 0:
+                if hp <= damage:
+                    waste += damage - hp
+                if hits < count and count != math.inf:
+                    hit_runs.append((hp, count - hits))
+                hit_runs.extend(runs[index:])
+                break
+
+        # Merge neighbouring runs at the same HP so equal states compare equal
+        runs = []
+        for hp, count in hit_runs:
+            if runs and runs[-1][0] == hp:
+                runs[-1] = (hp, runs[-1][1] + count)
+            else:
+                runs.append((hp, count))
 
 @dataclass
 class WaveAnalysis:
@@ -50,65 +308,1039 @@ class WaveAnalysis:
     damage_capacity: float
     overkill_ratio: float  # damage_capacity / total_hp (>1 is good, <1 is hard)
     grade: str
-    details: List[str]
     bullets_available: int = 0
     bullets_needed: int = 0
     bullet_ratio: float = 0.0
     bullet_grade: str = ""
     overkill_waste: int = 0
+    # Structured breakdown; text is only rendered when details are requested
+    zomboids: List[ZomboidRecord] = field(default_factory=list)
+    segments: List[SegmentRecord] = field(default_factory=list)
+    pressure: List[PressureRecord] = field(default_factory=list)
+    kills: List[KillRecord] = field(default_factory=list)
+
+    SUMMARY_FIELDS = (
+        'wave_id', 'wave_name', 'duration', 'total_zomboid_hp', 'weapon_tier_start', 'weapon_tier_end',
+        'damage_capacity', 'overkill_ratio', 'grade', 'bullets_available', 'bullets_needed',
+        'bullet_ratio', 'bullet_grade', 'overkill_waste',
+    )
+
+    @property
+    def details(self) -> List[str]:
+        """Human-readable breakdown, rendered on demand"""
+        return render_wave_details(self)
+
+    def summary(self) -> Dict:
+        """Flat numeric record (no breakdown lists), e.g. for CSV output"""
+        record = {name: getattr(self, name) for name in self.SUMMARY_FIELDS}
+        record['spawn_pressure'] = bool(self.pressure)
+        return record
+
+    def record(self, include_details: bool = False) -> Dict:
+        """Summary record, plus the structured breakdown lists when include_details is set"""
+        record = self.summary()
+        if include_details:
+            for name in ('zomboids', 'segments', 'pressure', 'kills'):
+                record[name] = [asdict(item) for item in getattr(self, name)]
+        return record
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "WaveAnalysis":
+        """Inverse of dataclasses.asdict"""
+        data = dict(data)
+        data['zomboids'] = [ZomboidRecord(**record) for record in data.get('zomboids', [])]
+        data['segments'] = [SegmentRecord(**record) for record in data.get('segments', [])]
+        data['pressure'] = [PressureRecord(**record) for record in data.get('pressure', [])]
+        data['kills'] = [KillRecord(**record) for record in data.get('kills', [])]
+        return cls(**data)
+
+def render_wave_details(analysis: WaveAnalysis) -> List[str]:
+    """Detail lines shown for problem waves in the text report"""
+    details = ["Zomboids:"]
+    for zomboid in analysis.zomboids:
+        if zomboid.hp_per_unit is None:
+            details.append(f"  - {zomboid.type}: UNKNOWN TYPE")
+        else:
+            details.append(f"  - {zomboid.type}: {zomboid.count} × {zomboid.hp_per_unit}HP = {zomboid.total_hp}HP")
+
+    details.append("Damage Output:")
+    for segment in analysis.segments:
+        if segment.is_catch:
+            if segment.length > 0:
+                details.append(f"  - [CATCHING TIMER] for {segment.length:.1f}s - NO DAMAGE (enemies accumulate!)")
+        elif segment.weapon_name is not None:
+            details.append(
+                f"  - T{segment.tier} ({segment.weapon_name}) for {segment.length:.1f}s @ {segment.dps:.1f} DPS = {segment.damage:.0f} damage"
+            )
+
+    if analysis.pressure:
+        details.append("Spawn Pressure Analysis:")
+        for record in analysis.pressure:
+            deficit = record.spawn_hp_per_sec - record.dps
+            details.append(
+                f"  [SPAWN PRESSURE] {record.phase_name}: {record.spawn_hp_per_sec:.1f} HP/sec spawning vs {record.dps:.1f} DPS (SHORT {deficit:.1f} HP/sec!)"
+            )
+
+    details += [
+        "",
+        "Bullet Count Analysis:",
+        f"  Bullets Available: {analysis.bullets_available:,}",
+        f"  Bullets Needed: {analysis.bullets_needed:,}",
+        f"  Bullet Ratio: {analysis.bullet_ratio:.2f}x",
+        f"  Overkill Waste: {analysis.overkill_waste} damage",
+        f"  [BULLET GRADE]: {analysis.bullet_grade}"
+    ]
+    for segment in analysis.segments:
+        if segment.is_catch:
+            details.append(f"  - [CATCHING TIMER] {segment.length:.1f}s - NO SHOOTING")
+        elif segment.weapon_name is not None:
+            details.append(f"  - T{segment.tier}: {segment.shots:.1f} shots x {segment.projectile_count} projectiles = {segment.bullets:.0f} bullets")
+    for kill in analysis.kills:
+        weapon = f" with T{kill.tier}" if kill.tier is not None else ""
+        details.append(f"  - {kill.type}: {kill.count} x {kill.health}HP = {kill.bullets} bullets{weapon} (overkill: {kill.overkill})")
+    return details
+
+class WaveResultRow:
+    """Read-only WaveAnalysis-style view of one WaveResultTable row"""
+    __slots__ = ('_table', '_index')
+
+    def __init__(self, table: "WaveResultTable", index: int):
+        self._table = table
+        self._index = index
+
+    def __getattr__(self, name: str):
+        table = self._table
+        if name in table.COLUMNS:
+            return table.columns[name][self._index]
+        if name == 'wave_name':
+            return table.wave_names[self._index]
+        if name == 'grade':
+            return table.grade(self._index)
+        if name == 'bullet_grade':
+            return table.bullet_grade(self._index)
+        raise AttributeError(name)
+
+    def summary(self) -> Dict:
+        record = {name: getattr(self, name) for name in WaveAnalysis.SUMMARY_FIELDS}
+        record['spawn_pressure'] = bool(self.has_pressure)
+        return record
+
+class WaveResultTable:
+    """
+    Columnar store for many wave results.
+
+    Numbers live in typed arrays and grades as small codes into
+    WAVE_GRADE_LABELS / BULLET_GRADE_LABELS, so a row costs a few dozen bytes
+    instead of a WaveAnalysis object with its breakdown lists and label
+    strings. Wave names are interned. Indexing gives a WaveResultRow for code
+    that expects WaveAnalysis attributes; filter/sort/group_counts answer the
+    report's summary queries (with NumPy views over the arrays when available),
+    one chapter-sized chunk at a time in CampaignSummary.
+    """
+
+    # Column name -> array typecode
+    COLUMNS = {
+        'chapter_index': 'l',
+        'wave_id': 'q',
+        'duration': 'd',
+        'total_zomboid_hp': 'q',
+        'weapon_tier_start': 'h',
+        'weapon_tier_end': 'h',
+        'damage_capacity': 'd',
+        'overkill_ratio': 'd',
+        'grade_code': 'b',
+        'has_pressure': 'b',
+        'bullets_available': 'q',
+        'bullets_needed': 'q',
+        'bullet_ratio': 'd',
+        'bullet_grade_code': 'b',
+        'overkill_waste': 'q',
+    }
+
+    def __init__(self):
+        from array import array
+
+        self.columns = {name: array(typecode) for name, typecode in self.COLUMNS.items()}
+        self.wave_names: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.wave_names)
+
+    def __getitem__(self, index: int) -> WaveResultRow:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return WaveResultRow(self, index)
+
+    def __iter__(self):
+        return (WaveResultRow(self, index) for index in range(len(self)))
+
+    def append(self, analysis: WaveAnalysis, chapter_index: int = 0):
+        columns = self.columns
+        has_pressure = analysis.grade.endswith(SPAWN_PRESSURE_TAG)
+        columns['chapter_index'].append(chapter_index)
+        columns['wave_id'].append(analysis.wave_id)
+        columns['duration'].append(analysis.duration)
+        columns['total_zomboid_hp'].append(analysis.total_zomboid_hp)
+        columns['weapon_tier_start'].append(analysis.weapon_tier_start)
+        columns['weapon_tier_end'].append(analysis.weapon_tier_end)
+        columns['damage_capacity'].append(analysis.damage_capacity)
+        columns['overkill_ratio'].append(analysis.overkill_ratio)
+        columns['grade_code'].append(grade_index(analysis.overkill_ratio, WAVE_GRADE_THRESHOLDS))
+        columns['has_pressure'].append(has_pressure)
+        columns['bullets_available'].append(analysis.bullets_available)
+        columns['bullets_needed'].append(analysis.bullets_needed)
+        columns['bullet_ratio'].append(analysis.bullet_ratio)
+        columns['bullet_grade_code'].append(grade_index(analysis.bullet_ratio, BULLET_GRADE_THRESHOLDS))
+        columns['overkill_waste'].append(analysis.overkill_waste)
+        self.wave_names.append(sys.intern(analysis.wave_name))
+
+    def extend(self, analyses: List[WaveAnalysis], chapter_index: int = 0):
+        for analysis in analyses:
+            self.append(analysis, chapter_index)
+
+    def grade(self, index: int) -> str:
+        grade = WAVE_GRADE_LABELS[self.columns['grade_code'][index]]
+        return grade + SPAWN_PRESSURE_TAG if self.columns['has_pressure'][index] else grade
+
+    def bullet_grade(self, index: int) -> str:
+        return BULLET_GRADE_LABELS[self.columns['bullet_grade_code'][index]]
+
+    def column(self, name: str):
+        """A column as a zero-copy NumPy view, or the raw array without NumPy"""
+        values = self.columns[name]
+        if np is None:
+            return values
+        return np.frombuffer(values, dtype=np.dtype(values.typecode)) if len(values) else np.zeros(0, values.typecode)
+
+    def filter(self, name: str, below: float = None, at_least: float = None) -> List[int]:
+        """Row indices, in order, whose column is < below and/or >= at_least"""
+        low = -math.inf if at_least is None else at_least
+        high = math.inf if below is None else below
+        values = self.column(name)
+        if np is not None:
+            return np.flatnonzero((values >= low) & (values < high)).tolist()
+        return [index for index, value in enumerate(values) if low <= value < high]
+
+    def sort(self, name: str, descending: bool = False) -> List[int]:
+        """Row indices ordered by a column (stable)"""
+        values = self.column(name)
+        if np is not None:
+            order = np.argsort(-values if descending else values, kind='stable')
+            return order.tolist()
+        return sorted(range(len(values)), key=values.__getitem__, reverse=descending)
+
+    def group_counts(self, name: str) -> Dict[int, int]:
+        """Rows per distinct value of a column, e.g. per grade code"""
+        values = self.column(name)
+        if np is not None:
+            keys, counts = np.unique(values, return_counts=True)
+            return dict(zip(keys.tolist(), counts.tolist()))
+        counts = {}
+        for value in values:
+            counts[value] = counts.get(value, 0) + 1
+        return counts
+
+    def grade_letter_counts(self, name: str = 'grade_code') -> Dict[str, int]:
+        """Waves per grade letter ('A+', 'B', ...) for 'grade_code' or 'bullet_grade_code'"""
+        labels = WAVE_GRADE_LABELS if name == 'grade_code' else BULLET_GRADE_LABELS
+        return {labels[code].split()[0]: count for code, count in self.group_counts(name).items()}
+
+class CampaignSummary:
+    """
+    Streaming aggregate behind the report's summary section.
+
+    Fed one chapter at a time, it packs the chapter into a WaveResultTable
+    chunk, folds the chunk's grade counts and problem-wave queries into its
+    counters and lists, and drops it, so the report never holds the campaign.
+    Without a limit the lists keep every problem wave in campaign order.
+    With `limit`, each list keeps only its `limit` worst waves (lowest ratio
+    first, lines naming the chapter since order is lost) and memory stays
+    flat however many waves stream past; counts still cover every wave.
+    """
+
+    def __init__(self, limit: int = None):
+        self.limit = limit
+        self.waves = 0
+        self.grades: Dict[str, int] = {}
+        self.bullet_grades: Dict[str, int] = {}
+        self.problem_count = 0
+        self.bullet_problem_count = 0
+        self._problems = []
+        self._bullet_problems = []
+
+    def _keep(self, kept: list, ratio: float, order: int, line: str):
+        import heapq
+
+        if self.limit is None:
+            kept.append(line)
+            return
+        # Min-heap on (-ratio, -order): the root is the mildest kept wave, replaced first
+        item = (-ratio, -order, line)
+        if len(kept) < self.limit:
+            heapq.heappush(kept, item)
+        elif kept and item > kept[0]:
+            heapq.heapreplace(kept, item)
+
+    def add(self, chapter: Dict, analyses: List[WaveAnalysis]):
+        table = WaveResultTable()
+        table.extend(analyses)
+        for counts, column in ((self.grades, 'grade_code'), (self.bullet_grades, 'bullet_grade_code')):
+            for grade, waves in table.grade_letter_counts(column).items():
+                counts[grade] = counts.get(grade, 0) + waves
+
+        prefix = "" if self.limit is None else f"{chapter['chapterId']} "
+        problems = table.filter('overkill_ratio', below=1.0)
+        self.problem_count += len(problems)
+        for index in self._candidates(table, problems, 'overkill_ratio'):
+            row = table[index]
+            self._keep(self._problems, row.overkill_ratio, self.waves + index,
+                       f"  - {prefix}{row.wave_name}: {row.overkill_ratio:.2f}x "
+                       f"(needs {(1.0 - row.overkill_ratio) * 100:.0f}% more damage capacity)")
+        bullet_problems = table.filter('bullet_ratio', below=1.3)
+        self.bullet_problem_count += len(bullet_problems)
+        for index in self._candidates(table, bullet_problems, 'bullet_ratio'):
+            row = table[index]
+            self._keep(self._bullet_problems, row.bullet_ratio, self.waves + index,
+                       f"  - {prefix}{row.wave_name}: {row.bullet_ratio:.2f}x (recommended: >=1.3x)")
+        self.waves += len(table)
+
+    def _candidates(self, table: WaveResultTable, rows: List[int], column: str) -> List[int]:
+        """Problem rows worth offering to the lists: all of them, or with a limit the chunk's worst `limit`"""
+        if self.limit is None:
+            return rows
+        # The stable sort keeps campaign order among equal ratios, as the heap's tie-break does
+        problem = set(rows)
+        return [index for index in table.sort(column) if index in problem][:self.limit]
+
+    def _lines(self, kept: list) -> List[str]:
+        if self.limit is None:
+            return list(kept)
+        return [line for _, _, line in sorted(kept, reverse=True)]
+
+    @property
+    def problem_waves(self) -> List[str]:
+        return self._lines(self._problems)
+
+    @property
+    def bullet_problems(self) -> List[str]:
+        return self._lines(self._bullet_problems)
+
+@dataclass
+class WavePhase:
+    start: float
+    end: float
+    tier: int
+    is_catch: bool  # True while the player is catching a timer (no shots at enemies)
+
+    @property
+    def length(self) -> float:
+        return self.end - self.start
+
+class WavePhaseTimeline:
+    """
+    Ordered firing/catching phases of a single wave.
+
+    Built once per wave so damage capacity, bullet count and spawn pressure
+    all walk the same segments and agree on which upgrades land in time.
+    """
+
+    def __init__(self, duration: float, starting_tier: int, upgrades: List[Tuple[float, int, float]]):
+        self.duration = duration
+        self.starting_tier = starting_tier
+        self.phases: List[WavePhase] = []
+
+        current_tier = starting_tier
+        current_time = 0
+
+        for catch_time, upgrade_tier, catch_duration in upgrades:
+            # Upgrades are sorted by catch time, so none after this one land in time either
+            if catch_time > duration:
+                break
+
+            timer_spawn_time = catch_time - catch_duration
+            if timer_spawn_time > current_time:
+                self.phases.append(WavePhase(current_time, timer_spawn_time, current_tier, False))
+                current_time = timer_spawn_time
+
+            self.phases.append(WavePhase(current_time, catch_time, upgrade_tier, True))
+            current_time = catch_time
+            current_tier = upgrade_tier
+
+        if current_time < duration:
+            self.phases.append(WavePhase(current_time, duration, current_tier, False))
+
+        self.ending_tier = current_tier
+
+    def tier_at(self, time: float) -> int:
+        """Tier that shoots what spawns at `time` (a catch phase already carries the tier being caught)"""
+        for phase in self.phases:
+            if time < phase.end:
+                return phase.tier
+        return self.ending_tier
+
+    def firing_phases(self) -> List[Tuple[str, WavePhase]]:
+        """Firing phases labelled the way the spawn pressure report names them"""
+        labelled = []
+        catches_seen = 0
+        for index, phase in enumerate(self.phases):
+            if phase.is_catch:
+                catches_seen += 1
+                continue
+            if index + 1 < len(self.phases):
+                name = f"Phase {catches_seen + 1}: T{phase.tier} weapon"
+            else:
+                name = f"Final phase: T{phase.tier} weapon"
+            labelled.append((name, phase))
+        return labelled
+
+@dataclass(frozen=True)
+class ChapterState:
+    """Weapon tier and hero count a chapter starts (or ends) with"""
+    weapon_tier: int = 1
+    hero_count: int = 1
+
+class ChapterResultStore:
+    """
+    Memoized chapter analyses keyed by (chapter content hash, starting tier, hero count).
+
+    The content hash covers the chapter itself plus the entity files it
+    depends on, so editing either never serves stale results. With a
+    cache_dir, results also persist on disk between runs. Opening the store
+    deletes entries written by another analyzer version and keeps at most
+    MAX_ENTRIES, dropping the least recently used.
+    """
+
+    # Analyzer source is part of every on-disk key, so model changes invalidate old results
+    MODEL_HASH = hashlib.sha1(Path(__file__).read_bytes()).hexdigest()
+    MAX_ENTRIES = 4096
+
+    def __init__(self, cache_dir: Path = None):
+        self._results: Dict[Tuple[str, int, int], List[WaveAnalysis]] = {}
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.dependency_hash = ""
+        self.hits = 0
+        self.misses = 0
+        self._disk_entries = 0
+        if self.cache_dir is not None:
+            self.prune()
+
+    @staticmethod
+    def chapter_hash(chapter: Dict) -> str:
+        """Stable hash of a chapter's content (key order independent)"""
+        canonical = json.dumps(chapter, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha1(canonical.encode('utf-8')).hexdigest()
+
+    def key(self, chapter: Dict, state: ChapterState) -> Tuple[str, int, int]:
+        content_hash = self.chapter_hash(chapter)
+        if self.dependency_hash:
+            content_hash = hashlib.sha1(f"{self.dependency_hash}:{content_hash}".encode('utf-8')).hexdigest()
+        return (content_hash, state.weapon_tier, state.hero_count)
+
+    def _cache_path(self, key: Tuple[str, int, int]) -> Path:
+        name = hashlib.sha1(f"{self.MODEL_HASH}:{key[0]}:{key[1]}:{key[2]}".encode('utf-8')).hexdigest()
+        # The model prefix lets prune() recognise entries from other analyzer versions
+        return self.cache_dir / f"{self.MODEL_HASH[:12]}-{name}.json"
+
+    def prune(self):
+        """Delete other models' entries, then the least recently used beyond MAX_ENTRIES"""
+        prefix = f"{self.MODEL_HASH[:12]}-"
+        current = []
+        try:
+            with os.scandir(self.cache_dir) as entries:
+                for entry in entries:
+                    if not entry.name.endswith('.json'):
+                        continue
+                    if entry.name.startswith(prefix):
+                        current.append((entry.stat().st_mtime_ns, entry.path))
+                    else:
+                        self._remove(entry.path)
+        except OSError:
+            return  # No cache directory yet
+
+        current.sort()
+        excess = len(current) - self.MAX_ENTRIES
+        for _, path in current[:max(excess, 0)]:
+            self._remove(path)
+        self._disk_entries = min(len(current), self.MAX_ENTRIES)
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass  # Another process may have pruned it first
+
+    def contains(self, chapter: Dict, state: ChapterState) -> bool:
+        """Whether a result is available without analysis (memory or disk)"""
+        key = self.key(chapter, state)
+        return key in self._results or (self.cache_dir is not None and self._cache_path(key).exists())
+
+    def get(self, chapter: Dict, state: ChapterState):
+        key = self.key(chapter, state)
+        analyses = self._results.get(key)
+        if analyses is None and self.cache_dir is not None:
+            analyses = self._read_disk(key)
+            if analyses is not None:
+                self._results[key] = analyses
+        if analyses is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return analyses
+
+    def put(self, chapter: Dict, state: ChapterState, analyses: List[WaveAnalysis]):
+        key = self.key(chapter, state)
+        self._results[key] = analyses
+        if self.cache_dir is not None:
+            self._write_disk(key, analyses)
+
+    def _read_disk(self, key: Tuple[str, int, int]):
+        path = self._cache_path(key)
+        try:
+            with open(path, 'r') as f:
+                analyses = [WaveAnalysis.from_dict(record) for record in json.load(f)]
+            os.utime(path)  # Mark as recently used for prune()
+            return analyses
+        except (OSError, ValueError, TypeError):
+            # Missing or unreadable entries are simply recomputed
+            return None
+
+    def _write_disk(self, key: Tuple[str, int, int], analyses: List[WaveAnalysis]):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._cache_path(key)
+        temp_path = path.with_suffix('.tmp')
+        with open(temp_path, 'w') as f:
+            json.dump([asdict(analysis) for analysis in analyses], f)
+        os.replace(temp_path, path)
+        self._disk_entries += 1
+        if self._disk_entries > self.MAX_ENTRIES:
+            self.prune()
+
+    def clear(self):
+        self._results.clear()
+
+class ConfigSnapshot:
+    """
+    Compiled copy of a parsed config directory, memory-mapped on load.
+
+    Layout: magic, header length, a JSON header (source manifest, interned
+    strings, section offsets, small settings) and 8-byte aligned sections.
+    Numeric sections are packed typed arrays (weapons, zomboids, timer
+    types, waves, spawn patterns and wave timers, with type ids interned
+    into the string table) and read as zero-copy memoryviews, so
+    BatchAnalyzer can pack a campaign without any JSON. Each chapter's JSON
+    is also kept so chapter dicts can be decoded on first access.
+
+    A snapshot is valid while every source file keeps its (mtime, size), or
+    its content hash if only the mtime moved, the set of chapter files is
+    unchanged and the analyzer source is the one that wrote it.
+    """
+
+    FILE_NAME = "config-snapshot.bin"
+    MAGIC = b"ZASNAP01"
+
+    # Section name -> columns, each (name, array typecode)
+    TABLES = {
+        'weapons': (('tier', 'q'), ('fire_rate', 'd'), ('damage', 'q'), ('projectile_count', 'q'),
+                    ('penetration_damage', 'q'), ('projectile_speed', 'd'), ('projectile_size', 'q'),
+                    ('id', 'q'), ('name', 'q')),
+        'zomboids': (('id', 'q'), ('health', 'q'), ('speed', 'q'), ('half_width', 'd')),
+        'timer_types': (('id', 'q'), ('start_value', 'q'), ('speed', 'd'), ('height', 'q'),
+                        ('instant_reward', 'q'), ('reward_count', 'q')),
+        'chapters': (('first_wave', 'q'), ('wave_count', 'q'), ('json_offset', 'q'), ('json_length', 'q')),
+        'waves': (('wave_id', 'q'), ('name', 'q'), ('duration', 'd'), ('first_pattern', 'q'), ('pattern_count', 'q'),
+                  ('first_timer', 'q'), ('timer_count', 'q'), ('catch_speed', 'd')),
+        'patterns': (('type', 'q'), ('count', 'q'), ('spawn_rate', 'd'), ('spawn_delay', 'd'), ('columns', 'q')),
+        # startValue and weaponTier carry the same defaults as BatchAnalyzer.pack_waves
+        'timers': (('type', 'q'), ('spawn_time', 'd'), ('start_value', 'd'), ('weapon_tier', 'q'),
+                   ('reset_hero_count', 'q')),
+    }
+
+    def __init__(self, path: Path, header: Dict, buffer):
+        self.path = path
+        self.header = header
+        self.strings: List[str] = header['strings']
+        self._buffer = buffer
+        self._view = memoryview(buffer)
+
+    @staticmethod
+    def source_files(config_dir: Path) -> List[Path]:
+        """Every file load_configs reads, in load order"""
+        entities = config_dir / "entities"
+        files = [entities / "weapons.json", entities / "zomboids.json", config_dir / "game-settings.json",
+                 entities / "timers.json", entities / "heroes.json"]
+        chapters = sorted((config_dir / "chapters").glob("chapter-*.json"))
+        return [path for path in files if path.exists()] + [path for path in chapters if "test" not in path.name]
+
+    def column(self, table: str, name: str) -> memoryview:
+        offset, typecode, length = self.header['sections'][f"{table}.{name}"]
+        size = array_itemsize(typecode)
+        return self._view[offset:offset + length * size].cast(typecode)
+
+    def rows(self, table: str) -> int:
+        return self.header['sections'][f"{table}.{self.TABLES[table][0][0]}"][2]
+
+    def chapter_json(self, index: int) -> bytes:
+        offset = self.header['sections']['chapter_json'][0]
+        start = offset + self.column('chapters', 'json_offset')[index]
+        return bytes(self._view[start:start + self.column('chapters', 'json_length')[index]])
+
+    def string(self, index: int) -> str:
+        return self.strings[index] if index >= 0 else None
+
+    @classmethod
+    def write(cls, path: Path, analyzer: "BalanceAnalyzer"):
+        """Compile the analyzer's loaded configs into a snapshot file"""
+        from array import array
+
+        strings, string_ids = [], {}
+
+        def intern(text) -> int:
+            if text is None:
+                return -1
+            if text not in string_ids:
+                string_ids[text] = len(strings)
+                strings.append(text)
+            return string_ids[text]
+
+        columns = {f"{table}.{name}": array(typecode) for table, spec in cls.TABLES.items() for name, typecode in spec}
+
+        def add(table: str, **values):
+            for name, _ in cls.TABLES[table]:
+                columns[f"{table}.{name}"].append(values[name])
+
+        for weapon in analyzer.weapons.values():
+            add('weapons', tier=weapon.tier, fire_rate=weapon.fire_rate, damage=weapon.damage,
+                projectile_count=weapon.projectile_count, penetration_damage=weapon.penetration_damage,
+                projectile_speed=weapon.projectile_speed, projectile_size=weapon.projectile_size,
+                id=intern(weapon.id), name=intern(weapon.name))
+        for zomboid in analyzer.zomboids.values():
+            add('zomboids', id=intern(zomboid.id), health=zomboid.health, speed=zomboid.speed,
+                half_width=zomboid.half_width)
+        for timer in analyzer.timers.values():
+            add('timer_types', id=intern(timer.id), start_value=timer.start_value, speed=timer.speed,
+                height=timer.height, instant_reward=intern(timer.instant_reward), reward_count=timer.reward_count)
+
+        chapter_blobs = []
+        json_offset = 0
+        for chapter in analyzer.chapters:
+            blob = json.dumps(chapter, separators=(',', ':')).encode('utf-8')
+            add('chapters', first_wave=len(columns['waves.wave_id']), wave_count=len(chapter['waves']),
+                json_offset=json_offset, json_length=len(blob))
+            chapter_blobs.append(blob)
+            json_offset += len(blob)
+            for wave in chapter['waves']:
+                patterns = wave['spawnPattern']['zomboids']
+                timers = wave['spawnPattern'].get('timers', [])
+                add('waves', wave_id=wave['waveId'], name=intern(wave['waveName']), duration=wave['duration'],
+                    first_pattern=len(columns['patterns.type']), pattern_count=len(patterns),
+                    first_timer=len(columns['timers.type']), timer_count=len(timers),
+                    catch_speed=wave_catch_speed(wave))
+                for pattern in patterns:
+                    add('patterns', type=intern(pattern['type']), count=pattern['count'],
+                        spawn_rate=pattern['spawnRate'], spawn_delay=pattern.get('spawnDelay', 0),
+                        columns=pattern_columns(pattern))
+                for timer in timers:
+                    add('timers', type=intern(timer['type']), spawn_time=timer['spawnTime'],
+                        start_value=timer.get('startValue', -50), weapon_tier=timer.get('weaponTier', 2),
+                        reset_hero_count=int(bool(timer.get('resetHeroCount', False))))
+
+        sources = {}
+        for source in cls.source_files(analyzer.config_dir):
+            stat = source.stat()
+            sources[source.relative_to(analyzer.config_dir).as_posix()] = [
+                stat.st_mtime_ns, stat.st_size, hashlib.sha1(source.read_bytes()).hexdigest()]
+
+        # Section offsets are relative to the start of the data area
+        sections, blobs, offset = {}, [], 0
+        for name, values in list(columns.items()) + [('chapter_json', b"".join(chapter_blobs))]:
+            data = values.tobytes() if isinstance(values, array) else values
+            typecode = values.typecode if isinstance(values, array) else 'B'
+            sections[name] = [offset, typecode, len(values)]
+            padding = -len(data) % 8
+            blobs.append(data + b"\0" * padding)
+            offset += len(data) + padding
+
+        header = {
+            'model': ChapterResultStore.MODEL_HASH,
+            'sources': sources,
+            'strings': strings,
+            'sections': sections,
+            'heroes': asdict(analyzer.heroes),
+            'field': asdict(analyzer.field),
+            'dependency_hash': analyzer.results.dependency_hash,
+        }
+        header_bytes = json.dumps(header, separators=(',', ':')).encode('utf-8')
+        header_bytes += b" " * (-(len(cls.MAGIC) + 8 + len(header_bytes)) % 8)
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_suffix('.tmp')
+        with open(temp_path, 'wb') as f:
+            f.write(cls.MAGIC + len(header_bytes).to_bytes(8, 'little') + header_bytes)
+            for blob in blobs:
+                f.write(blob)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def open(cls, path: Path, config_dir: Path):
+        """Map a snapshot; None if it is missing, unreadable or stale"""
+        import mmap
+
+        try:
+            with open(path, 'rb') as f:
+                header, header_length = cls._read_header(f)
+                if header is None or header.get('model') != ChapterResultStore.MODEL_HASH or not cls._fresh(header['sources'], config_dir):
+                    return None
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError, KeyError):
+            return None
+
+        start = len(cls.MAGIC) + 8 + header_length
+        for section in header['sections'].values():
+            section[0] += start
+        return cls(path, header, buffer)
+
+    @classmethod
+    def _read_header(cls, f):
+        """(header, header length) of an open snapshot file; (None, 0) if it is not one"""
+        prefix = f.read(len(cls.MAGIC) + 8)
+        if len(prefix) < len(cls.MAGIC) + 8 or not prefix.startswith(cls.MAGIC):
+            return None, 0
+        header_length = int.from_bytes(prefix[len(cls.MAGIC):], 'little')
+        return json.loads(f.read(header_length)), header_length
+
+    @classmethod
+    def prune(cls, path: Path):
+        """Delete the snapshot at path if another analyzer version (or nothing valid) wrote it"""
+        try:
+            with open(path, 'rb') as f:
+                header, _ = cls._read_header(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError):
+            header = None
+        if header is None or header.get('model') != ChapterResultStore.MODEL_HASH:
+            ChapterResultStore._remove(path)
+
+    @classmethod
+    def _fresh(cls, sources: Dict[str, list], config_dir: Path) -> bool:
+        # os.scandir keeps this to one syscall per file, which matters for large chapter corpora
+        current = {}
+        for name in ("entities/weapons.json", "entities/zomboids.json", "game-settings.json",
+                     "entities/timers.json", "entities/heroes.json"):
+            try:
+                current[name] = os.stat(os.path.join(config_dir, name))
+            except OSError:
+                pass
+        try:
+            with os.scandir(os.path.join(config_dir, "chapters")) as entries:
+                for entry in entries:
+                    if fnmatch.fnmatchcase(entry.name, "chapter-*.json") and "test" not in entry.name:
+                        current["chapters/" + entry.name] = entry.stat()
+        except OSError:
+            pass
+
+        if current.keys() != sources.keys():
+            return False
+        for name, stat in current.items():
+            recorded = sources[name]
+            if [stat.st_mtime_ns, stat.st_size] == recorded[:2]:
+                continue
+            # Touched but possibly unchanged: fall back to the content hash
+            if stat.st_size != recorded[1] or hashlib.sha1((config_dir / name).read_bytes()).hexdigest() != recorded[2]:
+                return False
+        return True
+
+    def apply(self, analyzer: "BalanceAnalyzer"):
+        """Load the analyzer's configs from this snapshot instead of JSON"""
+        string = self.string
+
+        analyzer.weapons = {}
+        for i in range(self.rows('weapons')):
+            weapon = WeaponStats(
+                id=string(self.column('weapons', 'id')[i]),
+                name=string(self.column('weapons', 'name')[i]),
+                tier=self.column('weapons', 'tier')[i],
+                fire_rate=self.column('weapons', 'fire_rate')[i],
+                damage=self.column('weapons', 'damage')[i],
+                projectile_count=self.column('weapons', 'projectile_count')[i],
+                penetration_damage=self.column('weapons', 'penetration_damage')[i],
+                projectile_speed=self.column('weapons', 'projectile_speed')[i],
+                projectile_size=self.column('weapons', 'projectile_size')[i],
+            )
+            analyzer.weapons[weapon.tier] = weapon
+
+        analyzer.zomboids = {}
+        for i in range(self.rows('zomboids')):
+            zomboid = ZomboidStats(
+                id=string(self.column('zomboids', 'id')[i]),
+                health=self.column('zomboids', 'health')[i],
+                speed=self.column('zomboids', 'speed')[i],
+                half_width=self.column('zomboids', 'half_width')[i],
+            )
+            analyzer.zomboids[zomboid.id] = zomboid
+
+        analyzer.timers = {}
+        for i in range(self.rows('timer_types')):
+            timer = TimerStats(
+                id=string(self.column('timer_types', 'id')[i]),
+                start_value=self.column('timer_types', 'start_value')[i],
+                speed=self.column('timer_types', 'speed')[i],
+                height=self.column('timer_types', 'height')[i],
+                instant_reward=string(self.column('timer_types', 'instant_reward')[i]),
+                reward_count=self.column('timer_types', 'reward_count')[i],
+            )
+            analyzer.timers[timer.id] = timer
+
+        analyzer.heroes = HeroLimits(**self.header['heroes'])
+        analyzer.field = FieldGeometry(**self.header['field'])
+        analyzer.results.dependency_hash = self.header['dependency_hash']
+        analyzer.kill_costs = {}
+
+        analyzer.snapshot = self
+        analyzer.chapters = SnapshotChapters(self)
+        analyzer.chapter_paths = SnapshotChapters(self, decode=lambda index: analyzer.config_dir / self.chapter_files[index])
+
+    @property
+    def chapter_files(self) -> List[str]:
+        """Chapter file names relative to the config directory, in campaign order"""
+        if not hasattr(self, '_chapter_files'):
+            self._chapter_files = [name for name in self.header['sources'] if name.startswith("chapters/")]
+        return self._chapter_files
+
+def array_itemsize(typecode: str) -> int:
+    from array import array
+    return array(typecode).itemsize
+
+class SnapshotChapters:
+    """
+    Read-only chapter list backed by a ConfigSnapshot; each chapter dict is
+    decoded on first access. With `decode`, items are whatever it builds
+    for an index instead (e.g. the chapter file paths).
+    """
+
+    def __init__(self, snapshot: ConfigSnapshot, decode=None):
+        self.snapshot = snapshot
+        self._decode = decode or (lambda index: json.loads(snapshot.chapter_json(index)))
+        self._decoded: Dict[int, Dict] = {}
+
+    def __len__(self) -> int:
+        return self.snapshot.rows('chapters')
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        chapter = self._decoded.get(index)
+        if chapter is None:
+            # Kept, so wave dicts stay the same objects for id()-keyed caches
+            chapter = self._decoded[index] = self._decode(index)
+        return chapter
+
+    def __iter__(self):
+        return (self[index] for index in range(len(self)))
+
+def iter_chapter_sources(sources: List[str]):
+    """
+    Yield (origin, chapter) from chapter files, directories, globs and JSONL bundles, one chapter at a time.
+
+    A directory contributes its chapter-*.json files (test chapters excluded,
+    as in BalanceAnalyzer.chapter_files) and *.jsonl bundles, in name order;
+    a bundle holds one chapter per line. Only file names are listed up front,
+    so memory does not grow with the corpus (beyond the names themselves).
+    """
+    import glob
+
+    for source in sources:
+        path = Path(source)
+        if path.is_dir():
+            with os.scandir(path) as entries:
+                names = sorted(entry.name for entry in entries if entry.is_file() and (
+                    entry.name.endswith(".jsonl")
+                    or (fnmatch.fnmatchcase(entry.name, "chapter-*.json") and "test" not in entry.name)))
+            files = (path / name for name in names)
+        elif glob.has_magic(source):
+            files = (Path(name) for name in sorted(glob.iglob(source, recursive=True)))
+        else:
+            files = (path,)
+
+        for file in files:
+            if file.suffix == ".jsonl":
+                with open(file, "rb") as f:
+                    for number, line in enumerate(f, 1):
+                        if line.strip():
+                            yield f"{file}:{number}", parse_chapter(line, f"{file}:{number}")
+            else:
+                yield str(file), parse_chapter(file.read_bytes(), str(file))
+
+def parse_chapter(data: bytes, origin: str) -> Dict:
+    """One chapter's JSON; ValueError naming the file (and bundle line) when it is malformed"""
+    try:
+        chapter = json.loads(data)
+    except ValueError as error:
+        raise ValueError(f"{origin}: {error}") from None
+    required = ('chapterId', 'chapterName', 'waves')
+    missing = [key for key in required if key not in chapter] if isinstance(chapter, dict) else list(required)
+    if missing:
+        raise ValueError(f"{origin}: not a chapter (missing {', '.join(missing)})")
+    return chapter
 
 class BalanceAnalyzer:
-    def __init__(self, config_dir: str):
+    def __init__(self, config_dir: str, cache_dir: str = None):
         self.config_dir = Path(config_dir)
         self.weapons: Dict[int, WeaponStats] = {}
         self.zomboids: Dict[str, ZomboidStats] = {}
+        self.timers: Dict[str, TimerStats] = {}
+        self.heroes = HeroLimits()
+        self.kill_costs: Dict[Tuple[int, int, int], KillCost] = {}
         self.chapters: List[Dict] = []
+        self.chapter_paths: List[Path] = []
+        self.field = FieldGeometry()
+        self.results = ChapterResultStore(cache_dir)
+        self.snapshot: ConfigSnapshot = None
+        if self.results.cache_dir is not None:
+            # Same cleanup as the result cache: never leave another model's snapshot behind
+            ConfigSnapshot.prune(self.snapshot_path())
+
+    def load_configs(self, verbose: bool = True):
+        """Load all configuration files, from the compiled snapshot when it is still fresh"""
+        if verbose:
+            print("Loading configurations...")
 
-    def load_configs(self):
-        """Load all configuration files"""
-        print("Loading configurations...")
+        snapshot_path = self.snapshot_path()
+        snapshot = ConfigSnapshot.open(snapshot_path, self.config_dir) if snapshot_path else None
+        if snapshot is not None:
+            snapshot.apply(self)
+        else:
+            self.load_entities()
+
+            # Load all chapters
+            for chapter_file in self.chapter_files():
+                self.chapters.append(self.load_chapter(chapter_file))
+                self.chapter_paths.append(chapter_file)
+
+            if snapshot_path:
+                try:
+                    ConfigSnapshot.write(snapshot_path, self)
+                except OSError:
+                    pass  # A read-only cache only costs the next run a JSON parse
+
+        if verbose:
+            source = " (snapshot)" if snapshot is not None else ""
+            print(f"Loaded {len(self.weapons)} weapons, {len(self.zomboids)} zomboid types, {len(self.chapters)} chapters{source}\n")
+
+    def snapshot_path(self) -> Path:
+        """Where the compiled config snapshot lives (None without a cache directory)"""
+        if self.results.cache_dir is None:
+            return None
+        return self.results.cache_dir / ConfigSnapshot.FILE_NAME
+
+    def read_config(self, relative: str) -> bytes:
+        """Raw bytes of a file under the config directory; FileNotFoundError if it is missing"""
+        return (self.config_dir / relative).read_bytes()
+
+    def chapter_files(self) -> List[Path]:
+        """Campaign chapter files in order (test chapters excluded)"""
+        chapters_dir = self.config_dir / "chapters"
+        return [path for path in sorted(chapters_dir.glob("chapter-*.json")) if "test" not in path.name]
+
+    def load_entities(self):
+        """Load weapons, zomboids and playfield geometry"""
+        self.weapons = {}
+        self.zomboids = {}
 
         # Load weapons
-        weapons_path = self.config_dir / "entities" / "weapons.json"
-        with open(weapons_path, 'r') as f:
-            weapons_data = json.load(f)
-            for weapon in weapons_data['weaponTypes']:
-                w = WeaponStats(
-                    id=weapon['id'],
-                    name=weapon['name'],
-                    tier=weapon['tier'],
-                    fire_rate=weapon['fireRate'],
-                    damage=weapon['damage'],
-                    projectile_count=weapon['projectileCount']
-                )
-                self.weapons[w.tier] = w
+        weapons_bytes = self.read_config("entities/weapons.json")
+        weapons_data = json.loads(weapons_bytes)
+        for weapon in weapons_data['weaponTypes']:
+            w = WeaponStats(
+                id=weapon['id'],
+                name=weapon['name'],
+                tier=weapon['tier'],
+                fire_rate=weapon['fireRate'],
+                damage=weapon['damage'],
+                projectile_count=weapon['projectileCount'],
+                penetration_damage=weapon.get('penetrationDamage', 0),
+                projectile_speed=weapon.get('projectileSpeed', 400),
+                projectile_size=weapon.get('projectileSize', 8)
+            )
+            self.weapons[w.tier] = w
 
         # Load zomboids
-        zomboids_path = self.config_dir / "entities" / "zomboids.json"
-        with open(zomboids_path, 'r') as f:
-            zomboids_data = json.load(f)
-            for zomboid in zomboids_data['zomboidTypes']:
-                z = ZomboidStats(
-                    id=zomboid['id'],
-                    health=zomboid['health'],
-                    speed=zomboid['speed']
+        zomboids_bytes = self.read_config("entities/zomboids.json")
+        zomboids_data = json.loads(zomboids_bytes)
+        for zomboid in zomboids_data['zomboidTypes']:
+            z = ZomboidStats(
+                id=zomboid['id'],
+                health=zomboid['health'],
+                speed=zomboid['speed'],
+                half_width=zomboid_half_width(zomboid),
+            )
+            self.zomboids[z.id] = z
+
+        self.kill_costs = {}
+
+        # Load playfield geometry (defaults match GameScene when the file is missing)
+        settings = self._read_optional_config("game-settings.json")
+        if settings is not None:
+            self.field = FieldGeometry(
+                screen_height=settings['gameSettings'].get('screenHeight', 1280),
+                safe_zone_height=settings['gameplay'].get('safeZoneHeight', 150),
+                spawn_zone_height=settings['gameplay'].get('spawnZoneHeight', 100),
+                fps=settings['gameSettings'].get('fps', 60),
+                screen_width=settings['gameSettings'].get('screenWidth', 720),
+                boundary_padding=settings['gameplay'].get('movementBoundaryPadding', 60),
+            )
+
+        # Chapter results depend on these too (lane length and snap spacing set how far penetration reaches)
+        self.results.dependency_hash = hashlib.sha1(
+            weapons_bytes + b"\0" + zomboids_bytes + b"\0" + json.dumps(asdict(self.field)).encode('utf-8')).hexdigest()
+
+        # Timer and hero configs only feed the route solver, so they are optional
+        self.timers = {}
+        timers = self._read_optional_config("entities/timers.json")
+        if timers is not None:
+            for timer in timers['timerTypes']:
+                t = TimerStats(
+                    id=timer['id'],
+                    start_value=timer['startValue'],
+                    speed=timer['speed'],
+                    height=timer['height'],
+                    instant_reward=timer.get('instantReward'),
+                    reward_count=timer.get('instantRewardCount', 1)
                 )
-                self.zomboids[z.id] = z
+                self.timers[t.id] = t
 
-        # Load all chapters
-        chapters_dir = self.config_dir / "chapters"
-        for chapter_file in sorted(chapters_dir.glob("chapter-*.json")):
-            if "test" not in chapter_file.name:
-                with open(chapter_file, 'r') as f:
-                    chapter_data = json.load(f)
-                    self.chapters.append(chapter_data)
+        heroes = self._read_optional_config("entities/heroes.json")
+        if heroes is not None:
+            hero_config = heroes['heroConfig']
+            self.heroes = HeroLimits(
+                default_count=hero_config.get('defaultHeroCount', 1),
+                min_count=hero_config.get('minHeroCount', 1),
+                max_count=hero_config.get('maxHeroCount', 5),
+                spacing=hero_config.get('spacing', 15),
+                position_from_bottom=hero_config.get('positionFromBottom', 100),
+            )
+
+    def _read_optional_config(self, relative: str):
+        """Parsed JSON of an optional config file, or None if it is missing"""
+        try:
+            return json.loads(self.read_config(relative))
+        except FileNotFoundError:
+            return None
 
-        print(f"Loaded {len(self.weapons)} weapons, {len(self.zomboids)} zomboid types, {len(self.chapters)} chapters\n")
+    def load_chapter(self, chapter_file: Path) -> Dict:
+        return json.loads(self.read_config(Path(chapter_file).relative_to(self.config_dir).as_posix()))
 
-    def calculate_zomboid_hp(self, wave: Dict) -> Tuple[int, List[str]]:
+    def calculate_zomboid_hp(self, wave: Dict) -> Tuple[int, List[ZomboidRecord]]:
         """Calculate total HP for all zomboids in a wave"""
         total_hp = 0
-        details = []
+        records = []
 
         for zomboid_pattern in wave['spawnPattern']['zomboids']:
             zomboid_type = zomboid_pattern['type']
@@ -116,13 +1348,12 @@ class BalanceAnalyzer:
 
             if zomboid_type in self.zomboids:
                 hp_per_unit = self.zomboids[zomboid_type].health
-                total = count * hp_per_unit
-                total_hp += total
-                details.append(f"  - {zomboid_type}: {count} × {hp_per_unit}HP = {total}HP")
+                total_hp += count * hp_per_unit
+                records.append(ZomboidRecord(zomboid_type, count, hp_per_unit))
             else:
-                details.append(f"  - {zomboid_type}: UNKNOWN TYPE")
+                records.append(ZomboidRecord(zomboid_type, count, None))
 
-        return total_hp, details
+        return total_hp, records
 
     def find_weapon_upgrades(self, wave: Dict) -> List[Tuple[float, int, float]]:
         """
@@ -141,8 +1372,8 @@ class BalanceAnalyzer:
 
                 # Time needed to catch the timer
                 # Player must stop shooting enemies and focus on timer
-                # Estimate: 8 points per second increment (conservative)
-                catch_duration = abs(start_value) / 8.0
+                # Estimate: 8 points per second increment (conservative) unless calibrated
+                catch_duration = abs(start_value) / wave_catch_speed(wave)
 
                 # Total time when upgrade is obtained
                 catch_time = spawn_time + catch_duration
@@ -151,192 +1382,148 @@ class BalanceAnalyzer:
 
         return sorted(upgrades, key=lambda x: x[0])
 
-    def calculate_damage_capacity(self, wave: Dict, starting_tier: int) -> Tuple[float, int, int, List[str]]:
+    def build_timeline(self, wave: Dict, starting_tier: int) -> WavePhaseTimeline:
+        """Build the shared firing/catching timeline for a wave"""
+        return WavePhaseTimeline(wave['duration'], starting_tier, self.find_weapon_upgrades(wave))
+
+    def calculate_segments(self, timeline: WavePhaseTimeline) -> List[SegmentRecord]:
+        """Damage and bullet output of every timeline phase, in one pass"""
+        segments = []
+        for phase in timeline.phases:
+            if phase.is_catch:
+                # Catching timer - NO DAMAGE TO ENEMIES during this time
+                segments.append(SegmentRecord(phase.tier, phase.length, is_catch=True))
+                continue
+
+            weapon = self.weapons.get(phase.tier)
+            if weapon:
+                dps = weapon.dps()
+                shots = phase.length / weapon.fire_rate
+                segments.append(SegmentRecord(
+                    tier=phase.tier,
+                    length=phase.length,
+                    weapon_name=weapon.name,
+                    dps=dps,
+                    damage=dps * phase.length,
+                    shots=shots,
+                    projectile_count=weapon.projectile_count,
+                    bullets=shots * weapon.projectile_count,
+                ))
+            else:
+                segments.append(SegmentRecord(phase.tier, phase.length))
+        return segments
+
+    def calculate_damage_capacity(self, wave: Dict, starting_tier: int, timeline: WavePhaseTimeline = None,
+                                  segments: List[SegmentRecord] = None) -> Tuple[float, int, int, List[SegmentRecord]]:
         """
         Calculate total damage capacity for a wave.
-        Returns: (total_damage, starting_tier, ending_tier, details)
+        Returns: (total_damage, starting_tier, ending_tier, segments)
 
         KEY: Accounts for time spent catching timers where NO damage is dealt to enemies
         """
-        duration = wave['duration']
-        current_tier = starting_tier
-        current_time = 0
+        if timeline is None:
+            timeline = self.build_timeline(wave, starting_tier)
+        if segments is None:
+            segments = self.calculate_segments(timeline)
+
         total_damage = 0
-        details = []
-
-        # Find weapon upgrades with catch durations
-        upgrades = self.find_weapon_upgrades(wave)
-        upgrade_index = 0
-
-        # Calculate damage in segments between upgrades
-        while current_time < duration:
-            # Check if we have an upgrade coming
-            if upgrade_index < len(upgrades) and upgrades[upgrade_index][0] <= duration:
-                catch_time, upgrade_tier, catch_duration = upgrades[upgrade_index]
-                timer_spawn_time = catch_time - catch_duration
-
-                if timer_spawn_time > current_time:
-                    # Deal damage with current weapon until timer spawns
-                    time_segment = timer_spawn_time - current_time
-                    weapon = self.weapons.get(current_tier)
-                    if weapon:
-                        segment_damage = weapon.dps() * time_segment
-                        total_damage += segment_damage
-                        details.append(
-                            f"  - T{current_tier} ({weapon.name}) for {time_segment:.1f}s @ {weapon.dps():.1f} DPS = {segment_damage:.0f} damage"
-                        )
-                    current_time = timer_spawn_time
-
-                # Now catching timer - NO DAMAGE TO ENEMIES during this time
-                if catch_duration > 0:
-                    details.append(
-                        f"  - [CATCHING TIMER] for {catch_duration:.1f}s - NO DAMAGE (enemies accumulate!)"
-                    )
-
-                current_time = catch_time
-                current_tier = upgrade_tier
-                upgrade_index += 1
-            else:
-                # No more upgrades, calculate remaining time
-                time_segment = duration - current_time
-                weapon = self.weapons.get(current_tier)
-                if weapon:
-                    segment_damage = weapon.dps() * time_segment
-                    total_damage += segment_damage
-                    details.append(
-                        f"  - T{current_tier} ({weapon.name}) for {time_segment:.1f}s @ {weapon.dps():.1f} DPS = {segment_damage:.0f} damage"
-                    )
-                current_time = duration
-
-        ending_tier = current_tier
-        return total_damage, starting_tier, ending_tier, details
-
-
-    def calculate_bullets_available(self, wave: Dict, starting_tier: int) -> Tuple[int, List[str]]:
+        for segment in segments:
+            if segment.weapon_name is not None:
+                total_damage += segment.damage
+
+        return total_damage, starting_tier, timeline.ending_tier, segments
+
+
+    def calculate_bullets_available(self, wave: Dict, starting_tier: int, timeline: WavePhaseTimeline = None,
+                                    segments: List[SegmentRecord] = None) -> Tuple[int, List[SegmentRecord]]:
         """Calculate total bullets available during wave"""
-        duration = wave['duration']
-        current_tier = starting_tier
-        current_time = 0
+        if timeline is None:
+            timeline = self.build_timeline(wave, starting_tier)
+        if segments is None:
+            segments = self.calculate_segments(timeline)
+
         total_bullets = 0
-        details = []
-        upgrades = self.find_weapon_upgrades(wave)
-        upgrade_index = 0
-
-        while current_time < duration:
-            if upgrade_index < len(upgrades):
-                catch_time, upgrade_tier, catch_duration = upgrades[upgrade_index]
-                timer_spawn_time = catch_time - catch_duration
-                if timer_spawn_time > current_time:
-                    time_segment = timer_spawn_time - current_time
-                    weapon = self.weapons.get(current_tier)
-                    if weapon:
-                        shots = time_segment / weapon.fire_rate
-                        bullets = shots * weapon.projectile_count
-                        total_bullets += bullets
-                        details.append(f"  - T{current_tier}: {shots:.1f} shots x {weapon.projectile_count} projectiles = {bullets:.0f} bullets")
-                    current_time = timer_spawn_time
-                details.append(f"  - [CATCHING TIMER] {catch_duration:.1f}s - NO SHOOTING")
-                current_time = catch_time
-                current_tier = upgrade_tier
-                upgrade_index += 1
-            else:
-                time_segment = duration - current_time
-                weapon = self.weapons.get(current_tier)
-                if weapon:
-                    shots = time_segment / weapon.fire_rate
-                    bullets = shots * weapon.projectile_count
-                    total_bullets += bullets
-                    details.append(f"  - T{current_tier}: {shots:.1f} shots x {weapon.projectile_count} projectiles = {bullets:.0f} bullets")
-                current_time = duration
-        return int(total_bullets), details
-
-    def calculate_bullets_needed(self, wave: Dict) -> Tuple[int, int, List[str]]:
-        """Calculate bullets needed to kill all zomboids"""
+        for segment in segments:
+            if segment.weapon_name is not None:
+                total_bullets += segment.bullets
+
+        return int(total_bullets), segments
+
+    def kill_cost(self, health: int, tier: int = None, weapons: Dict[int, WeaponStats] = None,
+                  depth: int = None) -> KillCost:
+        """Memoized kill cost of a zomboid HP against a tier's weapon (a one-damage bullet if there is none)"""
+        weapon = (self.weapons if weapons is None else weapons).get(tier)
+        key = (health, weapon.damage, weapon.penetration_damage, depth) if weapon else (health, 1, 0, depth)
+        cost = self.kill_costs.get(key)
+        if cost is None:
+            cost = self.kill_costs[key] = simulate_kill_cost(*key)
+        return cost
+
+    def column_depth(self, pattern: Dict, zomboid: ZomboidStats, weapon: WeaponStats = None) -> int:
+        """
+        Most zomboids of a pattern one straight shot can pass through. The
+        column holds its share of the count, or of the spawn rate over one
+        zomboid's walk down the lane (as EventSimulator), whichever is
+        smaller; WaveManager scatters those over the column's snap positions,
+        and the shot only overlaps the ones within its reach.
+        """
+        columns = pattern_columns(pattern)
+        alive = -(-pattern['count'] // columns)
+        if zomboid.speed > 0:
+            alive = min(alive, math.ceil(pattern['spawnRate'] / columns * self.field.lane_length / zomboid.speed))
+        reach = zomboid.half_width + (weapon.projectile_size / 2 if weapon else 0)
+        lanes = self.field.snap_lanes(reach)
+        return max(-(-alive * lanes // (self.field.SNAP_COUNT // 2)), 1)
+
+    def calculate_bullets_needed(self, wave: Dict, tier: int = None,
+                                 timeline: WavePhaseTimeline = None) -> Tuple[int, int, List[KillRecord]]:
+        """
+        Calculate bullets needed to kill all zomboids. Each pattern is costed
+        against the tier the timeline has firing when it starts spawning (or
+        `tier` throughout), with penetration reaching no deeper than
+        column_depth.
+        """
         bullets_needed = 0
         overkill_waste = 0
-        details = []
-        damage_per_bullet = 1
+        records = []
 
         for zomboid_pattern in wave['spawnPattern']['zomboids']:
             zomboid_type = zomboid_pattern['type']
             count = zomboid_pattern['count']
             if zomboid_type in self.zomboids:
                 zomboid = self.zomboids[zomboid_type]
-                shots_needed = math.ceil(zomboid.health / damage_per_bullet)
-                total_bullets = shots_needed * count
-                overkill = (shots_needed * damage_per_bullet - zomboid.health) * count
+                pattern_tier = timeline.tier_at(zomboid_pattern.get('spawnDelay', 0)) if timeline is not None else tier
+                depth = self.column_depth(zomboid_pattern, zomboid, self.weapons.get(pattern_tier))
+                cost = self.kill_cost(zomboid.health, pattern_tier, depth=depth)
+                total_bullets = cost.bullets_for(count)
+                overkill = cost.waste_for(count)
                 bullets_needed += total_bullets
                 overkill_waste += overkill
-                details.append(f"  - {zomboid_type}: {count} x {zomboid.health}HP = {total_bullets} bullets (overkill: {overkill})")
-        return bullets_needed, overkill_waste, details
+                records.append(KillRecord(zomboid_type, count, zomboid.health, total_bullets, overkill, pattern_tier))
+        return bullets_needed, overkill_waste, records
 
     def grade_bullet_ratio(self, bullet_ratio: float) -> str:
         """Grade based on bullet surplus"""
-        if bullet_ratio >= 3.0:
-            return "A+ (Plenty of Ammo)"
-        elif bullet_ratio >= 2.0:
-            return "A (Comfortable)"
-        elif bullet_ratio >= 1.5:
-            return "B (Adequate)"
-        elif bullet_ratio >= 1.2:
-            return "C (Tight)"
-        elif bullet_ratio >= 1.0:
-            return "D (Very Tight)"
-        elif bullet_ratio >= 0.8:
-            return "E (Insufficient)"
-        else:
-            return "F (Critical Shortage)"
+        return BULLET_GRADE_LABELS[grade_index(bullet_ratio, BULLET_GRADE_THRESHOLDS)]
 
     def grade_wave(self, overkill_ratio: float) -> str:
         """Grade a wave based on overkill ratio"""
-        if overkill_ratio >= 2.0:
-            return "A+ (Very Easy)"
-        elif overkill_ratio >= 1.5:
-            return "A (Easy)"
-        elif overkill_ratio >= 1.2:
-            return "B (Balanced)"
-        elif overkill_ratio >= 1.0:
-            return "C (Challenging)"
-        elif overkill_ratio >= 0.8:
-            return "D (Hard)"
-        elif overkill_ratio >= 0.6:
-            return "E (Very Hard)"
-        else:
-            return "F (Nearly Impossible)"
+        return WAVE_GRADE_LABELS[grade_index(overkill_ratio, WAVE_GRADE_THRESHOLDS)]
 
-    def calculate_spawn_pressure(self, wave: Dict, starting_tier: int) -> Tuple[bool, List[str]]:
+    def calculate_spawn_pressure(self, wave: Dict, starting_tier: int,
+                                 timeline: WavePhaseTimeline = None) -> Tuple[bool, List[PressureRecord]]:
         """
         Check if spawn rate exceeds damage capacity at any point.
-        Returns: (has_pressure_problem, pressure_details)
+        Returns: (has_pressure_problem, pressure_records)
         """
-        pressure_details = []
-        has_problem = False
+        if timeline is None:
+            timeline = self.build_timeline(wave, starting_tier)
 
-        # Get weapon upgrades
-        upgrades = self.find_weapon_upgrades(wave)
-        current_tier = starting_tier
-        current_time = 0
-        upgrade_index = 0
-
-        # Check each phase
-        while current_time < wave['duration']:
-            # Determine next checkpoint
-            if upgrade_index < len(upgrades):
-                catch_time, upgrade_tier, catch_duration = upgrades[upgrade_index]
-                timer_spawn_time = catch_time - catch_duration
-                phase_end = timer_spawn_time
-                phase_name = f"Phase {upgrade_index + 1}: T{current_tier} weapon"
-            else:
-                phase_end = wave['duration']
-                phase_name = f"Final phase: T{current_tier} weapon"
-
-            if phase_end <= current_time:
-                if upgrade_index < len(upgrades):
-                    current_tier = upgrades[upgrade_index][1]
-                    current_time = upgrades[upgrade_index][0]
-                    upgrade_index += 1
-                continue
+        pressure_records = []
+        has_problem = False
 
+        # Check each firing phase
+        for phase_name, phase in timeline.firing_phases():
             # Calculate spawn rate during this phase
             spawn_hp_per_sec = 0
             for zomboid_pattern in wave['spawnPattern']['zomboids']:
@@ -345,41 +1532,36 @@ class BalanceAnalyzer:
                 spawn_delay = zomboid_pattern.get('spawnDelay', 0)
 
                 # Only count if spawning during this phase
-                if spawn_delay < phase_end and zomboid_type in self.zomboids:
+                if spawn_delay < phase.end and zomboid_type in self.zomboids:
                     hp_per_unit = self.zomboids[zomboid_type].health
                     spawn_hp_per_sec += spawn_rate * hp_per_unit
 
             # Get damage per second for current weapon
-            weapon = self.weapons.get(current_tier)
+            weapon = self.weapons.get(phase.tier)
             dps = weapon.dps() if weapon else 0
 
             # Check if we can keep up
             if spawn_hp_per_sec > dps:
                 has_problem = True
-                deficit = spawn_hp_per_sec - dps
-                pressure_details.append(
-                    f"  [SPAWN PRESSURE] {phase_name}: {spawn_hp_per_sec:.1f} HP/sec spawning vs {dps:.1f} DPS (SHORT {deficit:.1f} HP/sec!)"
-                )
-
-            current_time = phase_end
-            if upgrade_index < len(upgrades):
-                current_tier = upgrades[upgrade_index][1]
-                current_time = upgrades[upgrade_index][0]
-                upgrade_index += 1
+                pressure_records.append(PressureRecord(phase_name, spawn_hp_per_sec, dps))
 
-        return has_problem, pressure_details
+        return has_problem, pressure_records
 
     def analyze_wave(self, wave: Dict, starting_tier: int) -> WaveAnalysis:
         """Analyze a single wave"""
-        total_hp, hp_details = self.calculate_zomboid_hp(wave)
-        damage_capacity, tier_start, tier_end, damage_details = self.calculate_damage_capacity(wave, starting_tier)
+        total_hp, zomboid_records = self.calculate_zomboid_hp(wave)
+
+        # One timeline (and one pass over it) feeds every metric below
+        timeline = self.build_timeline(wave, starting_tier)
+        segments = self.calculate_segments(timeline)
+        damage_capacity, tier_start, tier_end, _ = self.calculate_damage_capacity(wave, starting_tier, timeline, segments)
 
         # Check spawn pressure
-        has_pressure, pressure_details = self.calculate_spawn_pressure(wave, starting_tier)
+        has_pressure, pressure_records = self.calculate_spawn_pressure(wave, starting_tier, timeline)
 
         # Calculate bullet analysis
-        bullets_available, bullet_details_avail = self.calculate_bullets_available(wave, starting_tier)
-        bullets_needed, overkill_waste, bullet_details_need = self.calculate_bullets_needed(wave)
+        bullets_available, _ = self.calculate_bullets_available(wave, starting_tier, timeline, segments)
+        bullets_needed, overkill_waste, kill_records = self.calculate_bullets_needed(wave, timeline=timeline)
         bullet_ratio = bullets_available / bullets_needed if bullets_needed > 0 else 0
         bullet_grade = self.grade_bullet_ratio(bullet_ratio)
 
@@ -388,27 +1570,10 @@ class BalanceAnalyzer:
         # Adjust grade if spawn pressure exists
         if has_pressure and overkill_ratio > 1.0:
             overkill_ratio = overkill_ratio * 0.5  # Penalize grade for spawn pressure
-            grade = self.grade_wave(overkill_ratio) + " [Spawn Pressure!]"
+            grade = self.grade_wave(overkill_ratio) + SPAWN_PRESSURE_TAG
         else:
             grade = self.grade_wave(overkill_ratio)
 
-        all_details = ["Zomboids:"] + hp_details + ["Damage Output:"] + damage_details
-        if pressure_details:
-            all_details += ["Spawn Pressure Analysis:"] + pressure_details
-
-        # Add bullet analysis details
-        all_details += [
-            "",
-            "Bullet Count Analysis:",
-            f"  Bullets Available: {bullets_available:,}",
-            f"  Bullets Needed: {bullets_needed:,}",
-            f"  Bullet Ratio: {bullet_ratio:.2f}x",
-            f"  Overkill Waste: {overkill_waste} damage",
-            f"  [BULLET GRADE]: {bullet_grade}"
-        ]
-        all_details += bullet_details_avail
-        all_details += bullet_details_need
-
         return WaveAnalysis(
             wave_id=wave['waveId'],
             wave_name=wave['waveName'],
@@ -419,12 +1584,15 @@ class BalanceAnalyzer:
             damage_capacity=damage_capacity,
             overkill_ratio=overkill_ratio,
             grade=grade,
-            details=all_details,
             bullets_available=bullets_available,
             bullets_needed=bullets_needed,
             bullet_ratio=bullet_ratio,
             bullet_grade=bullet_grade,
-            overkill_waste=overkill_waste
+            overkill_waste=overkill_waste,
+            zomboids=zomboid_records,
+            segments=segments,
+            pressure=pressure_records,
+            kills=kill_records,
         )
 
     def analyze_chapter(self, chapter: Dict, starting_tier: int = 1) -> List[WaveAnalysis]:
@@ -440,34 +1608,116 @@ class BalanceAnalyzer:
 
         return analyses
 
-    def print_report(self):
-        """Generate and print the full balance report"""
-        print("=" * 80)
-        print("ZOMBOID ASSAULT - BALANCE ANALYSIS REPORT")
-        print("=" * 80)
-        print()
+    def analyze_chapter_cached(self, chapter: Dict, state: ChapterState = ChapterState()) -> List[WaveAnalysis]:
+        """Analyze a chapter from the given starting state, reusing stored results"""
+        analyses = self.results.get(chapter, state)
+        if analyses is None:
+            analyses = self.analyze_chapter(chapter, state.weapon_tier)
+            self.results.put(chapter, state, analyses)
+        return analyses
 
-        # Track weapon tier across chapters for progressive mode
-        progressive_tier = 1
+    def chapter_end_state(self, chapter: Dict, state: ChapterState) -> ChapterState:
+        """State the player carries into the next chapter"""
+        analyses = self.analyze_chapter_cached(chapter, state)
+        if not analyses:
+            return state
+        # Hero count is not modelled by the wave analysis yet, so it carries over unchanged
+        return ChapterState(analyses[-1].weapon_tier_end, state.hero_count)
 
-        for chapter in self.chapters:
-            chapter_id = chapter['chapterId']
-            chapter_name = chapter['chapterName']
+    def get_chapter_starting_state(self, chapter_index: int) -> ChapterState:
+        """
+        Starting state for self.chapters[chapter_index].
+        Mirrors ProgressManager.getChapterStartingState: the first chapter starts
+        with T1 and 1 hero, later chapters continue from the previous chapter's end.
+        """
+        state = ChapterState()
+        for previous in self.chapters[:chapter_index]:
+            state = self.chapter_end_state(previous, state)
+        return state
 
-            print(f"\n{'=' * 80}")
-            print(f"[CHAPTER] {chapter_name} ({chapter_id})")
-            print(f"{'=' * 80}")
+    def iter_campaign(self):
+        """Yield (chapter, analyses) in order, each chapter starting from the previous chapter's end state"""
+        state = ChapterState()
+        for chapter in self.chapters:
+            yield chapter, self.analyze_chapter_cached(chapter, state)
+            state = self.chapter_end_state(chapter, state)
 
-            analyses = self.analyze_chapter(chapter, progressive_tier)
+    def stream_campaign(self, chapters, state: ChapterState = ChapterState()):
+        """
+        Yield (chapter, analyses) for any iterable of chapters, chaining state like iter_campaign.
 
-            # Update progressive tier for next chapter
+        Nothing is memoized (the result store keeps every chapter it sees), so
+        a generator of chapters, e.g. from iter_chapter_sources, is analyzed in
+        flat memory.
+        """
+        for chapter in chapters:
+            analyses = self.analyze_chapter(chapter, state.weapon_tier)
+            yield chapter, analyses
             if analyses:
-                progressive_tier = analyses[-1].weapon_tier_end
+                state = ChapterState(analyses[-1].weapon_tier_end, state.hero_count)
+
+    def analyze_campaign(self) -> List[Tuple[Dict, List[WaveAnalysis]]]:
+        """Analyze every chapter in order, each starting from the previous chapter's end state"""
+        return list(self.iter_campaign())
+
+    def write_records(self, fmt: str, stream=None, include_details: bool = False, campaign=None):
+        """
+        Stream one record per wave as 'json', 'jsonl' or 'csv'.
+        include_details adds the structured breakdown (JSON formats only).
+        campaign defaults to iter_campaign(), e.g. stream_campaign(...) for a corpus.
+        """
+        stream = stream or sys.stdout
+        csv_writer = None
+        first = True
 
+        if fmt == 'json':
+            stream.write("[")
+        for chapter, analyses in self.iter_campaign() if campaign is None else campaign:
             for analysis in analyses:
-                print(f"\n[WAVE {analysis.wave_id}] {analysis.wave_name}")
-                print(f"   Duration: {analysis.duration}s")
-                print(f"   Weapon: Tier {analysis.weapon_tier_start}", end="")
+                record = {'chapter_id': chapter['chapterId'], 'chapter_name': chapter['chapterName']}
+                record.update(analysis.record(include_details and fmt != 'csv'))
+
+                if fmt == 'csv':
+                    if csv_writer is None:
+                        csv_writer = csv.DictWriter(stream, fieldnames=list(record), lineterminator="\n")
+                        csv_writer.writeheader()
+                    csv_writer.writerow(record)
+                elif fmt == 'jsonl':
+                    stream.write(json.dumps(record) + "\n")
+                else:
+                    stream.write(("\n  " if first else ",\n  ") + json.dumps(record))
+                    first = False
+        if fmt == 'json':
+            stream.write("\n]\n")
+        stream.flush()
+
+    def print_report(self, campaign=None, summary: CampaignSummary = None):
+        """
+        Generate and print the full balance report.
+        Chapters are printed as they are analyzed and only the summary
+        aggregate is kept, so campaign (default iter_campaign()) may be a
+        stream_campaign(...) generator over a corpus of any size.
+        """
+        print("=" * 80)
+        print("ZOMBOID ASSAULT - BALANCE ANALYSIS REPORT")
+        print("=" * 80)
+        print()
+
+        summary = summary or CampaignSummary()
+
+        # Weapon tier carries across chapters (progressive mode)
+        for chapter, analyses in self.iter_campaign() if campaign is None else campaign:
+            chapter_id = chapter['chapterId']
+            chapter_name = chapter['chapterName']
+
+            print(f"\n{'=' * 80}")
+            print(f"[CHAPTER] {chapter_name} ({chapter_id})")
+            print(f"{'=' * 80}")
+
+            for analysis in analyses:
+                print(f"\n[WAVE {analysis.wave_id}] {analysis.wave_name}")
+                print(f"   Duration: {analysis.duration}s")
+                print(f"   Weapon: Tier {analysis.weapon_tier_start}", end="")
                 if analysis.weapon_tier_end != analysis.weapon_tier_start:
                     print(f" -> Tier {analysis.weapon_tier_end}")
                 else:
@@ -484,7 +1734,7 @@ class BalanceAnalyzer:
                 print(f"   [BULLET GRADE]: {analysis.bullet_grade}")
 
                 # Show details for problem waves
-                show_details = analysis.overkill_ratio < 1.0 or "[Spawn Pressure!]" in analysis.grade or analysis.bullet_ratio < 1.3
+                show_details = analysis.overkill_ratio < 1.0 or SPAWN_PRESSURE_TAG in analysis.grade or analysis.bullet_ratio < 1.3
 
                 if analysis.overkill_ratio < 1.0:
                     deficit = analysis.total_zomboid_hp - analysis.damage_capacity
@@ -498,57 +1748,39 @@ class BalanceAnalyzer:
                     for detail in analysis.details:
                         print(f"   {detail}")
 
+            summary.add(chapter, analyses)
+
         # Summary statistics
         print(f"\n\n{'=' * 80}")
         print("[SUMMARY STATISTICS]")
         print(f"{'=' * 80}")
 
-        all_analyses = []
-        for chapter in self.chapters:
-            all_analyses.extend(self.analyze_chapter(chapter))
-
-        grades = {}
-        bullet_grades = {}
-        problem_waves = []
-        bullet_problems = []
-
-        for analysis in all_analyses:
-            grade_letter = analysis.grade.split()[0]
-            grades[grade_letter] = grades.get(grade_letter, 0) + 1
-
-            bullet_grade_letter = analysis.bullet_grade.split()[0]
-            bullet_grades[bullet_grade_letter] = bullet_grades.get(bullet_grade_letter, 0) + 1
-
-            if analysis.overkill_ratio < 1.0:
-                problem_waves.append(
-                    f"  - {analysis.wave_name}: {analysis.overkill_ratio:.2f}x (needs {(1.0 - analysis.overkill_ratio) * 100:.0f}% more damage capacity)"
-                )
-
-            if analysis.bullet_ratio < 1.3:
-                bullet_problems.append(
-                    f"  - {analysis.wave_name}: {analysis.bullet_ratio:.2f}x (recommended: >=1.3x)"
-                )
-
-        print(f"\nTotal Waves Analyzed: {len(all_analyses)}")
+        print(f"\nTotal Waves Analyzed: {summary.waves}")
         print("\nDPS Grade Distribution:")
-        for grade in sorted(grades.keys()):
-            print(f"  {grade}: {grades[grade]} waves")
+        for grade in sorted(summary.grades.keys()):
+            print(f"  {grade}: {summary.grades[grade]} waves")
 
         print("\nBullet Count Grade Distribution:")
-        for grade in sorted(bullet_grades.keys()):
-            print(f"  {grade}: {bullet_grades[grade]} waves")
+        for grade in sorted(summary.bullet_grades.keys()):
+            print(f"  {grade}: {summary.bullet_grades[grade]} waves")
 
+        problem_waves = summary.problem_waves
         if problem_waves:
-            print(f"\n[PROBLEM WAVES - DPS] ({len(problem_waves)} waves with overkill < 1.0):")
+            print(f"\n[PROBLEM WAVES - DPS] ({summary.problem_count} waves with overkill < 1.0):")
             for wave in problem_waves:
                 print(wave)
+            if len(problem_waves) < summary.problem_count:
+                print(f"  ... {len(problem_waves)} worst shown")
         else:
             print("\n[SUCCESS - DPS] No problem waves detected! All waves appear balanced.")
 
+        bullet_problems = summary.bullet_problems
         if bullet_problems:
-            print(f"\n[PROBLEM WAVES - BULLETS] ({len(bullet_problems)} waves with bullet ratio < 1.3):")
+            print(f"\n[PROBLEM WAVES - BULLETS] ({summary.bullet_problem_count} waves with bullet ratio < 1.3):")
             for wave in bullet_problems:
                 print(wave)
+            if len(bullet_problems) < summary.bullet_problem_count:
+                print(f"  ... {len(bullet_problems)} worst shown")
         else:
             print("\n[SUCCESS - BULLETS] All waves meet the 1.3x bullet ratio threshold!")
 
@@ -556,18 +1788,4097 @@ class BalanceAnalyzer:
         print("END OF REPORT")
         print("=" * 80)
 
-def main():
-    # Determine config directory
-    script_dir = Path(__file__).parent
-    config_dir = script_dir / "public" / "config"
+@dataclass
+class WaveBatch:
+    """
+    Struct-of-arrays view of many waves.
 
-    if not config_dir.exists():
-        print(f"Error: Config directory not found at {config_dir}")
-        return
+    Per-wave arrays have shape (W,); zomboid pattern arrays are (W, P) and
+    weapon upgrade timer arrays are (W, U), padded where a wave has fewer
+    entries (count 0 / upgrade_mask False).
+    """
+    duration: "np.ndarray"
+    starting_tier: "np.ndarray"
+    zomboid_type: "np.ndarray"      # index into BatchAnalyzer.zomboid_ids, -1 = padding/unknown
+    zomboid_count: "np.ndarray"
+    zomboid_hp: "np.ndarray"
+    spawn_rate: "np.ndarray"
+    spawn_delay: "np.ndarray"
+    zomboid_columns: "np.ndarray"   # columns each pattern spawns across
+    upgrade_spawn_time: "np.ndarray"
+    upgrade_start_value: "np.ndarray"
+    upgrade_tier: "np.ndarray"
+    upgrade_mask: "np.ndarray"
+    wave_ids: "np.ndarray" = None
+    wave_names: List[str] = None
+    # Optional per-wave player skill (see MonteCarloAnalyzer); None means a perfect player
+    catch_speed: "np.ndarray" = None
+    hit_rate: "np.ndarray" = None
+    # Optional per-wave index into BatchAnalyzer.variants (alternative weapon/zomboid stats); None means variant 0
+    variant: "np.ndarray" = None
+
+    def __len__(self) -> int:
+        return len(self.duration)
+
+    def tile(self, times: int) -> "WaveBatch":
+        """Repeat the whole batch back to back, e.g. once per Monte Carlo trial"""
+        def repeat(array):
+            if array is None:
+                return None
+            return np.tile(array, (times,) + (1,) * (array.ndim - 1))
+
+        return WaveBatch(
+            duration=repeat(self.duration),
+            starting_tier=repeat(self.starting_tier),
+            zomboid_type=repeat(self.zomboid_type),
+            zomboid_count=repeat(self.zomboid_count),
+            zomboid_hp=repeat(self.zomboid_hp),
+            spawn_rate=repeat(self.spawn_rate),
+            spawn_delay=repeat(self.spawn_delay),
+            zomboid_columns=repeat(self.zomboid_columns),
+            upgrade_spawn_time=repeat(self.upgrade_spawn_time),
+            upgrade_start_value=repeat(self.upgrade_start_value),
+            upgrade_tier=repeat(self.upgrade_tier),
+            upgrade_mask=repeat(self.upgrade_mask),
+            wave_ids=repeat(self.wave_ids),
+            wave_names=self.wave_names * times if self.wave_names is not None else None,
+            catch_speed=repeat(self.catch_speed),
+            hit_rate=repeat(self.hit_rate),
+            variant=repeat(self.variant),
+        )
+
+@dataclass
+class BatchResult:
+    """Per-wave metrics from BatchAnalyzer, one array entry per wave"""
+    total_zomboid_hp: "np.ndarray"
+    damage_capacity: "np.ndarray"
+    weapon_tier_start: "np.ndarray"
+    weapon_tier_end: "np.ndarray"
+    has_pressure: "np.ndarray"
+    overkill_ratio: "np.ndarray"
+    grade_code: "np.ndarray"         # index into WAVE_GRADE_LABELS
+    bullets_available: "np.ndarray"
+    bullets_needed: "np.ndarray"
+    overkill_waste: "np.ndarray"
+    bullet_ratio: "np.ndarray"
+    bullet_grade_code: "np.ndarray"  # index into BULLET_GRADE_LABELS
+    pattern_tier: "np.ndarray" = None  # (W, P) tier each pattern's bullets_needed is costed against
+    tier_seconds: "np.ndarray" = None  # (W, tiers) seconds spent firing each tier
+
+    def __len__(self) -> int:
+        return len(self.damage_capacity)
+
+    def grade(self, i: int) -> str:
+        grade = WAVE_GRADE_LABELS[self.grade_code[i]]
+        return grade + SPAWN_PRESSURE_TAG if self.has_pressure[i] else grade
+
+    def bullet_grade(self, i: int) -> str:
+        return BULLET_GRADE_LABELS[self.bullet_grade_code[i]]
+
+class BatchAnalyzer:
+    """
+    Vectorized counterpart of BalanceAnalyzer.analyze_wave.
+
+    Runs the same model over a WaveBatch with NumPy array operations and
+    produces the same numbers as the scalar path, wave for wave.
+
+    Lookup tables have a leading variant axis. Variant 0 is the loaded
+    config; add_variant registers alternative weapon/zomboid stats that
+    individual rows select through WaveBatch.variant.
+    """
+
+    def __init__(self, analyzer: BalanceAnalyzer):
+        require_numpy()
+        self.analyzer = analyzer
+        self.zomboid_ids = list(analyzer.zomboids.keys())
+        self.zomboid_index = {zomboid_id: i for i, zomboid_id in enumerate(self.zomboid_ids)}
+        self.variants: List[Tuple[Dict[int, WeaponStats], Dict[str, ZomboidStats]]] = [(analyzer.weapons, analyzer.zomboids)]
+        self._build_weapon_tables(max(analyzer.weapons.keys(), default=0))
+
+    TABLES = ('tier_dps', 'tier_fire_rate', 'tier_projectile_count', 'tier_projectile_half', 'zomboid_speed',
+              'zomboid_half_width')
+
+    def add_variant(self, weapons: Dict[int, WeaponStats] = None, zomboids: Dict[str, ZomboidStats] = None) -> int:
+        """Register alternative weapon and/or zomboid stats; returns the index rows use in WaveBatch.variant"""
+        variant = (self.analyzer.weapons if weapons is None else weapons,
+                   self.analyzer.zomboids if zomboids is None else zomboids)
+        self.variants.append(variant)
+        tables = self._variant_tables(*variant, self.tier_dps.shape[1])
+        for name in self.TABLES:
+            setattr(self, name, np.concatenate([getattr(self, name), tables[name][None]]))
+        return len(self.variants) - 1
+
+    def _variant_tables(self, weapons: Dict[int, WeaponStats], zomboids: Dict[str, ZomboidStats], size: int) -> Dict:
+        """Per-tier lookup tables for one variant; tiers with no weapon deal no damage"""
+        tables = {
+            'tier_dps': np.zeros(size),
+            'tier_fire_rate': np.full(size, np.inf),
+            'tier_projectile_count': np.zeros(size),
+            'tier_projectile_half': np.zeros(size),
+        }
+        for tier, weapon in weapons.items():
+            if 0 <= tier < size:
+                tables['tier_dps'][tier] = weapon.dps()
+                if weapon.fire_rate:
+                    tables['tier_fire_rate'][tier] = weapon.fire_rate
+                tables['tier_projectile_count'][tier] = weapon.projectile_count
+                tables['tier_projectile_half'][tier] = weapon.projectile_size / 2
+
+        # Per zomboid type, for the column depth penetration can reach
+        tables['zomboid_speed'] = np.zeros(max(len(self.zomboid_ids), 1))
+        tables['zomboid_half_width'] = np.zeros(max(len(self.zomboid_ids), 1))
+        for index, zomboid_id in enumerate(self.zomboid_ids):
+            tables['zomboid_speed'][index] = zomboids[zomboid_id].speed
+            tables['zomboid_half_width'][index] = zomboids[zomboid_id].half_width
+        return tables
+
+    def _build_weapon_tables(self, max_tier: int):
+        """Per-(variant, tier) lookup tables, stacked over every registered variant"""
+        per_variant = [self._variant_tables(weapons, zomboids, max_tier + 1) for weapons, zomboids in self.variants]
+        for name in self.TABLES:
+            setattr(self, name, np.stack([tables[name] for tables in per_variant]))
+
+    def pack_waves(self, waves: List[Dict], starting_tiers=1) -> WaveBatch:
+        """Pack wave dicts (chapter JSON schema) into a WaveBatch"""
+        count = len(waves)
+        max_patterns = max((len(w['spawnPattern']['zomboids']) for w in waves), default=0)
+        max_upgrades = max((sum(1 for t in w['spawnPattern'].get('timers', [])
+                                if t['type'] == 'weapon_upgrade_timer') for w in waves), default=0)
+
+        zomboid_type = np.full((count, max_patterns), -1, dtype=np.int64)
+        zomboid_count = np.zeros((count, max_patterns), dtype=np.int64)
+        zomboid_hp = np.zeros((count, max_patterns), dtype=np.int64)
+        spawn_rate = np.zeros((count, max_patterns))
+        spawn_delay = np.zeros((count, max_patterns))
+        zomboid_columns = np.ones((count, max_patterns), dtype=np.int64)
+        upgrade_spawn_time = np.zeros((count, max_upgrades))
+        upgrade_start_value = np.zeros((count, max_upgrades))
+        upgrade_tier = np.zeros((count, max_upgrades), dtype=np.int64)
+        upgrade_mask = np.zeros((count, max_upgrades), dtype=bool)
+
+        zomboids = self.analyzer.zomboids
+        for i, wave in enumerate(waves):
+            for p, pattern in enumerate(wave['spawnPattern']['zomboids']):
+                zomboid_count[i, p] = pattern['count']
+                spawn_rate[i, p] = pattern['spawnRate']
+                spawn_delay[i, p] = pattern.get('spawnDelay', 0)
+                zomboid_columns[i, p] = pattern_columns(pattern)
+                if pattern['type'] in zomboids:
+                    zomboid_type[i, p] = self.zomboid_index[pattern['type']]
+                    zomboid_hp[i, p] = zomboids[pattern['type']].health
+            u = 0
+            for timer in wave['spawnPattern'].get('timers', []):
+                if timer['type'] == 'weapon_upgrade_timer':
+                    upgrade_spawn_time[i, u] = timer['spawnTime']
+                    upgrade_start_value[i, u] = timer.get('startValue', -50)
+                    upgrade_tier[i, u] = timer.get('weaponTier', 2)
+                    upgrade_mask[i, u] = True
+                    u += 1
+
+        # Per-wave speeds only when a calibration profile changed any
+        catch_speed = np.array([wave_catch_speed(w) for w in waves], dtype=np.float64)
+        return WaveBatch(
+            duration=np.array([w['duration'] for w in waves], dtype=np.float64),
+            starting_tier=np.broadcast_to(np.asarray(starting_tiers, dtype=np.int64), (count,)).copy(),
+            zomboid_type=zomboid_type,
+            zomboid_count=zomboid_count,
+            zomboid_hp=zomboid_hp,
+            spawn_rate=spawn_rate,
+            spawn_delay=spawn_delay,
+            zomboid_columns=zomboid_columns,
+            upgrade_spawn_time=upgrade_spawn_time,
+            upgrade_start_value=upgrade_start_value,
+            upgrade_tier=upgrade_tier,
+            upgrade_mask=upgrade_mask,
+            wave_ids=np.array([w['waveId'] for w in waves], dtype=np.int64),
+            wave_names=[w['waveName'] for w in waves],
+            catch_speed=catch_speed if (catch_speed != CATCH_POINTS_PER_SECOND).any() else None,
+        )
+
+    def pack_snapshot(self, snapshot: ConfigSnapshot) -> WaveBatch:
+        """pack_waves for every wave in a config snapshot, straight from its packed tables"""
+        def column(table, name, dtype):
+            return np.frombuffer(snapshot.column(table, name), dtype=dtype) if snapshot.rows(table) else np.zeros(0, dtype)
 
+        count = snapshot.rows('waves')
+        strings = snapshot.strings
+        # String id -> zomboid index (-1 unknown) and -> health
+        type_index = np.array([self.zomboid_index.get(text, -1) for text in strings] + [-1], dtype=np.int64)
+        type_hp = np.array([self.analyzer.zomboids[text].health if text in self.analyzer.zomboids else 0
+                            for text in strings] + [0], dtype=np.int64)
+
+        def layout(length):
+            """(wave, slot) of every row of a per-wave child table; each wave's rows are contiguous"""
+            starts = np.cumsum(length) - length
+            return np.repeat(np.arange(count), length), np.arange(int(length.sum())) - np.repeat(starts, length)
+
+        pattern_count = column('waves', 'pattern_count', np.int64)
+        pattern_wave, pattern_slot = layout(pattern_count)
+        max_patterns = int(pattern_count.max(initial=0))
+        pattern_type = column('patterns', 'type', np.int64)
+
+        zomboid_type = np.full((count, max_patterns), -1, dtype=np.int64)
+        zomboid_count = np.zeros((count, max_patterns), dtype=np.int64)
+        zomboid_hp = np.zeros((count, max_patterns), dtype=np.int64)
+        spawn_rate = np.zeros((count, max_patterns))
+        spawn_delay = np.zeros((count, max_patterns))
+        zomboid_columns = np.ones((count, max_patterns), dtype=np.int64)
+        zomboid_type[pattern_wave, pattern_slot] = type_index[pattern_type]
+        zomboid_count[pattern_wave, pattern_slot] = column('patterns', 'count', np.int64)
+        zomboid_hp[pattern_wave, pattern_slot] = type_hp[pattern_type]
+        spawn_rate[pattern_wave, pattern_slot] = column('patterns', 'spawn_rate', np.float64)
+        spawn_delay[pattern_wave, pattern_slot] = column('patterns', 'spawn_delay', np.float64)
+        zomboid_columns[pattern_wave, pattern_slot] = column('patterns', 'columns', np.int64)
+
+        # Only weapon upgrade timers feed the batch model; slots count upgrades within each wave
+        timer_wave, _ = layout(column('waves', 'timer_count', np.int64))
+        upgrade_id = strings.index('weapon_upgrade_timer') if 'weapon_upgrade_timer' in strings else -2
+        is_upgrade = column('timers', 'type', np.int64) == upgrade_id
+        upgrade_wave = timer_wave[is_upgrade]
+        upgrade_count = np.bincount(upgrade_wave, minlength=count)
+        _, upgrade_slot = layout(upgrade_count)
+        max_upgrades = int(upgrade_count.max(initial=0))
+
+        upgrade_spawn_time = np.zeros((count, max_upgrades))
+        upgrade_start_value = np.zeros((count, max_upgrades))
+        upgrade_tier = np.zeros((count, max_upgrades), dtype=np.int64)
+        upgrade_mask = np.zeros((count, max_upgrades), dtype=bool)
+        upgrade_spawn_time[upgrade_wave, upgrade_slot] = column('timers', 'spawn_time', np.float64)[is_upgrade]
+        upgrade_start_value[upgrade_wave, upgrade_slot] = column('timers', 'start_value', np.float64)[is_upgrade]
+        upgrade_tier[upgrade_wave, upgrade_slot] = column('timers', 'weapon_tier', np.int64)[is_upgrade]
+        upgrade_mask[upgrade_wave, upgrade_slot] = True
+        catch_speed = column('waves', 'catch_speed', np.float64)
+
+        return WaveBatch(
+            duration=column('waves', 'duration', np.float64).copy(),
+            starting_tier=np.ones(count, dtype=np.int64),
+            zomboid_type=zomboid_type,
+            zomboid_count=zomboid_count,
+            zomboid_hp=zomboid_hp,
+            spawn_rate=spawn_rate,
+            spawn_delay=spawn_delay,
+            zomboid_columns=zomboid_columns,
+            upgrade_spawn_time=upgrade_spawn_time,
+            upgrade_start_value=upgrade_start_value,
+            upgrade_tier=upgrade_tier,
+            upgrade_mask=upgrade_mask,
+            wave_ids=column('waves', 'wave_id', np.int64).copy(),
+            wave_names=[strings[index] for index in snapshot.column('waves', 'name')],
+            catch_speed=catch_speed.copy() if (catch_speed != CATCH_POINTS_PER_SECOND).any() else None,
+        )
+
+    def pack_campaign(self, chapters: List[Dict], initial_tier: int = 1) -> WaveBatch:
+        """Pack every wave of every chapter, chaining weapon tiers through the campaign"""
+        if isinstance(chapters, SnapshotChapters):
+            batch = self.pack_snapshot(chapters.snapshot)
+        else:
+            batch = self.pack_waves([wave for chapter in chapters for wave in chapter['waves']])
+        self.chain_starting_tiers(batch, initial_tier)
+        return batch
+
+    def _sorted_upgrades(self, batch: WaveBatch):
+        """Catch times, catch durations and tiers per wave, sorted by catch time like find_weapon_upgrades"""
+        # Same catch estimate as find_weapon_upgrades unless the batch carries per-wave speeds
+        if batch.catch_speed is None:
+            catch_duration = np.abs(batch.upgrade_start_value) / CATCH_POINTS_PER_SECOND
+        else:
+            catch_duration = np.abs(batch.upgrade_start_value) / batch.catch_speed[:, None]
+        catch_time = np.where(batch.upgrade_mask, batch.upgrade_spawn_time + catch_duration, np.inf)
+        order = np.argsort(catch_time, axis=1, kind='stable')
+        return (np.take_along_axis(catch_time, order, axis=1),
+                np.take_along_axis(catch_duration, order, axis=1),
+                np.take_along_axis(batch.upgrade_tier, order, axis=1))
+
+    def chain_starting_tiers(self, batch: WaveBatch, initial_tier: int = 1, run_length: int = None):
+        """
+        Set each wave's starting tier to the previous wave's ending tier.
+        A wave ends on its last upgrade caught in time, or keeps the tier it started with.
+        With run_length, the batch is treated as independent back-to-back runs
+        (e.g. tiled campaigns) and the chain restarts at initial_tier for each run.
+        """
+        count = len(batch)
+        run_length = run_length or count
+        catch_time, _, tiers = self._sorted_upgrades(batch)
+        landed = catch_time <= batch.duration[:, None]
+        landed_count = landed.sum(axis=1)
+        has_landed = landed_count > 0
+        last_tier = np.where(has_landed, tiers[np.arange(count), np.maximum(landed_count - 1, 0)], 0)
+
+        # Forward-fill the last landed tier within each run; each wave starts with what the previous one ended on
+        source = np.where(has_landed, np.arange(count), -1).reshape(-1, run_length)
+        source = np.maximum.accumulate(source, axis=1)
+        starting = np.full((count // run_length, run_length), initial_tier, dtype=np.int64)
+        previous = source[:, :-1]
+        starting[:, 1:] = np.where(previous >= 0, last_tier[np.maximum(previous, 0)], initial_tier)
+        batch.starting_tier = starting.reshape(-1)
+
+    @staticmethod
+    def _spawn_hp_rate(batch: WaveBatch, pattern_hp_rate: "np.ndarray", phase_end: "np.ndarray") -> "np.ndarray":
+        """HP/sec spawning from patterns that have started before phase_end"""
+        rate = np.zeros(len(batch))
+        # Accumulate pattern by pattern so float sums match the scalar loop exactly
+        for p in range(pattern_hp_rate.shape[1]):
+            rate = rate + np.where(batch.spawn_delay[:, p] < phase_end, pattern_hp_rate[:, p], 0.0)
+        return rate
+
+    def analyze(self, batch: WaveBatch) -> BatchResult:
+        """Vectorized analyze_wave over every wave in the batch"""
+        max_tier = max(int(batch.starting_tier.max(initial=0)), int(batch.upgrade_tier.max(initial=0)))
+        if max_tier >= self.tier_dps.shape[1]:
+            self._build_weapon_tables(max_tier)
+
+        count = len(batch)
+        duration = batch.duration
+        catch_time, catch_duration, upgrade_tier = self._sorted_upgrades(batch)
+
+        current_time = np.zeros(count)
+        current_tier = batch.starting_tier.copy()
+        damage = np.zeros(count)
+        bullets = np.zeros(count)
+        has_pressure = np.zeros(count, dtype=bool)
+        # Tier shooting each pattern, as in WavePhaseTimeline.tier_at (-1 until its phase is reached)
+        pattern_tier = np.full(batch.zomboid_type.shape, -1, dtype=np.int64)
+        tier_seconds = np.zeros((count, self.tier_dps.shape[1]))
+        rows = np.arange(count)
+        variant = batch.variant if batch.variant is not None else np.zeros(count, dtype=np.int64)
+        pattern_hp_rate = np.where(batch.zomboid_type >= 0, batch.spawn_rate * batch.zomboid_hp, 0.0)
+
+        def reach_phase(phase_end, in_phase, tier):
+            spawns = (pattern_tier < 0) & in_phase[:, None] & (batch.spawn_delay < phase_end[:, None])
+            np.copyto(pattern_tier, tier[:, None], where=spawns)
+
+        def fire_until(phase_end, firing):
+            nonlocal damage, bullets, has_pressure
+            segment = np.where(firing, phase_end - current_time, 0.0)
+            tier_seconds[rows, current_tier] += segment
+            dps = self.tier_dps[variant, current_tier]
+            fired = (segment / self.tier_fire_rate[variant, current_tier]) * self.tier_projectile_count[variant, current_tier]
+            if batch.hit_rate is not None:
+                # Only bullets that hit count towards damage and bullets available
+                dps = dps * batch.hit_rate
+                fired = fired * batch.hit_rate
+            damage = damage + dps * segment
+            bullets = bullets + fired
+            has_pressure |= firing & (self._spawn_hp_rate(batch, pattern_hp_rate, phase_end) > dps)
+
+        # Walk the upgrade slots in catch order, mirroring WavePhaseTimeline
+        for k in range(catch_time.shape[1]):
+            landed = catch_time[:, k] <= duration
+            timer_spawn_time = catch_time[:, k] - catch_duration[:, k]
+            firing = landed & (timer_spawn_time > current_time)
+            fire_until(timer_spawn_time, firing)
+            reach_phase(timer_spawn_time, firing, current_tier)
+            reach_phase(catch_time[:, k], landed, upgrade_tier[:, k])
+            current_time = np.where(landed, catch_time[:, k], current_time)
+            current_tier = np.where(landed, upgrade_tier[:, k], current_tier)
+
+        fire_until(duration, current_time < duration)
+        np.copyto(pattern_tier, current_tier[:, None], where=pattern_tier < 0)
+
+        total_hp = (batch.zomboid_count * batch.zomboid_hp).sum(axis=1)
+        bullets_available = bullets.astype(np.int64)
+
+        # Kill costs as in calculate_bullets_needed, simulated once per distinct (variant, tier, type, depth).
+        # Only real patterns take part, flattened to one row each and summed back per wave.
+        bullets_needed = np.zeros(count, dtype=np.int64)
+        overkill_waste = np.zeros(count, dtype=np.int64)
+        flat = np.flatnonzero((batch.zomboid_type >= 0) & (batch.zomboid_count > 0))
+        if len(flat):
+            wave = flat // batch.zomboid_type.shape[1]
+            kind = batch.zomboid_type.ravel().take(flat)
+            zomboid_count = batch.zomboid_count.ravel().take(flat)
+            columns = batch.zomboid_columns.ravel().take(flat)
+            wave_variant = variant.take(wave)
+            tier = pattern_tier.ravel().take(flat)
+            field = self.analyzer.field
+            speed = self.zomboid_speed[wave_variant, kind]
+            per_column = -(-zomboid_count // columns)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                alive = np.ceil(batch.spawn_rate.ravel().take(flat) / columns * field.lane_length / speed)
+            alive = np.where(speed > 0, np.minimum(per_column, alive), per_column).astype(np.int64)
+            # Share of the column's snap positions the shot overlaps, as in column_depth / FieldGeometry.snap_lanes
+            reach = self.zomboid_half_width[wave_variant, kind] + self.tier_projectile_half[wave_variant, tier]
+            beside = np.maximum(np.ceil(reach / field.snap_spacing) - 1, 0).astype(np.int64)
+            lanes = np.minimum(1 + 2 * beside, field.SNAP_COUNT // 2)
+            depth = np.maximum(-(-alive * lanes // (field.SNAP_COUNT // 2)), 1)
+
+            # One int64 key per row: 1-D np.unique is a plain sort, the axis=0 form is far slower
+            tiers, types, depths = self.tier_dps.shape[1], len(self.zomboid_ids), int(depth.max()) + 1
+            keys = ((wave_variant * tiers + tier) * types + kind) * depths + depth
+            combos, inverse = np.unique(keys, return_inverse=True)
+            costs = []
+            for combo in combos.tolist():
+                combo, combo_depth = divmod(combo, depths)
+                combo, combo_type = divmod(combo, types)
+                combo_variant, combo_tier = divmod(combo, tiers)
+                weapons, zomboids = self.variants[combo_variant]
+                health = zomboids[self.zomboid_ids[combo_type]].health
+                costs.append(self.analyzer.kill_cost(health, combo_tier, weapons, combo_depth))
+            table = np.array([(cost.bullets, cost.kills, cost.waste, cost.hits_to_kill) for cost in costs],
+                             dtype=np.int64)[inverse.reshape(-1)]
+            group_bullets = np.maximum(-(-zomboid_count * table[:, 0] // table[:, 1]), table[:, 3])
+            # Per-wave sums stay exact in float64 well past any realistic bullet count
+            bullets_needed = np.bincount(wave, weights=group_bullets, minlength=count).astype(np.int64)
+            overkill_waste = np.bincount(wave, weights=zomboid_count * table[:, 2] // table[:, 1],
+                                         minlength=count).astype(np.int64)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            bullet_ratio = np.where(bullets_needed > 0, bullets_available / bullets_needed, 0.0)
+            overkill_ratio = np.where(total_hp > 0, damage / total_hp, 0.0)
+
+        # Penalize grade for spawn pressure
+        penalized = has_pressure & (overkill_ratio > 1.0)
+        overkill_ratio = np.where(penalized, overkill_ratio * 0.5, overkill_ratio)
+
+        return BatchResult(
+            total_zomboid_hp=total_hp,
+            damage_capacity=damage,
+            weapon_tier_start=batch.starting_tier.copy(),
+            weapon_tier_end=current_tier,
+            has_pressure=penalized,
+            overkill_ratio=overkill_ratio,
+            grade_code=grade_codes(overkill_ratio, WAVE_GRADE_THRESHOLDS),
+            bullets_available=bullets_available,
+            bullets_needed=bullets_needed,
+            overkill_waste=overkill_waste,
+            bullet_ratio=bullet_ratio,
+            bullet_grade_code=grade_codes(bullet_ratio, BULLET_GRADE_THRESHOLDS),
+            pattern_tier=pattern_tier,
+            tier_seconds=tier_seconds,
+        )
+
+    def verify_against_scalar(self, chapters: List[Dict]) -> List[str]:
+        """Compare batch results with the scalar path over a campaign; returns mismatch descriptions"""
+        batch = self.pack_campaign(chapters)
+        result = self.analyze(batch)
+        scalar = []
+        state = ChapterState()
+        for chapter in chapters:
+            scalar.extend(self.analyzer.analyze_chapter_cached(chapter, state))
+            state = self.analyzer.chapter_end_state(chapter, state)
+
+        mismatches = []
+        for i, analysis in enumerate(scalar):
+            expected = {
+                'total_zomboid_hp': analysis.total_zomboid_hp,
+                'damage_capacity': analysis.damage_capacity,
+                'weapon_tier_start': analysis.weapon_tier_start,
+                'weapon_tier_end': analysis.weapon_tier_end,
+                'overkill_ratio': analysis.overkill_ratio,
+                'bullets_available': analysis.bullets_available,
+                'bullets_needed': analysis.bullets_needed,
+                'overkill_waste': analysis.overkill_waste,
+                'bullet_ratio': analysis.bullet_ratio,
+            }
+            for field, value in expected.items():
+                got = getattr(result, field)[i]
+                if got != value:
+                    mismatches.append(f"  - {analysis.wave_name}: {field} batch={got} scalar={value}")
+            if result.grade(i) != analysis.grade:
+                mismatches.append(f"  - {analysis.wave_name}: grade batch={result.grade(i)} scalar={analysis.grade}")
+            if result.bullet_grade(i) != analysis.bullet_grade:
+                mismatches.append(f"  - {analysis.wave_name}: bullet_grade batch={result.bullet_grade(i)} scalar={analysis.bullet_grade}")
+        return mismatches
+
+def grade_codes(ratios: "np.ndarray", thresholds: Tuple[float, ...]) -> "np.ndarray":
+    """Vectorized grade_index: number of thresholds the ratio falls short of"""
+    codes = np.zeros(len(ratios), dtype=np.int8)
+    for threshold in thresholds:
+        codes += ratios < threshold
+    return codes
+
+def run_batch(analyzer: BalanceAnalyzer):
+    """Run the campaign through the vectorized engine and check it against the scalar path"""
+    import time
+
+    engine = BatchAnalyzer(analyzer)
+    batch = engine.pack_campaign(analyzer.chapters)
+
+    start = time.perf_counter()
+    result = engine.analyze(batch)
+    elapsed = time.perf_counter() - start
+
+    print("=" * 80)
+    print("ZOMBOID ASSAULT - BATCH ANALYSIS")
+    print("=" * 80)
+    print(f"\nAnalyzed {len(result)} waves in {elapsed * 1000:.2f} ms")
+
+    print("\nDPS Grade Distribution:")
+    for code, label in enumerate(WAVE_GRADE_LABELS):
+        waves = int((result.grade_code == code).sum())
+        if waves:
+            print(f"  {label.split()[0]}: {waves} waves")
+
+    print("\nBullet Count Grade Distribution:")
+    for code, label in enumerate(BULLET_GRADE_LABELS):
+        waves = int((result.bullet_grade_code == code).sum())
+        if waves:
+            print(f"  {label.split()[0]}: {waves} waves")
+
+    mismatches = engine.verify_against_scalar(analyzer.chapters)
+    if mismatches:
+        print(f"\n[BATCH MISMATCH] {len(mismatches)} values differ from the scalar path:")
+        for mismatch in mismatches:
+            print(mismatch)
+    else:
+        print("\n[BATCH OK] All waves match the scalar path exactly.")
+
+@dataclass(frozen=True)
+class Distribution:
+    """A sampled player-skill parameter: 'const:x', 'uniform:a,b', 'normal:mean,sd' or 'beta:a,b'"""
+    kind: str
+    params: Tuple[float, ...]
+    low: float = -math.inf
+    high: float = math.inf
+
+    KINDS = {'const': 1, 'uniform': 2, 'normal': 2, 'beta': 2}
+
+    @classmethod
+    def parse(cls, text: str, low: float = -math.inf, high: float = math.inf) -> "Distribution":
+        kind, _, params = text.partition(':')
+        if not params:
+            kind, params = 'const', kind
+        try:
+            values = tuple(float(value) for value in params.split(','))
+        except ValueError:
+            raise ValueError(f"Invalid distribution '{text}'")
+        if cls.KINDS.get(kind) != len(values):
+            raise ValueError(f"Invalid distribution '{text}' (expected e.g. 'normal:8,2')")
+        return cls(kind, values, low, high)
+
+    def sample(self, rng, shape) -> "np.ndarray":
+        if self.kind == 'const':
+            values = np.full(shape, self.params[0])
+        elif self.kind == 'uniform':
+            values = rng.uniform(self.params[0], self.params[1], shape)
+        elif self.kind == 'normal':
+            values = rng.normal(self.params[0], self.params[1], shape)
+        else:
+            values = rng.beta(self.params[0], self.params[1], shape)
+        return np.clip(values, self.low, self.high)
+
+    def __str__(self) -> str:
+        return f"{self.kind}:{','.join(f'{value:g}' for value in self.params)}"
+
+@dataclass
+class SkillModel:
+    """How a (non-perfect) player performs; each is sampled per trial and wave"""
+    catch_speed: Distribution = Distribution('normal', (CATCH_POINTS_PER_SECOND, 2.0), 0.5)
+    hit_rate: Distribution = Distribution('beta', (9.0, 1.0), 0.0, 1.0)
+    catch_success: Distribution = Distribution('const', (0.9,), 0.0, 1.0)
+
+@dataclass
+class MonteCarloResult:
+    """Per-wave percentiles over all trials; arrays are indexed by campaign wave"""
+    trials: int
+    overkill_percentiles: "np.ndarray"   # (3, waves): p10, p50, p90
+    bullet_percentiles: "np.ndarray"     # (3, waves)
+    clear_rate: "np.ndarray"             # Fraction of trials with overkill >= 1.0, per wave
+
+PERCENTILES = (10, 50, 90)
+
+# Per-process state for Monte Carlo workers
+_worker_monte_carlo = None
+
+def _monte_carlo_worker_init(config_dir: str, skill: SkillModel, calibrations: List[Dict]):
+    global _worker_monte_carlo
     analyzer = BalanceAnalyzer(config_dir)
-    analyzer.load_configs()
-    analyzer.print_report()
+    analyzer.load_configs(verbose=False)
+    restore_calibrations(analyzer, calibrations)
+    _worker_monte_carlo = MonteCarloAnalyzer(analyzer, skill, workers=1)
+
+def _monte_carlo_worker_chunk(task):
+    trials, seed = task
+    return _worker_monte_carlo.run_chunk(trials, seed)
+
+class MonteCarloAnalyzer:
+    """
+    Stochastic player-skill model on top of BatchAnalyzer.
+
+    Each trial is a full campaign playthrough: every wave samples a catch
+    speed, hit rate and catch success probability, missed upgrades carry
+    forward into later waves, and the tiled campaigns are analyzed as one
+    vectorized batch. Trials are split into fixed-size chunks with their own
+    spawned seeds, so results depend only on the seed, never on the number
+    of workers. A calibrated wave (--calibration) scales its sampled catch
+    speeds by its fitted speed over the default.
+    """
+
+    CHUNK_SIZE = 2000
+
+    def __init__(self, analyzer: BalanceAnalyzer, skill: SkillModel = SkillModel(), workers: int = None):
+        require_numpy()
+        self.analyzer = analyzer
+        self.skill = skill
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.engine = BatchAnalyzer(analyzer)
+        self.campaign = self.engine.pack_campaign(analyzer.chapters)
+
+    def run_chunk(self, trials: int, seed) -> Tuple["np.ndarray", "np.ndarray"]:
+        """Overkill and bullet ratios for `trials` campaign playthroughs, shape (trials, waves)"""
+        rng = np.random.default_rng(seed)
+        waves = len(self.campaign)
+        batch = self.campaign.tile(trials)
+        total = len(batch)
+
+        batch.catch_speed = self.skill.catch_speed.sample(rng, total)
+        if self.campaign.catch_speed is not None:
+            batch.catch_speed = batch.catch_speed * np.tile(self.campaign.catch_speed / CATCH_POINTS_PER_SECOND, trials)
+        batch.hit_rate = self.skill.hit_rate.sample(rng, total)
+        success = self.skill.catch_success.sample(rng, total)
+        caught = rng.random(batch.upgrade_mask.shape) < success[:, None]
+        batch.upgrade_mask = batch.upgrade_mask & caught
+
+        self.engine.chain_starting_tiers(batch, run_length=waves)
+        result = self.engine.analyze(batch)
+        return (result.overkill_ratio.reshape(trials, waves).astype(np.float32),
+                result.bullet_ratio.reshape(trials, waves).astype(np.float32))
+
+    def run(self, trials: int, seed: int = 0) -> MonteCarloResult:
+        chunks = [min(self.CHUNK_SIZE, trials - start) for start in range(0, trials, self.CHUNK_SIZE)]
+        seeds = np.random.SeedSequence(seed).spawn(len(chunks))
+        tasks = list(zip(chunks, seeds))
+
+        if self.workers > 1 and len(tasks) > 1:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_monte_carlo_worker_init,
+                                     initargs=(str(self.analyzer.config_dir), self.skill,
+                                               wave_calibrations(self.analyzer.chapters))) as executor:
+                outputs = list(executor.map(_monte_carlo_worker_chunk, tasks))
+        else:
+            outputs = [self.run_chunk(count, chunk_seed) for count, chunk_seed in tasks]
+
+        overkill = np.concatenate([output[0] for output in outputs])
+        bullets = np.concatenate([output[1] for output in outputs])
+        return MonteCarloResult(
+            trials=trials,
+            overkill_percentiles=np.percentile(overkill, PERCENTILES, axis=0),
+            bullet_percentiles=np.percentile(bullets, PERCENTILES, axis=0),
+            clear_rate=(overkill >= 1.0).mean(axis=0),
+        )
+
+def run_monte_carlo(analyzer: BalanceAnalyzer, args):
+    """Report percentile grades for a non-perfect player"""
+    import time
+
+    skill = SkillModel(
+        catch_speed=Distribution.parse(args.catch_speed, low=0.5),
+        hit_rate=Distribution.parse(args.hit_rate, 0.0, 1.0),
+        catch_success=Distribution.parse(args.catch_success, 0.0, 1.0),
+    )
+    monte_carlo = MonteCarloAnalyzer(analyzer, skill, workers=args.workers)
+
+    start = time.perf_counter()
+    result = monte_carlo.run(args.trials, args.seed)
+    elapsed = time.perf_counter() - start
+
+    print("=" * 80)
+    print("ZOMBOID ASSAULT - MONTE CARLO PLAYER-SKILL ANALYSIS")
+    print("=" * 80)
+    print(f"Trials: {result.trials:,}  catch speed: {skill.catch_speed}  hit rate: {skill.hit_rate}  "
+          f"catch success: {skill.catch_success}")
+
+    index = 0
+    for chapter in analyzer.chapters:
+        print(f"\n[CHAPTER] {chapter['chapterName']} ({chapter['chapterId']})")
+        for wave in chapter['waves']:
+            p10, p50, p90 = result.overkill_percentiles[:, index]
+            b10, b50, b90 = result.bullet_percentiles[:, index]
+            print(f"  [WAVE {wave['waveId']}] {wave['waveName']}: "
+                  f"overkill p10/p50/p90 {p10:.2f}/{p50:.2f}/{p90:.2f}x, "
+                  f"bullets {b10:.2f}/{b50:.2f}/{b90:.2f}x, "
+                  f"median grade {analyzer.grade_wave(p50).split()[0]}, "
+                  f"clear rate {result.clear_rate[index] * 100:.0f}%")
+            index += 1
+
+    print(f"\nRan {result.trials * len(monte_carlo.campaign):,} wave trials in {elapsed:.2f}s")
+
+@dataclass(frozen=True)
+class GradeBand:
+    """Inclusive range of grade indices, e.g. A..C (0 = A+, 6 = F)"""
+    best: int
+    worst: int
+
+    @classmethod
+    def parse(cls, text: str) -> "GradeBand":
+        """Parse 'A-C', 'B' or 'A+-B' into a band"""
+        letters = [label.split()[0] for label in WAVE_GRADE_LABELS]
+        if text in letters:
+            best = worst = text
+        else:
+            best, _, worst = text.rpartition('-')
+        if best not in letters or worst not in letters:
+            raise ValueError(f"Invalid grade band '{text}' (expected e.g. 'A-C')")
+        return cls(*sorted((letters.index(best), letters.index(worst))))
+
+    def bounds(self, thresholds: Tuple[float, ...]) -> Tuple[float, float]:
+        """Ratio range [low, high) that lands inside the band"""
+        low = thresholds[self.worst] if self.worst < len(thresholds) else 0.0
+        high = thresholds[self.best - 1] if self.best > 0 else math.inf
+        return low, high
+
+    def distance(self, ratio: float, thresholds: Tuple[float, ...]) -> float:
+        """How far (in log ratio) a value is outside the band; 0 inside"""
+        low, high = self.bounds(thresholds)
+        if ratio < low:
+            return math.log(low / ratio) if ratio > 0 else math.inf
+        if ratio >= high:
+            return math.log(ratio / high) + 1e-6
+        return 0.0
+
+# Per-process analyzer for autobalance workers
+_worker_analyzer = None
+
+def _autobalance_worker_init(config_dir: str):
+    global _worker_analyzer
+    _worker_analyzer = BalanceAnalyzer(config_dir)
+    _worker_analyzer.load_configs(verbose=False)
+
+def _autobalance_evaluate(task: Tuple[Dict, int]) -> Tuple[float, float]:
+    wave, starting_tier = task
+    analysis = _worker_analyzer.analyze_wave(wave, starting_tier)
+    return analysis.overkill_ratio, analysis.bullet_ratio
+
+class AutoBalancer:
+    """
+    Searches wave parameters until every wave grades inside a target band.
+
+    Each wave is tuned with a seeded hill climb: a generation of mutated
+    candidates is scored with analyze_wave on a process pool, and the closest
+    one to the target band becomes the next parent. Candidates that change
+    which weapon upgrades land, or that cannot beat the current best even
+    with a perfect damage bound, are rejected before analysis.
+    """
+
+    CHANGE_WEIGHT = 0.01  # Tie-breaker: prefer proposals close to the designer's wave
+
+    def __init__(self, analyzer: BalanceAnalyzer, grade_band: GradeBand, bullet_band: GradeBand,
+                 workers: int = None, generations: int = 60, population: int = 32, seed: int = 0):
+        self.analyzer = analyzer
+        self.grade_band = grade_band
+        self.bullet_band = bullet_band
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.generations = generations
+        self.population = population
+        self.seed = seed
+        self.evaluated = 0
+        self.rejected = 0
+
+    def band_distance(self, overkill_ratio: float, bullet_ratio: float) -> float:
+        return (self.grade_band.distance(overkill_ratio, WAVE_GRADE_THRESHOLDS)
+                + self.bullet_band.distance(bullet_ratio, BULLET_GRADE_THRESHOLDS))
+
+    def change_cost(self, original: Dict, candidate: Dict) -> float:
+        """How far a candidate has drifted from the original wave"""
+        duration = original['duration']
+        cost = 0.0
+        for before, after in zip(original['spawnPattern']['zomboids'], candidate['spawnPattern']['zomboids']):
+            cost += abs(math.log(after['count'] / before['count'])) if before['count'] else 0
+            cost += abs(math.log(after['spawnRate'] / before['spawnRate'])) if before['spawnRate'] else 0
+            cost += abs(after.get('spawnDelay', 0) - before.get('spawnDelay', 0)) / duration
+        for before, after in zip(original['spawnPattern'].get('timers', []), candidate['spawnPattern'].get('timers', [])):
+            cost += abs(after['spawnTime'] - before['spawnTime']) / duration
+            cost += abs(after.get('startValue', -50) - before.get('startValue', -50)) / 50.0
+        return cost
+
+    def optimistic_distance(self, wave: Dict, starting_tier: int) -> float:
+        """
+        Lower bound on band_distance without running the full analysis:
+        firing the best reachable weapon for the whole wave, with no catch time.
+        """
+        tiers = [starting_tier] + [tier for _, tier, _ in self.analyzer.find_weapon_upgrades(wave)]
+        weapons = [self.analyzer.weapons[tier] for tier in tiers if tier in self.analyzer.weapons]
+        if not weapons:
+            return 0.0
+        total_hp, _ = self.analyzer.calculate_zomboid_hp(wave)
+        if total_hp <= 0:
+            return 0.0
+        duration = wave['duration']
+        max_damage = duration * max(weapon.dps() for weapon in weapons)
+        max_bullets = duration * max(weapon.projectile_count / weapon.fire_rate for weapon in weapons if weapon.fire_rate)
+        bullets_needed = min(self.analyzer.calculate_bullets_needed(wave, tier)[0] for tier in tiers)
+
+        distance = 0.0
+        low, _ = self.grade_band.bounds(WAVE_GRADE_THRESHOLDS)
+        if max_damage / total_hp < low:
+            distance += self.grade_band.distance(max_damage / total_hp, WAVE_GRADE_THRESHOLDS)
+        low, _ = self.bullet_band.bounds(BULLET_GRADE_THRESHOLDS)
+        if bullets_needed and max_bullets / bullets_needed < low:
+            distance += self.bullet_band.distance(max_bullets / bullets_needed, BULLET_GRADE_THRESHOLDS)
+        return distance
+
+    def mutate(self, wave: Dict, rng, harder: bool) -> Dict:
+        """Perturb one to three knobs; 'harder' biases counts and rates in the needed direction"""
+        candidate = json.loads(json.dumps(wave))
+        patterns = candidate['spawnPattern']['zomboids']
+        upgrade_timers = [t for t in candidate['spawnPattern'].get('timers', []) if t['type'] == 'weapon_upgrade_timer']
+        duration = candidate['duration']
+        direction = 1 if harder else -1
+
+        for _ in range(rng.randint(1, 3)):
+            knob = rng.choice(('count', 'count', 'spawnRate', 'spawnDelay', 'timer'))
+            if knob == 'timer' and upgrade_timers:
+                timer = rng.choice(upgrade_timers)
+                if rng.random() < 0.5:
+                    timer['spawnTime'] = min(max(timer['spawnTime'] + rng.randint(-4, 4), 0), duration - 1)
+                else:
+                    timer['startValue'] = min(max(timer.get('startValue', -50) + 5 * rng.randint(-2, 2), -99), -5)
+            elif patterns:
+                pattern = rng.choice(patterns)
+                step = math.exp(direction * abs(rng.gauss(0, 0.3)) if rng.random() < 0.8 else rng.gauss(0, 0.2))
+                if knob == 'count':
+                    pattern['count'] = max(1, round(pattern['count'] * step))
+                elif knob == 'spawnRate':
+                    pattern['spawnRate'] = max(0.1, round(pattern['spawnRate'] * step, 1))
+                else:
+                    delay = pattern.get('spawnDelay', 0) + rng.randint(-3, 3)
+                    pattern['spawnDelay'] = min(max(delay, 0), duration - 1)
+        return candidate
+
+    def balance_wave(self, wave: Dict, starting_tier: int, evaluate) -> Tuple[Dict, WaveAnalysis]:
+        """Tune one wave; returns (proposed wave, its analysis)"""
+        import random
+
+        rng = random.Random(f"{self.seed}:{wave['waveId']}:{wave['waveName']}")
+        target_end_tier = self.analyzer.build_timeline(wave, starting_tier).ending_tier
+
+        best = wave
+        analysis = self.analyzer.analyze_wave(wave, starting_tier)
+        best_distance = self.band_distance(analysis.overkill_ratio, analysis.bullet_ratio)
+        best_score = best_distance
+
+        for _ in range(self.generations):
+            if best_distance == 0:
+                break
+            analysis = self.analyzer.analyze_wave(best, starting_tier)
+            low, _ = self.grade_band.bounds(WAVE_GRADE_THRESHOLDS)
+            harder = analysis.overkill_ratio >= low
+
+            candidates = []
+            for _ in range(self.population):
+                candidate = self.mutate(best, rng, harder)
+                # Early rejection: upgrades must still land the same way, and the
+                # candidate must be able to beat the current best at all
+                if (self.analyzer.build_timeline(candidate, starting_tier).ending_tier != target_end_tier
+                        or self.optimistic_distance(candidate, starting_tier) >= best_distance):
+                    self.rejected += 1
+                    continue
+                candidates.append(candidate)
+            if not candidates:
+                continue
+
+            self.evaluated += len(candidates)
+            ratios = evaluate([(candidate, starting_tier) for candidate in candidates])
+            for candidate, (overkill_ratio, bullet_ratio) in zip(candidates, ratios):
+                distance = self.band_distance(overkill_ratio, bullet_ratio)
+                score = distance + self.CHANGE_WEIGHT * self.change_cost(wave, candidate)
+                if distance < best_distance or (distance == best_distance and score < best_score):
+                    best, best_distance, best_score = candidate, distance, score
+
+        return best, self.analyzer.analyze_wave(best, starting_tier)
+
+    def balance_campaign(self) -> List[Tuple[Dict, List[Tuple[WaveAnalysis, WaveAnalysis]]]]:
+        """
+        Tune every chapter in order.
+        Returns [(proposed chapter, [(before, after) per wave])].
+        """
+        from concurrent.futures import ProcessPoolExecutor
+
+        executor = None
+        if self.workers > 1:
+            executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_autobalance_worker_init,
+                                           initargs=(str(self.analyzer.config_dir),))
+
+        def evaluate(tasks):
+            if executor is None:
+                return [(a.overkill_ratio, a.bullet_ratio)
+                        for a in (self.analyzer.analyze_wave(wave, tier) for wave, tier in tasks)]
+            chunksize = max(1, len(tasks) // (self.workers * 2))
+            return list(executor.map(_autobalance_evaluate, tasks, chunksize=chunksize))
+
+        proposals = []
+        try:
+            state = ChapterState()
+            for chapter in self.analyzer.chapters:
+                proposed = dict(chapter)
+                proposed['waves'] = []
+                comparisons = []
+                tier = state.weapon_tier
+                for wave in chapter['waves']:
+                    before = self.analyzer.analyze_wave(wave, tier)
+                    new_wave, after = self.balance_wave(wave, tier, evaluate)
+                    proposed['waves'].append(new_wave)
+                    comparisons.append((before, after))
+                    tier = after.weapon_tier_end
+                proposals.append((proposed, comparisons))
+                state = ChapterState(tier, state.hero_count)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        return proposals
+
+def run_autobalance(analyzer: BalanceAnalyzer, args):
+    """Search for balanced wave parameters and write proposed chapter files"""
+    import time
+
+    balancer = AutoBalancer(
+        analyzer,
+        GradeBand.parse(args.target_grade),
+        GradeBand.parse(args.target_bullet_grade),
+        workers=args.workers,
+        seed=args.seed,
+    )
+
+    print("=" * 80)
+    print("ZOMBOID ASSAULT - AUTO-BALANCE")
+    print("=" * 80)
+    print(f"Target DPS grade: {args.target_grade}, target bullet grade: {args.target_bullet_grade}, "
+          f"workers: {balancer.workers}\n")
+
+    start = time.perf_counter()
+    proposals = balancer.balance_campaign()
+    elapsed = time.perf_counter() - start
+
+    output_dir = Path(args.output)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    unresolved = 0
+
+    for chapter, comparisons in proposals:
+        print(f"[CHAPTER] {chapter['chapterName']} ({chapter['chapterId']})")
+        for before, after in comparisons:
+            in_band = balancer.band_distance(after.overkill_ratio, after.bullet_ratio) == 0
+            if not in_band:
+                unresolved += 1
+            status = "OK" if in_band else "OUT OF BAND"
+            print(f"  [WAVE {after.wave_id}] {after.wave_name}: "
+                  f"{before.grade.split()[0]} ({before.overkill_ratio:.2f}x) -> {after.grade.split()[0]} ({after.overkill_ratio:.2f}x), "
+                  f"bullets {before.bullet_grade.split()[0]} ({before.bullet_ratio:.2f}x) -> {after.bullet_grade.split()[0]} ({after.bullet_ratio:.2f}x) "
+                  f"[{status}]")
+
+        chapter_path = output_dir / f"{chapter['chapterId']}.json"
+        with open(chapter_path, 'w') as f:
+            json.dump(without_calibration(chapter), f, indent=2)
+            f.write("\n")
+
+    print(f"\nEvaluated {balancer.evaluated:,} candidates ({balancer.rejected:,} rejected early) in {elapsed:.1f}s")
+    if unresolved:
+        print(f"[WARNING]: {unresolved} waves could not be brought into the target band")
+    print(f"Proposed chapters written to {output_dir}")
+
+@dataclass
+class SimulationResult:
+    wave_id: int
+    wave_name: str
+    breach_time: float        # Earliest time a zomboid reached the safe zone (None if the line held)
+    breaches: int
+    peak_backlog_hp: float    # Most HP alive on screen at once
+    peak_backlog_time: float
+    clear_time: float         # When the last zomboid died or breached
+
+# Event kinds, ordered so simultaneous events resolve phase -> kill -> spawn -> breach
+_EVENT_PHASE = 0
+_EVENT_KILL = 1
+_EVENT_SPAWN = 2
+_EVENT_BREACH = 3
+
+class EventSimulator:
+    """
+    Discrete-event spawn/kill simulation of a wave.
+
+    Zomboids spawn on the WaveManager schedule (spawnDelay + i / spawnRate),
+    walk down the field at their configured speed and breach once they pass
+    screenHeight - safeZoneHeight, as in GameScene.checkGameOver. The player
+    pours the current weapon's DPS into one target at a time, chosen by the
+    targeting policy, and deals nothing while catching a timer.
+    """
+
+    TARGETING_POLICIES = ('nearest', 'oldest', 'weakest')
+
+    def __init__(self, analyzer: BalanceAnalyzer, targeting: str = 'nearest'):
+        if targeting not in self.TARGETING_POLICIES:
+            raise ValueError(f"Unknown targeting policy '{targeting}'")
+        self.analyzer = analyzer
+        self.targeting = targeting
+        field = analyzer.field
+        self.travel_distance = (field.screen_height - field.safe_zone_height) + field.spawn_zone_height
+
+    def _target_key(self, zomboid_id: int, spawn_time: float, breach_time: float, hp: float) -> tuple:
+        if self.targeting == 'nearest':
+            return (breach_time, zomboid_id)
+        if self.targeting == 'oldest':
+            return (spawn_time, zomboid_id)
+        return (hp, zomboid_id)
+
+    def simulate_wave(self, wave: Dict, starting_tier: int, timeline: WavePhaseTimeline = None) -> SimulationResult:
+        import heapq
+
+        if timeline is None:
+            timeline = self.analyzer.build_timeline(wave, starting_tier)
+
+        events = []
+        seq = 0
+
+        for phase in timeline.phases:
+            weapon = None if phase.is_catch else self.analyzer.weapons.get(phase.tier)
+            events.append((phase.start, _EVENT_PHASE, seq, weapon.dps() if weapon else 0.0))
+            seq += 1
+        # The player keeps firing the final weapon until the wave is cleared
+        final_weapon = self.analyzer.weapons.get(timeline.ending_tier)
+        events.append((timeline.duration, _EVENT_PHASE, seq, final_weapon.dps() if final_weapon else 0.0))
+        seq += 1
+
+        health = []
+        breach_at = []
+        spawned_at = []
+        for pattern in wave['spawnPattern']['zomboids']:
+            zomboid = self.analyzer.zomboids.get(pattern['type'])
+            if zomboid is None or pattern['spawnRate'] <= 0:
+                continue
+            interval = 1.0 / pattern['spawnRate']
+            walk_time = self.travel_distance / zomboid.speed if zomboid.speed > 0 else math.inf
+            for i in range(pattern['count']):
+                spawn_time = pattern.get('spawnDelay', 0) + i * interval
+                zomboid_id = len(health)
+                health.append(float(zomboid.health))
+                spawned_at.append(spawn_time)
+                breach_at.append(spawn_time + walk_time)
+                events.append((spawn_time, _EVENT_SPAWN, seq, zomboid_id))
+                seq += 1
+        heapq.heapify(events)
+
+        remaining = len(health)
+        alive = set()
+        candidates = []  # Heap of target keys; entries for dead zomboids are skipped lazily
+        now = 0.0
+        dps = 0.0
+        target = None
+        kill_token = 0
+        backlog = 0.0
+        peak_backlog, peak_time = 0.0, 0.0
+        breach_time, breaches = None, 0
+        clear_time = 0.0
+
+        while events and remaining:
+            time, kind, _, payload = heapq.heappop(events)
+
+            # Pour damage into the current target up to this event
+            if target is not None and dps > 0 and time > now:
+                dealt = min(dps * (time - now), health[target])
+                health[target] -= dealt
+                backlog -= dealt
+            now = time
+
+            if kind == _EVENT_PHASE:
+                dps = payload
+            elif kind == _EVENT_SPAWN:
+                alive.add(payload)
+                backlog += health[payload]
+                heapq.heappush(candidates, self._target_key(payload, spawned_at[payload], breach_at[payload], health[payload]))
+                heapq.heappush(events, (breach_at[payload], _EVENT_BREACH, seq, payload))
+                seq += 1
+                if backlog > peak_backlog:
+                    peak_backlog, peak_time = backlog, now
+            elif kind == _EVENT_KILL:
+                if payload != kill_token or target not in alive:
+                    continue  # Stale: target or DPS changed since it was scheduled
+                backlog -= health[target]
+                health[target] = 0.0
+                alive.discard(target)
+                remaining -= 1
+                clear_time = now
+                target = None
+            elif kind == _EVENT_BREACH:
+                if payload not in alive:
+                    continue
+                alive.discard(payload)
+                backlog -= health[payload]
+                remaining -= 1
+                breaches += 1
+                clear_time = now
+                if breach_time is None:
+                    breach_time = now
+                if payload == target:
+                    target = None
+
+            # Retarget according to policy
+            previous_target = target
+            if target is not None and self.targeting == 'weakest':
+                heapq.heappush(candidates, self._target_key(target, spawned_at[target], breach_at[target], health[target]))
+            target = None
+            while candidates:
+                key = candidates[0]
+                zomboid_id = key[-1]
+                if zomboid_id in alive and (self.targeting != 'weakest' or key[0] == health[zomboid_id]):
+                    target = zomboid_id
+                    break
+                heapq.heappop(candidates)
+
+            if target is not None and dps > 0 and (target != previous_target or kind == _EVENT_PHASE or kind == _EVENT_KILL):
+                kill_token += 1
+                heapq.heappush(events, (now + health[target] / dps, _EVENT_KILL, seq, kill_token))
+                seq += 1
+            elif target is None or dps <= 0:
+                kill_token += 1
+
+        return SimulationResult(
+            wave_id=wave['waveId'],
+            wave_name=wave['waveName'],
+            breach_time=breach_time,
+            breaches=breaches,
+            peak_backlog_hp=peak_backlog,
+            peak_backlog_time=peak_time,
+            clear_time=clear_time,
+        )
+
+    def simulate_chapter(self, chapter: Dict, starting_tier: int = 1) -> List[SimulationResult]:
+        results = []
+        tier = starting_tier
+        for wave in chapter['waves']:
+            timeline = self.analyzer.build_timeline(wave, tier)
+            results.append(self.simulate_wave(wave, tier, timeline))
+            tier = timeline.ending_tier
+        return results
+
+    def simulate_campaign(self) -> List[Tuple[Dict, List[SimulationResult]]]:
+        campaign = []
+        state = ChapterState()
+        for chapter in self.analyzer.chapters:
+            campaign.append((chapter, self.simulate_chapter(chapter, state.weapon_tier)))
+            state = self.analyzer.chapter_end_state(chapter, state)
+        return campaign
+
+def run_simulation(analyzer: BalanceAnalyzer, targeting: str):
+    """Simulate every wave and report time-to-breach and peak HP backlog"""
+    import time
+
+    simulator = EventSimulator(analyzer, targeting)
+    start = time.perf_counter()
+    campaign = simulator.simulate_campaign()
+    elapsed = time.perf_counter() - start
+
+    print("=" * 80)
+    print(f"ZOMBOID ASSAULT - SPAWN/KILL SIMULATION (targeting: {targeting})")
+    print("=" * 80)
+
+    breached = []
+    for chapter, results in campaign:
+        print(f"\n[CHAPTER] {chapter['chapterName']} ({chapter['chapterId']})")
+        for result in results:
+            if result.breach_time is None:
+                outcome = f"held, cleared at {result.clear_time:.1f}s"
+            else:
+                outcome = f"BREACH at {result.breach_time:.1f}s ({result.breaches} zomboids reached the safe zone)"
+                breached.append(result)
+            print(f"  [WAVE {result.wave_id}] {result.wave_name}: {outcome}; "
+                  f"peak backlog {result.peak_backlog_hp:.0f}HP at {result.peak_backlog_time:.1f}s")
+
+    waves = sum(len(results) for _, results in campaign)
+    print(f"\nSimulated {waves} waves in {elapsed * 1000:.1f} ms")
+    if breached:
+        print(f"[WARNING]: {len(breached)} waves breach the safe zone")
+    else:
+        print("[SUCCESS] No zomboid reaches the safe zone in any wave.")
+
+@dataclass
+class GameWaveOutcome:
+    """One simulated play of one wave"""
+    wave_id: int
+    wave_name: str
+    seed: int
+    starting_tier: int
+    starting_heroes: int
+    cleared: bool
+    end_time: float           # Clear time, or breach time when not cleared
+    ending_tier: int
+    ending_heroes: int
+    shots: int                # Projectiles fired
+    hits: int                 # Projectile-zomboid hits
+    kills: int
+    timers_caught: int
+    peak_zomboids: int        # Most zomboids on screen at once
+
+@dataclass
+class SquadState:
+    """What a GameSimulator play carries from one wave to the next"""
+    tier: int
+    heroes: int
+    x: float                  # Squad centre after frame `moved`
+    target_x: float           # Snap position the policy last chose
+    velocity: float = 0.0
+    moved: int = 0            # Frames the squad has been stepped through; it moves lazily
+    frame: int = 0            # Frames played
+    last_fire: float = -math.inf
+
+class GameSimulator:
+    """
+    Headless fixed-timestep replica of GameScene.update, for checking the
+    closed-form grades against played-out waves.
+
+    Every frame (1 / fps from game-settings.json) runs the game's order:
+    heroes move toward the policy's target snap column (HeroManager
+    acceleration, deceleration and the 12 snap positions), the squad fires
+    when the weapon's fireRate has elapsed (each hero fires projectileCount
+    projectiles 15 px apart, straight up, as WeaponSystem.fireFromPosition
+    does; `spread` is not used by the game), projectiles move, WaveManager
+    spawns scheduled zomboids at random snap positions of their columns and
+    timers at their column centres, everything moves, a zomboid past
+    screenHeight - safeZoneHeight ends the play, and CollisionManager
+    resolves projectile hits in (projectile, zomboid) order with
+    penetration, then timer hits. Killed zomboids linger for the 200 ms
+    destruction tween before a wave can complete. Timer rewards follow
+    GameScene, including upgradeToTier(weaponTier) selecting tier
+    weaponTier + 1.
+
+    A play only visits the frames where something happens. Projectiles,
+    zomboids and timers move straight up or down at a constant speed, so
+    every entity follows a track: its position on each frame of its life,
+    summed frame by frame as the game's `y += speed * dt` sums it and
+    shared by everything with the same start and speed. Hits are scheduled
+    rather than searched for: when a projectile is fired, or a zomboid or
+    timer spawns, the first frame on which each new pair's tracks overlap
+    (the strict AABB test of CollisionManager.checkAABB) goes on an event
+    heap, and a penetrating projectile that survives a hit schedules the
+    pair's next frame. Nothing changes column, so the broad phase for new
+    pairs is a uniform grid of x cells. Policy decisions, volleys, spawns,
+    breaches and destruction tweens are the other events, and HeroManager
+    movement is stepped frame by frame only up to the frames that need the
+    squad's position.
+
+    Entities are struct-of-arrays per wave: one list per attribute, indexed
+    in creation order, which is the order the game's active lists keep, so
+    (frame, projectile, zomboid) heap keys resolve hits in the game's
+    order. Between waves a play keeps its weapon tier, heroes, squad
+    position and fire timer; leftover projectiles and timers are dropped.
+    On one core a single play of a full chapter from the analyzer's
+    expected starting state runs at roughly 1100-3000x real time, and the
+    --game-sim campaign at about 1800x; the densest stress start (tier 4
+    with 5 heroes against later chapters) is nearer 650x.
+
+    Policies: 'timers' stands under the lowest catchable timer (weapon
+    upgrades first), else under the zomboid closest to the safe zone;
+    'zomboids' ignores timers.
+    """
+
+    POLICIES = ('timers', 'zomboids')
+    CELL_SIZE = 64.0
+    DESTROY_TWEEN = 0.2      # Zomboid.playDestructionEffect duration, seconds
+    PROJECTILE_SPACING = 15  # WeaponSystem.fireFromPosition
+    SNAP_COUNT = 12
+    MAX_OVERTIME = 120.0     # Seconds past a wave's duration before giving up on it
+    REACTION_TIME = 0.1      # Seconds between the policy's decisions
+
+    def __init__(self, analyzer: BalanceAnalyzer, policy: str = 'timers'):
+        require_numpy()
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown policy '{policy}'")
+        self.analyzer = analyzer
+        self.policy = policy
+
+        settings = analyzer._read_optional_config("game-settings.json") or {}
+        screen = settings.get('gameSettings', {})
+        gameplay = settings.get('gameplay', {})
+        self.width = screen.get('screenWidth', 720)
+        self.height = screen.get('screenHeight', 1280)
+        self.dt = 1.0 / screen.get('fps', 60)
+        self.reaction = max(1, round(self.REACTION_TIME / self.dt))  # Frames between decisions
+        self.safe_line = self.height - gameplay.get('safeZoneHeight', 150)
+        self.spawn_y = float(-gameplay.get('spawnZoneHeight', 100))
+        padding = gameplay.get('movementBoundaryPadding', 60)
+        self.min_x, self.max_x = float(padding), float(self.width - padding)
+        self.snaps = (padding + np.arange(self.SNAP_COUNT) * (self.width - 2 * padding) / (self.SNAP_COUNT - 1)).tolist()
+        start_x = gameplay.get('playerStartX') or self.width / 2
+        self.start_x = min(self.snaps, key=lambda snap: abs(snap - start_x))
+        self.timer_columns = [self.width / 4, 3 * self.width / 4]
+        self.columns = int(self.width // self.CELL_SIZE) + 1
+
+        heroes = (analyzer._read_optional_config("entities/heroes.json") or {}).get('heroConfig', {})
+        self.hero_min = heroes.get('minHeroCount', 1)
+        self.hero_max = heroes.get('maxHeroCount', 5)
+        self.hero_spacing = heroes.get('spacing', 15)
+        self.hero_line = self.height - heroes.get('positionFromBottom', 100)
+        self.hero_speed = heroes.get('movementSpeed') or 800
+        self.hero_acceleration = heroes.get('acceleration') or 2400
+        self.hero_deceleration = heroes.get('deceleration') or 3200
+
+        weapons = json.loads(analyzer.read_config("entities/weapons.json"))['weaponTypes']
+        size = max(weapon['tier'] for weapon in weapons) + 1
+        self.tiers = sorted(weapon['tier'] for weapon in weapons)
+        self.fire_rate = [math.inf] * size
+        self.damage = [0.0] * size
+        self.projectile_count = [0] * size
+        self.projectile_step = [0.0] * size   # Pixels per frame
+        self.projectile_half = [0.0] * size
+        self.penetration = [0.0] * size
+        for weapon in weapons:
+            tier = weapon['tier']
+            self.fire_rate[tier] = float(weapon['fireRate'])
+            self.damage[tier] = float(weapon['damage'])
+            self.projectile_count[tier] = weapon['projectileCount']
+            self.projectile_step[tier] = float(weapon.get('projectileSpeed', 400)) * self.dt
+            self.projectile_half[tier] = weapon.get('projectileSize', 8) / 2
+            self.penetration[tier] = float(weapon.get('penetrationDamage', 0))
+
+        zomboids = json.loads(analyzer.read_config("entities/zomboids.json"))['zomboidTypes']
+        self.zomboid_index = {zomboid['id']: index for index, zomboid in enumerate(zomboids)}
+        # Collision box: circles and hexagons by radius, squares by width/height (Zomboid.renderShape defaults)
+        self.zomboid_half_width = [float(zomboid_half_width(zomboid)) for zomboid in zomboids]
+        self.zomboid_half_height = [zomboid.get('height', 30) / 2 if zomboid.get('shape') == 'square' else half
+                                    for zomboid, half in zip(zomboids, self.zomboid_half_width)]
+        self.zomboid_health = [float(zomboid['health']) for zomboid in zomboids]
+        self.zomboid_step = [float(zomboid['speed']) * self.dt for zomboid in zomboids]
+
+        timers = (analyzer._read_optional_config("entities/timers.json") or {}).get('timerTypes', [])
+        self.timer_index = {timer['id']: index for index, timer in enumerate(timers)}
+        self.timer_types = timers
+        # The 'timers' policy goes for weapon upgrades before anything else
+        self.timer_priority = [1e6 * (timer['id'] == 'weapon_upgrade_timer') for timer in timers]
+
+        self._clock = [0.0]   # Seconds after each frame, summed frame by frame like the game's clocks
+        self._tracks: Dict[Tuple[float, float, float], Tuple[List[float], bool]] = {}
+        self._nearest_snap: Dict[float, float] = {}
+        self._volleys: Dict[Tuple[int, int, int], Tuple[List[int], float, List[List[float]]]] = {}
+
+    # -- Schedules
+
+    def _wave_schedule(self, wave: Dict, rng) -> Dict[str, "np.ndarray"]:
+        """WaveManager's zomboid and timer spawn schedules, with random snap x drawn up front"""
+        times, types, xs = [], [], []
+        for pattern in wave['spawnPattern']['zomboids']:
+            index = self.zomboid_index.get(pattern['type'])
+            columns = pattern.get('columns') or []
+            positions = np.concatenate([self.snaps[:6]] * ('left' in columns) + [self.snaps[6:]] * ('right' in columns)
+                                       or [self.snaps])
+            for i in range(pattern['count']):
+                if index is None:
+                    continue  # Unknown types are logged and skipped by the game
+                times.append(pattern.get('spawnDelay', 0) + i * (1 / pattern['spawnRate']))
+                types.append(index)
+                xs.append(positions[rng.integers(0, len(positions))])
+        order = np.argsort(np.array(times), kind='stable')
+
+        timer_rows = [timer for timer in wave['spawnPattern'].get('timers', []) if timer['type'] in self.timer_index]
+        timer_rows.sort(key=lambda timer: timer['spawnTime'])
+        return {
+            'zomboid_time': np.array(times)[order] if times else np.zeros(0),
+            'zomboid_type': np.array(types, dtype=np.int64)[order] if types else np.zeros(0, dtype=np.int64),
+            'zomboid_x': np.array(xs)[order] if xs else np.zeros(0),
+            'timers': timer_rows,
+        }
+
+    # -- Tracks and clocks
+
+    def _extend_clock(self, frames: int):
+        """Make self._clock cover frames 0..frames"""
+        clock = self._clock
+        if len(clock) <= frames:
+            clock.extend(np.add.accumulate(np.r_[clock[-1], np.full(frames + 1 - len(clock), self.dt)])[1:].tolist())
+
+    def _after(self, frame: int, since: float, wait: float) -> float:
+        """First clock frame after `frame` on which clock - since >= wait; inf past the clock built so far"""
+        clock = self._clock
+        k = max(frame + 1, bisect.bisect_left(clock, since + wait))
+        while k > frame + 1 and clock[k - 1] - since >= wait:
+            k -= 1
+        while k < len(clock) and clock[k] - since < wait:
+            k += 1
+        return k if k < len(clock) else math.inf
+
+    def _track(self, start: float, step: float, stop: float, frames: int) -> List[float]:
+        """
+        Position after each frame of moving `step` per frame from start, up
+        to the last one short of crossing stop; at least `frames` long when
+        it never crosses.
+        """
+        cached = self._tracks.get((start, step, stop))
+        if cached is not None and (cached[1] or len(cached[0]) >= frames):
+            return cached[0]
+        gap = (stop - start) / step if step else -1.0
+        length = int(gap) + 2 if gap >= 0 else frames
+        while True:
+            positions = np.add.accumulate(np.r_[start, np.full(length, step)])[1:]
+            crossed = np.flatnonzero(positions > stop if start <= stop else positions < stop)
+            if len(crossed) or length >= frames:
+                break
+            length *= 2
+        track = positions[:crossed[0]].tolist() if len(crossed) else positions.tolist()
+        self._tracks[(start, step, stop)] = (track, bool(len(crossed)))
+        return track
+
+    def _volley(self, tier: int, heroes: int, frames: int) -> Tuple[List[int], float, List[List[float]]]:
+        """
+        WeaponSystem.fireFromPosition for the whole squad: each projectile's
+        x is squad x + slot offset - centring, and each hero's projectiles
+        share one track.
+        """
+        volley = self._volleys.get((tier, heroes, frames))
+        if volley is None:
+            per_hero = self.projectile_count[tier]
+            tracks = [self._track(float(self.hero_line - (heroes - 1) * self.hero_spacing / 2 + hero * self.hero_spacing),
+                                  -self.projectile_step[tier], -2 * self.projectile_half[tier], frames)
+                      for hero in range(heroes)]
+            volley = self._volleys[(tier, heroes, frames)] = (
+                [slot * self.PROJECTILE_SPACING for slot in range(per_hero)],
+                (per_hero - 1) * self.PROJECTILE_SPACING / 2, tracks)
+        return volley
+
+    # -- Simulation
+
+    def _move_squad(self, squad: SquadState, frame: int):
+        """HeroManager.update for every frame up to and including `frame`, toward squad.target_x"""
+        dt = self.dt
+        x, velocity, target = squad.x, squad.velocity, squad.target_x
+        for _ in range(frame - squad.moved):
+            distance = target - x
+            if abs(distance) < 2:
+                x, velocity = target, 0.0
+                break  # Settled: later frames change nothing
+            direction = 1.0 if distance > 0 else -1.0
+            speed = abs(velocity)
+            if abs(distance) <= speed * speed / (2 * self.hero_deceleration):
+                velocity = velocity - direction * self.hero_deceleration * dt if speed > self.hero_deceleration * dt else 0.0
+            else:
+                velocity = min(max(velocity + self.hero_acceleration * dt * direction, -self.hero_speed), self.hero_speed)
+            x = min(max(x + velocity * dt, self.min_x), self.max_x)
+            if x == self.min_x or x == self.max_x:
+                velocity = 0.0
+        squad.x, squad.velocity, squad.moved = x, velocity, max(frame, squad.moved)
+
+    def _play_wave(self, wave: Dict, squad: SquadState, rng, seed: int) -> GameWaveOutcome:
+        """Play one wave from the squad's state until it is cleared, breached or out of time"""
+        import heapq
+
+        clock, dt = self._clock, self.dt
+        schedule = self._wave_schedule(wave, rng)
+        starting_tier, starting_heroes = squad.tier, squad.heroes
+        base = squad.frame  # Frame n of the play is frame n - base of the wave
+        limit = wave['duration'] + self.MAX_OVERTIME
+        self._extend_clock(base + int(limit / dt) + 2)
+        horizon = bisect.bisect_right(clock, limit)  # First wave frame past the time limit
+        # Spawn frames, each list closed by an inf that is never reached
+        spawn_frames = [base + max(1, bisect.bisect_left(clock, time)) for time in schedule['zomboid_time'].tolist()]
+        spawn_count = len(spawn_frames)
+        spawn_frames.append(math.inf)
+        spawn_kinds, spawn_xs = schedule['zomboid_type'].tolist(), schedule['zomboid_x'].tolist()
+        timer_rows = schedule['timers']
+        timer_frames = [base + max(1, bisect.bisect_left(clock, row['spawnTime'])) for row in timer_rows] + [math.inf]
+        next_spawn = next_timer = 0
+        shots = hits = kills = caught = peak = present = 0
+
+        # Struct-of-arrays entity storage, indexed in creation order. A box is what meet() needs of a
+        # zomboid or timer: (track, spawn frame, half height, fall per frame, last frame on screen)
+        p_x, p_track, p_fired, p_last, p_tier, p_half, p_step, p_penetration, p_alive, p_cell = ([] for _ in range(10))
+        z_x, z_track, z_spawned, z_half_width, z_box, z_health = [], [], [], [], [], []
+        t_type, t_x, t_track, t_spawned, t_last, t_half_width, t_box = [], [], [], [], [], [], []
+        t_counter, t_increment, t_max, t_weapon_tier, t_reset, t_alive = [], [], [], [], [], []
+        live, timers = [], []           # Walking zomboids and timers on screen, in creation order
+        timer_exit = math.inf           # Last frame the first timer to leave is on screen
+        projectile_cells = [[] for _ in range(self.columns)]
+        zomboid_cells = [[] for _ in range(self.columns)]
+        widest_projectile = max(self.projectile_half)
+        widest_zomboid = max(self.zomboid_half_width, default=0.0)
+        last_cell = self.columns - 1
+        hits_due = []                   # (frame, 0 for zomboids or 1 for timers, projectile, target)
+        breaches = []                   # (frame, zomboid)
+        removals = []                   # Frames destruction tweens end
+
+        def cell_of(x):
+            cell = int(x // self.CELL_SIZE)
+            return 0 if cell < 0 else last_cell if cell > last_cell else cell
+
+        def meet(p, box, first):
+            """First frame from `first` on which projectile p overlaps the box, or None"""
+            track, spawned, half_height, step, last = box
+            path, fired, half = p_track[p], p_fired[p], p_half[p]
+            if p_last[p] < last:
+                last = p_last[p]
+            if first > last:
+                return None
+            n = first
+            if not path[n - fired] - half < track[n - spawned] + half_height:
+                # Below the box: close the gap at the combined speed, then settle on the exact frame
+                rate = p_step[p] + step
+                if rate <= 0:
+                    return None
+                gap = (path[n - fired] - half) - (track[n - spawned] + half_height)
+                n = first + int(gap / rate) + 1
+                if n > last:
+                    n = last
+                while n > first and path[n - 1 - fired] - half < track[n - 1 - spawned] + half_height:
+                    n -= 1
+                while n <= last and not path[n - fired] - half < track[n - spawned] + half_height:
+                    n += 1
+                if n > last:
+                    return None
+            return n if path[n - fired] + half > track[n - spawned] - half_height else None
+
+        def projectiles_near(n, x, half_width):
+            """Projectiles on screen at frame n whose x range can overlap [x - half_width, x + half_width]"""
+            for cell in range(cell_of(x - half_width - widest_projectile), cell_of(x + half_width + widest_projectile) + 1):
+                bucket = projectile_cells[cell]
+                bucket[:] = [p for p in bucket if p_last[p] >= n]
+                for p in bucket:
+                    if p_x[p] - p_half[p] < x + half_width and p_x[p] + p_half[p] > x - half_width:
+                        yield p
+
+        def reward(t, value, instant) -> bool:
+            """GameScene.processInstantReward / processTimerEffect for one timer; True when the tier changed"""
+            config = self.timer_types[t_type[t]]
+            kind = config.get('instantReward') if instant else None
+            if kind == 'hero':
+                squad.heroes = min(squad.heroes + config.get('instantRewardCount', 1), self.hero_max)
+            elif kind == 'weapon_upgrade' or (kind is None and config['id'] == 'weapon_upgrade_timer' and value >= 0):
+                if t_reset[t]:
+                    squad.heroes = max(self.hero_min, min(1, self.hero_max))
+                # upgradeToTier looks up tier weaponTier + 1; without weaponTier it is upgradeWeapon (tier + 1)
+                wanted = t_weapon_tier[t] + 1 if t_weapon_tier[t] >= 0 else squad.tier + 1
+                if wanted in self.tiers and wanted > squad.tier:
+                    squad.tier = wanted
+                    return True
+            elif kind is None and config['id'] in ('hero_add_timer', 'rapid_hero_timer') and value != 0:
+                squad.heroes = min(max(squad.heroes + int(value), self.hero_min), self.hero_max)
+            return False
+
+        push, pop = heapq.heappush, heapq.heappop
+        reaction, follow_timers = self.reaction, self.policy == 'timers'
+        damage_of, penetration_of = self.damage, self.penetration
+        fire_frame = self._after(base, squad.last_fire, self.fire_rate[squad.tier] - 1e-9)
+        n = base + 1
+        while True:
+            # Policy: every reaction time, choose a snap column from the state the last frame left
+            if (n - 1) % reaction == 0:
+                goal, lowest = None, -math.inf
+                for z in live:
+                    y = z_track[z][n - 1 - z_spawned[z]]
+                    if y >= lowest:
+                        goal, lowest = z_x[z], y
+                if follow_timers:
+                    best = -math.inf
+                    for t in timers:
+                        y = t_track[t][n - 1 - t_spawned[t]]
+                        if t_counter[t] < t_max[t] and y < self.hero_line and y + self.timer_priority[t_type[t]] >= best:
+                            goal, best = t_x[t], y + self.timer_priority[t_type[t]]
+                if goal is not None:
+                    target = self._nearest_snap.get(goal)
+                    if target is None:
+                        target = self._nearest_snap[goal] = min(self.snaps, key=lambda snap: abs(snap - goal))
+                    if target != squad.target_x:
+                        self._move_squad(squad, n - 1)
+                        squad.target_x = target
+
+            # WeaponSystem.fire: one volley, each projectile's pairs with what is already on screen
+            if n == fire_frame:
+                if squad.velocity or squad.x != squad.target_x:
+                    self._move_squad(squad, n)
+                squad.last_fire = clock[n]
+                tier, heroes = squad.tier, squad.heroes
+                per_hero = self.projectile_count[tier]
+                half, step = self.projectile_half[tier], self.projectile_step[tier]
+                # Every hero fires the same x offsets, so each slot's targets are found once per volley
+                offsets, centring, tracks = self._volley(tier, heroes, horizon)
+                xs = [squad.x + offset - centring for offset in offsets]
+                targets = []
+                for x in xs:
+                    near = [(0, z, z_box[z]) for cell in range(cell_of(x - half - widest_zomboid), cell_of(x + half + widest_zomboid) + 1)
+                            for z in zomboid_cells[cell] if x - half < z_x[z] + z_half_width[z] and x + half > z_x[z] - z_half_width[z]]
+                    near += [(1, t, t_box[t]) for t in timers if x - half < t_x[t] + t_half_width[t] and x + half > t_x[t] - t_half_width[t]]
+                    targets.append(near)
+                first, count = len(p_x), heroes * per_hero
+                p_x.extend(xs * heroes)
+                p_fired.extend([n] * count)
+                p_tier.extend([tier] * count)
+                p_half.extend([half] * count)
+                p_step.extend([step] * count)
+                p_penetration.extend([penetration_of[tier]] * count)
+                p_alive.extend([True] * count)
+                p_cell.extend([cell_of(x) for x in xs] * heroes)
+                for track in tracks:
+                    p_track.extend([track] * per_hero)
+                    p_last.extend([n + len(track) - 1] * per_hero)
+                for p in range(first, first + count):
+                    projectile_cells[p_cell[p]].append(p)
+                    for phase, target, box in targets[(p - first) % per_hero]:
+                        frame = meet(p, box, n)
+                        if frame is not None:
+                            push(hits_due, (frame, phase, p, target))
+                shots += count
+                fire_frame = self._after(n, squad.last_fire, self.fire_rate[tier] - 1e-9)
+
+            # WaveManager.update: spawns, then destruction tweens ending
+            while spawn_frames[next_spawn] == n:
+                kind, x = spawn_kinds[next_spawn], spawn_xs[next_spawn]
+                track = self._track(self.spawn_y, self.zomboid_step[kind], self.safe_line, horizon)
+                z = len(z_x)
+                z_x.append(x)
+                z_track.append(track)
+                z_spawned.append(n)
+                z_half_width.append(self.zomboid_half_width[kind])
+                z_box.append((track, n, self.zomboid_half_height[kind], self.zomboid_step[kind], n + len(track) - 1))
+                z_health.append(self.zomboid_health[kind])
+                live.append(z)
+                zomboid_cells[cell_of(x)].append(z)
+                push(breaches, (n + len(track), z))
+                present += 1
+                for p in projectiles_near(n, x, z_half_width[z]):
+                    frame = meet(p, z_box[z], n)
+                    if frame is not None:
+                        push(hits_due, (frame, 0, p, z))
+                next_spawn += 1
+            while timer_frames[next_timer] == n:
+                row = timer_rows[next_timer]
+                config = self.timer_types[self.timer_index[row['type']]]
+                step = float(config['speed']) * dt
+                track = self._track(float(-config['height']), step, self.height, horizon)
+                t = len(t_x)
+                t_type.append(self.timer_index[row['type']])
+                t_x.append(self.timer_columns[0 if row.get('column') == 'left' else 1])
+                t_track.append(track)
+                t_spawned.append(n)
+                t_last.append(n + len(track) - 1)
+                t_half_width.append(config['width'] / 2)
+                t_box.append((track, n, config['height'] / 2, step, t_last[t]))
+                t_counter.append(float(row.get('startValue', config['startValue'])))
+                t_increment.append(float(config.get('increment', 1)))
+                t_max.append(float(config.get('maxValue', math.inf)))
+                t_weapon_tier.append(row.get('weaponTier', -1))
+                t_reset.append(bool(row.get('resetHeroCount', False)))
+                t_alive.append(True)
+                timers.append(t)
+                timer_exit = min(timer_exit, t_last[t])
+                for p in projectiles_near(n, t_x[t], t_half_width[t]):
+                    frame = meet(p, t_box[t], n)
+                    if frame is not None:
+                        push(hits_due, (frame, 1, p, t))
+                next_timer += 1
+            while removals and removals[0] <= n:
+                pop(removals)
+                present -= 1
+            if present > peak:
+                peak = present
+
+            # Timers leaving the bottom pay out their counter
+            if n > timer_exit:
+                for t in [t for t in timers if t_last[t] < n]:
+                    t_alive[t] = False
+                    timers.remove(t)
+                    if reward(t, t_counter[t], instant=False):
+                        fire_frame = self._after(n, squad.last_fire, self.fire_rate[squad.tier] - 1e-9)
+                timer_exit = min((t_last[t] for t in timers), default=math.inf)
+
+            # GameScene.checkGameOver, then wave completion
+            while breaches and z_health[breaches[0][1]] <= 0:
+                pop(breaches)
+            if (breaches and breaches[0][0] <= n) or n - base >= horizon:
+                cleared = False
+                break
+            if next_spawn == spawn_count and present == 0:
+                cleared = True
+                break
+
+            # CollisionManager: zomboid hits in (projectile, zomboid) order, then timer hits
+            while hits_due and hits_due[0][0] == n:
+                _, phase, p, target = pop(hits_due)
+                if not p_alive[p]:
+                    continue
+                if phase == 0:
+                    health = z_health[target]
+                    if health <= 0:
+                        continue
+                    tier = p_tier[p]
+                    damage = damage_of[tier]
+                    destroyed = health - damage <= 0
+                    z_health[target] = health - damage
+                    hits += 1
+                    if destroyed:
+                        kills += 1
+                        live.remove(target)
+                        zomboid_cells[cell_of(z_x[target])].remove(target)
+                        push(removals, base + self._after(n - base, clock[n - base], self.DESTROY_TWEEN - 1e-9))
+                    if penetration_of[tier] > 0:
+                        p_penetration[p] -= health if destroyed else damage
+                        p_alive[p] = p_penetration[p] > 0
+                    else:
+                        p_alive[p] = False
+                    if p_alive[p] and not destroyed:
+                        frame = meet(p, z_box[target], n + 1)
+                        if frame is not None:
+                            push(hits_due, (frame, 0, p, target))
+                else:
+                    if not t_alive[target]:
+                        continue
+                    previous = t_counter[target]
+                    t_counter[target] += t_increment[target]
+                    p_alive[p] = False
+                    if previous < t_max[target] <= t_counter[target]:
+                        t_alive[target] = False
+                        timers.remove(target)
+                        timer_exit = min((t_last[t] for t in timers), default=math.inf)
+                        caught += 1
+                        if reward(target, t_counter[target], instant=True):
+                            fire_frame = self._after(n, squad.last_fire, self.fire_rate[squad.tier] - 1e-9)
+                if not p_alive[p]:
+                    projectile_cells[p_cell[p]].remove(p)
+
+            # Next frame where anything can happen
+            n = min(n + 1 + (-n) % reaction if live or timers else math.inf, fire_frame,
+                    spawn_frames[next_spawn], timer_frames[next_timer], removals[0] if removals else math.inf,
+                    timer_exit + 1,
+                    breaches[0][0] if breaches else math.inf, hits_due[0][0] if hits_due else math.inf, base + horizon)
+
+        squad.frame = n
+        return GameWaveOutcome(
+            wave_id=wave['waveId'], wave_name=wave['waveName'], seed=seed,
+            starting_tier=starting_tier, starting_heroes=starting_heroes,
+            cleared=cleared, end_time=round(clock[n - base], 6),
+            ending_tier=squad.tier, ending_heroes=squad.heroes,
+            shots=shots, hits=hits, kills=kills, timers_caught=caught, peak_zomboids=peak,
+        )
+
+    def run(self, plays: List[Tuple[List[Dict], int, int, int]]) -> List[List[GameWaveOutcome]]:
+        """
+        Play each (waves, starting tier, starting heroes, seed) through its
+        waves in order until one breaches; returns the outcome of every wave
+        reached, per play.
+        """
+        outcomes = []
+        for waves, tier, heroes, seed in plays:
+            rng = np.random.default_rng(seed)
+            squad = SquadState(tier=tier, heroes=heroes, x=self.start_x, target_x=self.start_x)
+            played = []
+            for wave in waves:
+                played.append(self._play_wave(wave, squad, rng, seed))
+                if not played[-1].cleared:
+                    break
+            outcomes.append(played)
+        return outcomes
+
+    def simulate_chapter(self, chapter: Dict, state: ChapterState = ChapterState(), seeds: int = 1,
+                         seed: int = 0) -> List[List[GameWaveOutcome]]:
+        """Play the chapter's waves in order, once per seed, until each play breaches or clears the chapter"""
+        return self.run([(chapter['waves'], state.weapon_tier, state.hero_count, seed + i) for i in range(seeds)])
+
+    def simulate_campaign(self, seeds: int = 1, seed: int = 0) -> List[Tuple[Dict, List[List[GameWaveOutcome]]]]:
+        """
+        Every wave played on its own from the tier the analyzer expects it to
+        start with, once per seed; per chapter, per wave, the seeds' outcomes.
+        """
+        plays, keys = [], []
+        state = ChapterState()
+        for chapter in self.analyzer.chapters:
+            for index, analysis in enumerate(self.analyzer.analyze_chapter_cached(chapter, state)):
+                for i in range(seeds):
+                    plays.append(([chapter['waves'][index]], analysis.weapon_tier_start, state.hero_count, seed + i))
+                    keys.append((chapter['chapterId'], index))
+            state = self.analyzer.chapter_end_state(chapter, state)
+
+        grouped: Dict[Tuple[str, int], List[GameWaveOutcome]] = {}
+        for key, outcome in zip(keys, self.run(plays)):
+            grouped.setdefault(key, []).extend(outcome)
+        return [(chapter, [grouped[(chapter['chapterId'], index)] for index in range(len(chapter['waves']))])
+                for chapter in self.analyzer.chapters]
+
+def run_game_simulation(analyzer: BalanceAnalyzer, policy: str = 'timers', seeds: int = 8, seed: int = 0):
+    """Play every wave in the headless game simulator and compare with the analyzer's grades"""
+    import time
+
+    simulator = GameSimulator(analyzer, policy)
+    start = time.perf_counter()
+    campaign = simulator.simulate_campaign(seeds, seed)
+    elapsed = time.perf_counter() - start
+
+    print("=" * 80)
+    print(f"ZOMBOID ASSAULT - HEADLESS GAME SIMULATION (policy: {policy}, {seeds} seeds per wave)")
+    print("=" * 80)
+
+    disagreements = []
+    simulated = 0.0
+    state = ChapterState()
+    for chapter, waves in campaign:
+        analyses = analyzer.analyze_chapter_cached(chapter, state)
+        state = analyzer.chapter_end_state(chapter, state)
+        print(f"\n[CHAPTER] {chapter['chapterName']} ({chapter['chapterId']})")
+        for analysis, outcomes in zip(analyses, waves):
+            simulated += sum(outcome.end_time for outcome in outcomes)
+            cleared = [outcome for outcome in outcomes if outcome.cleared]
+            clear_rate = len(cleared) / len(outcomes)
+            line = f"  [WAVE {analysis.wave_id}] {analysis.wave_name}: {analysis.grade} ({analysis.overkill_ratio:.2f}x) | " \
+                   f"cleared {len(cleared)}/{len(outcomes)}"
+            if cleared:
+                line += f", avg clear {sum(o.end_time for o in cleared) / len(cleared):.1f}s"
+            breaches = [outcome.end_time for outcome in outcomes if not outcome.cleared]
+            if breaches:
+                line += f", first breach {min(breaches):.1f}s"
+            hits = sum(outcome.hits for outcome in outcomes)
+            shots = sum(outcome.shots for outcome in outcomes)
+            line += f", {hits / shots if shots else 0:.2f} hits/shot, T{analysis.weapon_tier_start}->" \
+                    f"T{max(outcome.ending_tier for outcome in outcomes)}"
+            expected = analysis.overkill_ratio >= 1.0
+            if expected != (clear_rate >= 0.5):
+                line += " [MISMATCH]"
+                disagreements.append(analysis)
+            print(line)
+
+    waves = sum(len(w) for _, w in campaign)
+    print(f"\nSimulated {simulated:,.0f}s of play ({waves} waves x {seeds} seeds) in {elapsed:.2f}s "
+          f"({simulated / elapsed if elapsed else 0:,.0f}x real time)")
+    if disagreements:
+        print(f"[WARNING]: {len(disagreements)} waves where the grade (overkill >= 1.0) and the simulated "
+              f"clear rate (>= 50%) disagree")
+    else:
+        print("[SUCCESS] Every wave's grade agrees with its simulated outcome.")
+
+# ObjectPool pre-allocations in the game: WeaponSystem (projectiles), WaveManager (zomboids, timers)
+GAME_POOL_SIZES = {'projectiles': 100, 'zomboids': 50, 'timers': 10}
+
+# Live entities a low-end phone keeps at 60 fps; tune per device with --entity-budget
+DEFAULT_ENTITY_BUDGET = 250
+
+@dataclass
+class EntityPeaks:
+    """Most entities of each pooled kind one wave can have alive at once"""
+    wave_id: int
+    wave_name: str
+    zomboids: int
+    projectiles: int
+    timers: int
+    weapon_tier: int   # Tier whose volleys give the projectile peak
+    heroes: int
+
+    @property
+    def total(self) -> int:
+        return self.zomboids + self.projectiles + self.timers
+
+def peak_overlap(intervals: List[Tuple[float, float]]) -> int:
+    """Most [start, end) intervals covering a single instant"""
+    # Ends sort before starts at the same instant, so back-to-back intervals do not overlap
+    events = sorted([(start, 1) for start, _ in intervals] + [(end, -1) for _, end in intervals])
+    live = peak = 0
+    for _, change in events:
+        live += change
+        peak = max(peak, live)
+    return peak
+
+class PoolSizer:
+    """
+    Worst-case live entity counts per wave, for sizing the game's ObjectPools.
+
+    Nothing is assumed killed or caught: a zomboid lives from its spawn until
+    it crosses into the safe zone (spawn zone plus field height at its
+    speed), a timer until it leaves the bottom of the screen, and a
+    projectile until it clears the top. Zomboid and timer peaks come from a
+    sweep over the WaveManager spawn schedule. The projectile peak is the
+    steady stream of a full squad (`heroes`, the heroes.json cap unless
+    given) firing each weapon tier the wave can hold, with fireRate rounded
+    up to whole frames as the game's per-frame check does.
+    """
+
+    HEADROOM = 1.25   # Recommended pool size over the campaign peak
+
+    def __init__(self, analyzer: BalanceAnalyzer, heroes: int = None):
+        self.analyzer = analyzer
+        self.heroes = heroes if heroes is not None else analyzer.heroes.max_count
+
+    def projectile_peak(self, weapon: WeaponStats, heroes: int) -> int:
+        """Projectiles in flight once a squad of `heroes` has been firing `weapon` for a while"""
+        fps = self.analyzer.field.fps
+        limits = self.analyzer.heroes
+        interval = max(1, math.ceil(weapon.fire_rate * fps - 1e-9))
+        # HeroManager stacks the squad around the column centre; lower heroes' shots fly further
+        top = self.analyzer.field.screen_height - limits.position_from_bottom - (heroes - 1) * limits.spacing / 2
+        peak = 0
+        for index in range(heroes):
+            distance = top + index * limits.spacing + weapon.projectile_size
+            frames = math.ceil(distance * fps / weapon.projectile_speed)
+            peak += math.ceil(frames / interval) * weapon.projectile_count
+        return peak
+
+    def wave_peaks(self, wave: Dict, analysis: WaveAnalysis) -> EntityPeaks:
+        field = self.analyzer.field
+        travel = field.screen_height - field.safe_zone_height + field.spawn_zone_height
+
+        zomboids = []
+        for pattern in wave['spawnPattern']['zomboids']:
+            stats = self.analyzer.zomboids.get(pattern['type'])
+            if stats is None:
+                continue
+            delay, interval = pattern.get('spawnDelay', 0), 1 / pattern['spawnRate']
+            zomboids.extend((delay + i * interval, delay + i * interval + travel / stats.speed)
+                            for i in range(pattern['count']))
+
+        timers = []
+        for timer in wave['spawnPattern'].get('timers', []):
+            stats = self.analyzer.timers.get(timer['type'])
+            if stats is not None:
+                timers.append((timer['spawnTime'], timer['spawnTime'] + (field.screen_height + stats.height) / stats.speed))
+
+        # Every tier the timeline fires with, not just the two ends: upgrades can skip tiers
+        tiers = {segment.tier for segment in analysis.segments if not segment.is_catch}
+        tiers |= {analysis.weapon_tier_start, analysis.weapon_tier_end}
+        volleys = {tier: self.projectile_peak(self.analyzer.weapons[tier], self.heroes)
+                   for tier in tiers if tier in self.analyzer.weapons}
+        tier = max(volleys, key=lambda t: (volleys[t], t)) if volleys else analysis.weapon_tier_start
+
+        return EntityPeaks(
+            wave_id=wave['waveId'],
+            wave_name=wave['waveName'],
+            zomboids=peak_overlap(zomboids),
+            projectiles=volleys.get(tier, 0),
+            timers=peak_overlap(timers),
+            weapon_tier=tier,
+            heroes=self.heroes,
+        )
+
+    def campaign(self) -> List[Tuple[Dict, List[EntityPeaks]]]:
+        campaign = []
+        state = ChapterState()
+        for chapter in self.analyzer.chapters:
+            analyses = self.analyzer.analyze_chapter_cached(chapter, state)
+            campaign.append((chapter, [self.wave_peaks(wave, analysis)
+                                       for wave, analysis in zip(chapter['waves'], analyses)]))
+            state = self.analyzer.chapter_end_state(chapter, state)
+        return campaign
+
+    def recommend(self, peak: int) -> int:
+        """Pre-allocation for a pool whose campaign peak is `peak`: headroom, rounded up to tens"""
+        return math.ceil(peak * self.HEADROOM / 10) * 10
+
+def run_pools(analyzer: BalanceAnalyzer, budget: int = DEFAULT_ENTITY_BUDGET, heroes: int = None):
+    """Per-wave peak entity counts, ObjectPool sizes and waves over the live-entity budget"""
+    sizer = PoolSizer(analyzer, heroes)
+    campaign = sizer.campaign()
+
+    print("=" * 80)
+    print(f"ZOMBOID ASSAULT - ENTITY PEAKS & OBJECT POOL SIZING "
+          f"({sizer.heroes} hero{'es' if sizer.heroes != 1 else ''}, budget {budget} live entities)")
+    print("=" * 80)
+
+    over_budget = []
+    busiest = {}   # pool -> (peak, chapter id, wave id)
+    for chapter, waves in campaign:
+        print(f"\n[CHAPTER] {chapter['chapterName']} ({chapter['chapterId']})")
+        for peaks in waves:
+            line = (f"  [WAVE {peaks.wave_id}] {peaks.wave_name}: {peaks.zomboids} zomboids, "
+                    f"{peaks.projectiles} projectiles (T{peaks.weapon_tier}), {peaks.timers} timers = {peaks.total} live")
+            if peaks.total > budget:
+                line += " [OVER BUDGET]"
+                over_budget.append((chapter, peaks))
+            print(line)
+            for pool in GAME_POOL_SIZES:
+                if getattr(peaks, pool) > busiest.get(pool, (-1,))[0]:
+                    busiest[pool] = (getattr(peaks, pool), chapter['chapterId'], peaks.wave_id)
+
+    print(f"\n[POOLS] Recommended pre-allocation (campaign peak x{sizer.HEADROOM:g}, rounded up to tens):")
+    for pool, current in GAME_POOL_SIZES.items():
+        peak, chapter_id, wave_id = busiest.get(pool, (0, None, None))
+        where = f" in {chapter_id} wave {wave_id}" if chapter_id else ""
+        grows = f", pool grows by {peak - current} mid-wave today" if peak > current else ""
+        print(f"  {pool:<12} peak {peak:>5}{where} -> {sizer.recommend(peak):>5} (currently {current}{grows})")
+
+    if over_budget:
+        print(f"\n[WARNING]: {len(over_budget)} waves can exceed {budget} live entities:")
+        for chapter, peaks in over_budget:
+            print(f"  - {chapter['chapterId']} wave {peaks.wave_id} ({peaks.wave_name}): {peaks.total} live")
+    else:
+        print(f"\n[SUCCESS] No wave exceeds {budget} live entities.")
+
+@dataclass
+class HPCurve:
+    """Per-bin HP flow of one wave; bin k covers [k * resolution, (k + 1) * resolution)"""
+    chapter_id: str
+    wave_id: int
+    wave_name: str
+    duration: float
+    resolution: float
+    spawned_hp: "np.ndarray"    # HP that spawned during each bin
+    killable_hp: "np.ndarray"   # Damage the player can deal during each bin
+    backlog_hp: "np.ndarray"    # HP still alive at the end of each bin
+    peak_backlog_hp: float
+    peak_backlog_time: float
+    end_backlog_hp: float       # HP still alive when the wave's duration runs out
+    pressure_flag: bool         # Whether calculate_spawn_pressure flagged the wave
+
+    @property
+    def times(self) -> "np.ndarray":
+        """End time of every bin"""
+        return (np.arange(len(self.backlog_hp)) + 1) * self.resolution
+
+    @property
+    def is_problem(self) -> bool:
+        return self.end_backlog_hp > 0
+
+class HPCurveAnalyzer:
+    """
+    Time-binned HP-in-play curves, the time-series counterpart of calculate_spawn_pressure.
+
+    Each pattern spawns `count` zomboids at spawnDelay + i / spawnRate (the
+    WaveManager schedule) and stops once its count is used up. The player
+    kills up to the current weapon's DPS x bin length, nothing while catching
+    a timer, and keeps firing the final weapon after the wave's duration.
+    Backlog follows B[k] = max(0, B[k-1] + spawned[k] - killable[k]), computed
+    for all waves at once from cumulative sums:
+    B = X - min(0, running min of X) with X = cumsum(spawned - killable).
+    """
+
+    def __init__(self, analyzer: BalanceAnalyzer, resolution: float = 0.1):
+        require_numpy()
+        if resolution <= 0:
+            raise ValueError("resolution must be positive")
+        self.analyzer = analyzer
+        self.resolution = resolution
+        self.batch = BatchAnalyzer(analyzer)
+
+    def _capacity_knots(self, wave: Dict, starting_tier: int, horizon: float) -> Tuple[List[float], List[float]]:
+        """Cumulative damage capacity at each timeline phase boundary, extended to the horizon"""
+        timeline = self.analyzer.build_timeline(wave, starting_tier)
+        times, capacity = [0.0], [0.0]
+        for phase in timeline.phases:
+            weapon = None if phase.is_catch else self.analyzer.weapons.get(phase.tier)
+            times.append(phase.end)
+            capacity.append(capacity[-1] + (weapon.dps() if weapon else 0.0) * phase.length)
+        final_weapon = self.analyzer.weapons.get(timeline.ending_tier)
+        if horizon > times[-1]:
+            capacity.append(capacity[-1] + (final_weapon.dps() if final_weapon else 0.0) * (horizon - times[-1]))
+            times.append(horizon)
+        return times, capacity
+
+    def curves(self, waves: List[Dict], starting_tiers: List[int], chapter_ids: List[str] = None,
+               pressure_flags: List[bool] = None) -> List[HPCurve]:
+        if not waves:
+            return []
+        resolution = self.resolution
+        batch = self.batch.pack_waves(waves, starting_tiers)
+        rate = batch.spawn_rate
+        active = (rate > 0) & (batch.zomboid_count > 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            last_spawn = np.where(active, batch.spawn_delay + (batch.zomboid_count - 1) / rate, 0.0)
+        horizon = np.maximum(batch.duration, last_spawn.max(axis=1, initial=0.0)) + resolution
+        bins = np.ceil(horizon / resolution).astype(np.int64)
+        edges = (np.arange(bins.max()) + 1) * resolution
+
+        # Zomboids spawned before each bin edge: spawn times delay + i / rate < edge
+        spawned_total = np.zeros((len(batch), len(edges)))
+        for p in range(rate.shape[1]):
+            since = (edges[None, :] - batch.spawn_delay[:, p, None]) * rate[:, p, None]
+            spawned = np.clip(np.ceil(since), 0, batch.zomboid_count[:, p, None])
+            spawned_total += np.where(active[:, p, None], spawned * batch.zomboid_hp[:, p, None], 0.0)
+
+        capacity_total = np.empty_like(spawned_total)
+        for i, wave in enumerate(waves):
+            times, capacity = self._capacity_knots(wave, int(batch.starting_tier[i]), edges[-1])
+            capacity_total[i] = np.interp(edges, times, capacity)
+
+        spawned_hp = np.diff(spawned_total, axis=1, prepend=0.0)
+        killable_hp = np.diff(capacity_total, axis=1, prepend=0.0)
+        surplus = spawned_total - capacity_total
+        backlog = surplus - np.minimum(0.0, np.minimum.accumulate(surplus, axis=1))
+        backlog = np.where(np.arange(len(edges))[None, :] < bins[:, None], backlog, 0.0)
+
+        peak = backlog.argmax(axis=1)
+        end_bin = np.maximum(np.ceil(batch.duration / resolution).astype(np.int64) - 1, 0)
+        rows = np.arange(len(batch))
+        peak_hp = backlog[rows, peak]
+        end_hp = backlog[rows, end_bin]
+
+        curves = []
+        for i, wave in enumerate(waves):
+            curves.append(HPCurve(
+                chapter_id=chapter_ids[i] if chapter_ids else "",
+                wave_id=wave['waveId'],
+                wave_name=wave['waveName'],
+                duration=float(batch.duration[i]),
+                resolution=resolution,
+                spawned_hp=spawned_hp[i, :bins[i]],
+                killable_hp=killable_hp[i, :bins[i]],
+                backlog_hp=backlog[i, :bins[i]],
+                peak_backlog_hp=float(peak_hp[i]),
+                peak_backlog_time=float(edges[peak[i]]) if peak_hp[i] > 0 else 0.0,
+                end_backlog_hp=float(end_hp[i]),
+                pressure_flag=bool(pressure_flags[i]) if pressure_flags else False,
+            ))
+        return curves
+
+    def campaign_curves(self) -> List[Tuple[Dict, List[HPCurve]]]:
+        """Curves for every wave of every chapter, one batched pass, with the campaign's weapon tiers"""
+        waves, tiers, chapter_ids, flags, sizes = [], [], [], [], []
+        for chapter, analyses in self.analyzer.iter_campaign():
+            waves.extend(chapter['waves'])
+            tiers.extend(analysis.weapon_tier_start for analysis in analyses)
+            flags.extend(bool(analysis.pressure) for analysis in analyses)
+            chapter_ids.extend([chapter['chapterId']] * len(chapter['waves']))
+            sizes.append((chapter, len(chapter['waves'])))
+        curves = self.curves(waves, tiers, chapter_ids, flags)
+
+        campaign, offset = [], 0
+        for chapter, size in sizes:
+            campaign.append((chapter, curves[offset:offset + size]))
+            offset += size
+        return campaign
+
+def render_ascii_curve(curve: HPCurve, rows: int = 20, width: int = 50) -> List[str]:
+    """Backlog over time as horizontal bars, one row per time slice (peak of the slice); | marks the wave end"""
+    backlog = curve.backlog_hp
+    if not len(backlog):
+        return []
+    scale = curve.peak_backlog_hp or 1.0
+    slices = np.array_split(np.arange(len(backlog)), min(rows, len(backlog)))
+    lines = []
+    for indices in slices:
+        value = backlog[indices].max()
+        end_time = (indices[-1] + 1) * curve.resolution
+        marker = "|" if end_time >= curve.duration and (indices[0] * curve.resolution) < curve.duration else " "
+        lines.append(f"  {end_time:7.1f}s {marker}{'#' * int(round(value / scale * width)):<{width}} {value:8.0f}HP")
+    return lines
+
+def write_curves_csv(curves: List[HPCurve], stream=None):
+    stream = stream or sys.stdout
+    writer = csv.writer(stream, lineterminator="\n")
+    writer.writerow(['chapter_id', 'wave_id', 'wave_name', 'time', 'spawned_hp', 'killable_hp', 'backlog_hp'])
+    for curve in curves:
+        for time, spawned, killable, backlog in zip(curve.times, curve.spawned_hp, curve.killable_hp, curve.backlog_hp):
+            writer.writerow([curve.chapter_id, curve.wave_id, curve.wave_name, f"{time:g}",
+                             f"{spawned:g}", f"{killable:g}", f"{backlog:g}"])
+    stream.flush()
+
+def run_hp_curves(analyzer: BalanceAnalyzer, resolution: float, curve_format: str = None):
+    """Report peak HP backlog per wave from time-binned curves; optionally draw problem waves"""
+    import time
+
+    engine = HPCurveAnalyzer(analyzer, resolution)
+    start = time.perf_counter()
+    campaign = engine.campaign_curves()
+    elapsed = time.perf_counter() - start
+    problems = [curve for _, curves in campaign for curve in curves if curve.is_problem]
+
+    if curve_format == "csv":
+        write_curves_csv(problems)
+        return
+
+    print("=" * 80)
+    print(f"ZOMBOID ASSAULT - HP-IN-PLAY CURVES ({resolution:g}s bins)")
+    print("=" * 80)
+
+    disagreements = 0
+    for chapter, curves in campaign:
+        print(f"\n[CHAPTER] {chapter['chapterName']} ({chapter['chapterId']})")
+        for curve in curves:
+            line = (f"  [WAVE {curve.wave_id}] {curve.wave_name}: peak backlog {curve.peak_backlog_hp:.0f}HP "
+                    f"at {curve.peak_backlog_time:.1f}s, {curve.end_backlog_hp:.0f}HP alive at {curve.duration:g}s")
+            if curve.is_problem:
+                line += " [BACKLOG]"
+            if curve.is_problem != curve.pressure_flag:
+                disagreements += 1
+                line += " (per-phase check: " + ("flagged" if curve.pressure_flag else "not flagged") + ")"
+            print(line)
+            if curve.is_problem and curve_format == "ascii":
+                for row in render_ascii_curve(curve):
+                    print(row)
+
+    waves = sum(len(curves) for _, curves in campaign)
+    print(f"\nBinned {waves} waves in {elapsed * 1000:.1f} ms")
+    print(f"{disagreements} waves differ from the per-phase spawn pressure check")
+    if problems:
+        print(f"[WARNING]: {len(problems)} waves still have HP alive when their duration runs out")
+    else:
+        print("[SUCCESS] Every wave's backlog is cleared within its duration.")
+
+@dataclass
+class FieldImpact:
+    """Change in a wave's ratios when one config field is nudged up"""
+    field: str
+    value: float
+    nudged: float
+    overkill_delta: float
+    bullet_delta: float
+
+@dataclass
+class WaveSensitivity:
+    wave_id: int
+    wave_name: str
+    grade: str
+    overkill_ratio: float
+    bullet_ratio: float
+    impacts: List[FieldImpact]
+
+    def ranked(self, metric: str = 'overkill_delta') -> List[FieldImpact]:
+        """Impacts, largest absolute change in the metric first"""
+        return sorted(self.impacts, key=lambda impact: abs(getattr(impact, metric)), reverse=True)
+
+# WaveBatch array behind each wave-local chapter field: (chapter JSON key, batch attribute)
+_PATTERN_FIELDS = (('count', 'zomboid_count'), ('spawnRate', 'spawn_rate'), ('spawnDelay', 'spawn_delay'))
+_UPGRADE_FIELDS = (('startValue', 'upgrade_start_value'), ('spawnTime', 'upgrade_spawn_time'))
+
+class SensitivityAnalyzer:
+    """
+    How much each numeric config field moves each wave's overkill_ratio and bullet_ratio.
+
+    Every field feeding a wave is nudged up by `step` (10%; integer fields
+    by at least 1, fields at 0 to 1) and the change is a forward finite
+    difference. Each (wave, field) pair becomes one perturbed row, and all
+    rows go through a single BatchAnalyzer pass. Wave-local fields (duration,
+    pattern count/spawnRate/spawnDelay, upgrade timer startValue/spawnTime)
+    are edited in the row itself; shared entity fields (weapon fireRate,
+    damage, projectileCount, penetrationDamage; zomboid health) select a
+    BatchAnalyzer variant with the nudged stats. Finite differences keep the
+    model's jumps, e.g. the spawn pressure penalty switching on or off.
+    Each wave keeps the starting tier the campaign gives it; knock-on
+    effects on later waves are not included.
+    """
+
+    INTEGER_FIELDS = ('count', 'health', 'damage', 'projectileCount', 'penetrationDamage')
+    WEAPON_FIELDS = (
+        ('fireRate', 'fire_rate'),
+        ('damage', 'damage'),
+        ('projectileCount', 'projectile_count'),
+        ('penetrationDamage', 'penetration_damage'),
+    )
+
+    def __init__(self, analyzer: BalanceAnalyzer, step: float = 0.1):
+        require_numpy()
+        self.analyzer = analyzer
+        self.step = step
+        self.engine = BatchAnalyzer(analyzer)
+        self._variants: Dict[str, Tuple[int, float, float]] = {}  # Entity field -> (variant, value, nudged)
+
+    def nudge(self, name: str, value: float) -> float:
+        """Value after the upward nudge for a field called `name`"""
+        if value == 0:
+            return 1
+        nudged = value + abs(value) * self.step
+        if name.rsplit('.', 1)[-1] in self.INTEGER_FIELDS:
+            nudged = max(round(nudged), value + 1)
+        return nudged
+
+    @staticmethod
+    def _take(batch: WaveBatch, rows: "np.ndarray") -> WaveBatch:
+        """Rows of a batch, in the given order (rows may repeat)"""
+        from dataclasses import fields as dataclass_fields
+
+        values = {}
+        for item in dataclass_fields(WaveBatch):
+            value = getattr(batch, item.name)
+            if value is None:
+                values[item.name] = None
+            elif isinstance(value, list):
+                values[item.name] = [value[row] for row in rows]
+            else:
+                values[item.name] = value[rows].copy()
+        return WaveBatch(**values)
+
+    def _local_fields(self, wave: Dict) -> List[Tuple[str, str, int, float]]:
+        """(label, batch attribute, column, value) for every wave-local field"""
+        local = [("duration", 'duration', None, wave['duration'])]
+        for p, pattern in enumerate(wave['spawnPattern']['zomboids']):
+            for key, attribute in _PATTERN_FIELDS:
+                local.append((f"zomboids[{p}].{key}", attribute, p, pattern.get(key, 0)))
+        u = 0
+        for j, timer in enumerate(wave['spawnPattern'].get('timers', [])):
+            if timer['type'] != 'weapon_upgrade_timer':
+                continue  # Other timers do not feed the grades
+            values = {'startValue': timer.get('startValue', -50), 'spawnTime': timer['spawnTime']}
+            for key, attribute in _UPGRADE_FIELDS:
+                local.append((f"timers[{j}].{key}", attribute, u, values[key]))
+            u += 1
+        return local
+
+    def _weapon_variant(self, weapon: WeaponStats, key: str, attribute: str) -> Tuple[str, int, float, float]:
+        from dataclasses import replace
+
+        label = f"{weapon.id}.{key}"
+        if label not in self._variants:
+            value = getattr(weapon, attribute)
+            nudged = self.nudge(label, value)
+            weapons = dict(self.analyzer.weapons)
+            weapons[weapon.tier] = replace(weapon, **{attribute: nudged})
+            self._variants[label] = (self.engine.add_variant(weapons=weapons), value, nudged)
+        return (label,) + self._variants[label]
+
+    def _zomboid_variant(self, zomboid: ZomboidStats) -> Tuple[str, int, float, float]:
+        from dataclasses import replace
+
+        label = f"{zomboid.id}.health"
+        if label not in self._variants:
+            nudged = self.nudge(label, zomboid.health)
+            zomboids = dict(self.analyzer.zomboids)
+            zomboids[zomboid.id] = replace(zomboid, health=nudged)
+            self._variants[label] = (self.engine.add_variant(zomboids=zomboids), zomboid.health, nudged)
+        return (label,) + self._variants[label]
+
+    def analyze_campaign(self) -> List[Tuple[Dict, List[WaveSensitivity]]]:
+        chapters = self.analyzer.chapters
+        waves = [wave for chapter in chapters for wave in chapter['waves']]
+        base = self.engine.pack_campaign(chapters)
+        # Counts are nudged like any other number, so keep them fractional in the perturbed rows
+        base.zomboid_count = base.zomboid_count.astype(np.float64)
+        base.variant = np.zeros(len(base), dtype=np.int64)
+        # Which weapons and zomboid types feed each wave
+        firing = self.engine.analyze(base).tier_seconds > 0
+
+        sources = list(range(len(waves)))
+        perturbations = []  # (row, wave, label, value, nudged, edit)
+        for i, wave in enumerate(waves):
+            for label, attribute, column, value in self._local_fields(wave):
+                nudged = self.nudge(label, value)
+                perturbations.append((len(sources), i, label, value, nudged, (attribute, column, nudged)))
+                sources.append(i)
+            for tier in np.flatnonzero(firing[i]):
+                weapon = self.analyzer.weapons.get(int(tier))
+                if weapon is None:
+                    continue
+                for key, attribute in self.WEAPON_FIELDS:
+                    label, variant, value, nudged = self._weapon_variant(weapon, key, attribute)
+                    perturbations.append((len(sources), i, label, value, nudged, ('variant', None, variant)))
+                    sources.append(i)
+            for zomboid_type in sorted(set(base.zomboid_type[i][base.zomboid_type[i] >= 0].tolist())):
+                zomboid = self.analyzer.zomboids[self.engine.zomboid_ids[zomboid_type]]
+                label, variant, value, nudged = self._zomboid_variant(zomboid)
+                perturbations.append((len(sources), i, label, value, nudged, ('health', zomboid_type, variant)))
+                sources.append(i)
+
+        batch = self._take(base, np.array(sources, dtype=np.int64))
+        for row, _, _, _, _, (attribute, column, new_value) in perturbations:
+            if attribute == 'health':
+                # The row's pattern HP comes from the variant's zomboid stats
+                batch.variant[row] = new_value
+                zomboids = self.engine.variants[new_value][1]
+                batch.zomboid_hp[row] = np.where(batch.zomboid_type[row] == column,
+                                                 zomboids[self.engine.zomboid_ids[column]].health,
+                                                 batch.zomboid_hp[row])
+            elif column is None:
+                getattr(batch, attribute)[row] = new_value
+            else:
+                getattr(batch, attribute)[row, column] = new_value
+        result = self.engine.analyze(batch)
+
+        impacts = [[] for _ in waves]
+        for row, i, label, value, nudged, _ in perturbations:
+            overkill_delta = float(result.overkill_ratio[row] - result.overkill_ratio[i])
+            bullet_delta = float(result.bullet_ratio[row] - result.bullet_ratio[i])
+            if overkill_delta or bullet_delta:
+                impacts[i].append(FieldImpact(label, value, nudged, overkill_delta, bullet_delta))
+
+        campaign, offset = [], 0
+        for chapter in chapters:
+            sensitivities = []
+            for wave in chapter['waves']:
+                sensitivities.append(WaveSensitivity(
+                    wave_id=wave['waveId'],
+                    wave_name=wave['waveName'],
+                    grade=result.grade(offset),
+                    overkill_ratio=float(result.overkill_ratio[offset]),
+                    bullet_ratio=float(result.bullet_ratio[offset]),
+                    impacts=impacts[offset],
+                ))
+                offset += 1
+            campaign.append((chapter, sensitivities))
+        return campaign
+
+def run_sensitivity(analyzer: BalanceAnalyzer, top: int = 3):
+    """Rank the config fields that move each wave's grades the most"""
+    import time
+
+    engine = SensitivityAnalyzer(analyzer)
+    start = time.perf_counter()
+    campaign = engine.analyze_campaign()
+    elapsed = time.perf_counter() - start
+
+    print("=" * 80)
+    print(f"ZOMBOID ASSAULT - SENSITIVITY ANALYSIS (+{engine.step:.0%} per field)")
+    print("=" * 80)
+
+    def describe(impact: FieldImpact, metric: str) -> str:
+        return f"{impact.field} {impact.value:g}->{impact.nudged:g} ({getattr(impact, metric):+.2f}x)"
+
+    fields = 0
+    for chapter, sensitivities in campaign:
+        print(f"\n[CHAPTER] {chapter['chapterName']} ({chapter['chapterId']})")
+        for wave in sensitivities:
+            fields += len(wave.impacts)
+            print(f"  [WAVE {wave.wave_id}] {wave.wave_name}: {wave.grade} ({wave.overkill_ratio:.2f}x), "
+                  f"bullets {wave.bullet_ratio:.2f}x")
+            for metric, title in (('overkill_delta', "Overkill"), ('bullet_delta', "Bullets ")):
+                ranked = [impact for impact in wave.ranked(metric) if getattr(impact, metric)][:top]
+                if ranked:
+                    print(f"    {title}: " + "; ".join(describe(impact, metric) for impact in ranked))
+
+    waves = sum(len(sensitivities) for _, sensitivities in campaign)
+    print(f"\nMeasured {fields:,} field impacts across {waves} waves in {elapsed * 1000:.1f} ms")
+
+@dataclass
+class RouteTimer:
+    index: int                # Position in the wave's timer list
+    type: str
+    spawn_time: float
+    catch_duration: float     # Seconds of lost DPS to shoot the counter up to 0
+    deadline: float           # Latest finish time: timer leaves the screen or the wave ends
+    exit_time: float          # When an uncaught timer leaves the screen
+    hero_reward: int          # Heroes added when caught
+    hero_penalty: int         # Heroes removed when it leaves the screen uncaught
+    weapon_tier: int = None   # Upgrade tier (weapon_upgrade_timer only)
+    reset_hero_count: bool = False
+
+    @property
+    def label(self) -> str:
+        if self.weapon_tier is not None:
+            reset = ", resets heroes" if self.reset_hero_count else ""
+            return f"T{self.weapon_tier} upgrade{reset} @{self.spawn_time:g}s"
+        return f"{self.type.replace('_timer', '').replace('_', ' ')} @{self.spawn_time:g}s"
+
+@dataclass
+class WaveRoute:
+    damage: float
+    ratio: float
+    catches: Tuple[bool, ...]  # Catch (True) or skip (False) per timer, in spawn order
+    end_state: ChapterState
+
+@dataclass
+class WaveRoutes:
+    wave_id: int
+    wave_name: str
+    total_hp: int
+    start_state: ChapterState
+    timers: List[RouteTimer]
+    best: WaveRoute
+    worst: WaveRoute
+    required: List[bool]       # Per timer: True if flipping the best route's choice makes the wave unclearable
+
+    @property
+    def clearable(self) -> bool:
+        return self.best.ratio >= 1.0
+
+    @property
+    def unique_route(self) -> bool:
+        """Only one exact catch/skip sequence clears the wave"""
+        return self.clearable and bool(self.timers) and all(self.required)
+
+@dataclass
+class ChapterRoutes:
+    chapter: Dict
+    start_state: ChapterState
+    best: List[WaveRoutes]    # Waves along the route that maximizes the weakest wave's ratio
+    worst: List[WaveRoutes]   # Waves along the route that minimizes it
+
+    @staticmethod
+    def bottleneck(waves: List[WaveRoutes], route: str) -> float:
+        return min((getattr(wave, route).ratio for wave in waves), default=math.inf)
+
+# Timeline events, ordered so a timer leaving the screen resolves before one spawning at the same instant
+_ROUTE_EXIT = 0
+_ROUTE_SPAWN = 1
+
+class RouteSolver:
+    """
+    Best and worst catch/skip routes through waves and chapters.
+
+    Every timer is a choice. Catching costs |startValue| / CATCH_POINTS_PER_SECOND
+    seconds without firing at zomboids and must finish before the timer leaves
+    the screen; hero timers then add instantRewardCount heroes (up to
+    maxHeroCount) and upgrade timers raise the tier, resetting the squad to one
+    hero if resetHeroCount is set. A skipped hero timer removes |startValue|
+    heroes (down to minHeroCount) when it leaves the screen, as in
+    GameScene.processTimerEffect. Damage is weapon DPS x heroes x firing time.
+
+    The search walks the wave's spawn/exit events with memoized state
+    (event, time the player is free, tier, heroes, skipped timers still on
+    screen), so its size follows the few timers on screen at once rather than
+    2^timers. A wave's result is kept per end (tier, heroes) so chapters can be
+    searched wave by wave over the same state.
+    """
+
+    def __init__(self, analyzer: BalanceAnalyzer):
+        self.analyzer = analyzer
+        self.states_visited = 0
+        self._wave_cache: Dict[tuple, Dict[ChapterState, Tuple[float, Tuple[bool, ...]]]] = {}
+
+    def route_timers(self, wave: Dict) -> List[RouteTimer]:
+        """The wave's timers in spawn order with their catch cost and effects"""
+        duration = wave['duration']
+        screen_height = self.analyzer.field.screen_height
+        timers = []
+        for index, timer in enumerate(wave['spawnPattern'].get('timers', [])):
+            stats = self.analyzer.timers.get(timer['type'])
+            start_value = timer.get('startValue', stats.start_value if stats else -50)
+            spawn_time = timer['spawnTime']
+            # Timers spawn just above the screen and exit once past its bottom edge
+            exit_time = spawn_time + (screen_height + stats.height) / stats.speed if stats else math.inf
+            is_upgrade = timer['type'] == 'weapon_upgrade_timer'
+            timers.append(RouteTimer(
+                index=index,
+                type=timer['type'],
+                spawn_time=spawn_time,
+                catch_duration=abs(start_value) / wave_catch_speed(wave),
+                deadline=min(exit_time, duration),
+                exit_time=exit_time,
+                hero_reward=0 if is_upgrade else (stats.reward_count if stats else 1),
+                hero_penalty=0 if is_upgrade else max(0, -start_value),
+                weapon_tier=timer.get('weaponTier', 2) if is_upgrade else None,
+                reset_hero_count=is_upgrade and bool(timer.get('resetHeroCount', False)),
+            ))
+        return sorted(timers, key=lambda t: (t.spawn_time, t.index))
+
+    def solve_wave_states(self, wave: Dict, state: ChapterState, maximize: bool = True,
+                          forced: Tuple[Tuple[int, bool], ...] = ()
+                          ) -> Dict[ChapterState, Tuple[float, Tuple[bool, ...]]]:
+        """
+        Best (or worst) damage reachable for every end state, with its catch/skip sequence.
+        `forced` pins (timer position, catch) choices; infeasible pins drop out of the result.
+        """
+        cache_key = (id(wave), state, maximize, forced)
+        if cache_key in self._wave_cache:
+            return self._wave_cache[cache_key]
+
+        timers = self.route_timers(wave)
+        duration = wave['duration']
+        weapons = self.analyzer.weapons
+        limits = self.analyzer.heroes
+        pinned = dict(forced)
+        better = (lambda a, b: a > b) if maximize else (lambda a, b: a < b)
+
+        events = [(t.spawn_time, _ROUTE_SPAWN, position) for position, t in enumerate(timers) if t.spawn_time < duration]
+        events += [(t.exit_time, _ROUTE_EXIT, position) for position, t in enumerate(timers)
+                   if t.hero_penalty and t.exit_time < duration]
+        events.sort()
+        memo = {}
+
+        def dps(tier: int, heroes: int) -> float:
+            weapon = weapons.get(tier)
+            return weapon.dps() * heroes if weapon else 0.0
+
+        def search(e: int, free: float, tier: int, heroes: int, skipped: frozenset):
+            key = (e, free, tier, heroes, skipped)
+            if key in memo:
+                return memo[key]
+            self.states_visited += 1
+
+            now = events[e][0] if e < len(events) else duration
+            fired = max(0.0, now - free) * dps(tier, heroes)
+            free = max(free, now)
+
+            if e == len(events):
+                outcome = {ChapterState(tier, heroes): (fired, ())}
+                memo[key] = outcome
+                return outcome
+
+            _, kind, position = events[e]
+            timer = timers[position]
+            branches = []
+            if kind == _ROUTE_EXIT:
+                if position in skipped:
+                    heroes = max(limits.min_count, heroes - timer.hero_penalty)
+                branches.append((None, search(e + 1, free, tier, heroes, skipped - {position})))
+            else:
+                if pinned.get(position, False) is False:
+                    leaving = skipped | {position} if timer.hero_penalty and timer.exit_time < duration else skipped
+                    branches.append((False, search(e + 1, free, tier, heroes, leaving)))
+                finish = free + timer.catch_duration
+                if pinned.get(position, True) is True and finish <= timer.deadline:
+                    if timer.weapon_tier is not None:
+                        caught_heroes = 1 if timer.reset_hero_count else heroes
+                        # upgradeToTier never downgrades
+                        caught_tier = max(tier, timer.weapon_tier)
+                    else:
+                        caught_heroes = min(limits.max_count, heroes + timer.hero_reward)
+                        caught_tier = tier
+                    branches.append((True, search(e + 1, finish, caught_tier, caught_heroes, skipped)))
+
+            outcome = {}
+            for choice, results in branches:
+                for end_state, (damage, catches) in results.items():
+                    damage += fired
+                    if choice is not None:
+                        catches = (choice,) + catches
+                    if end_state not in outcome or better(damage, outcome[end_state][0]):
+                        outcome[end_state] = (damage, catches)
+            memo[key] = outcome
+            return outcome
+
+        outcome = search(0, 0.0, state.weapon_tier, state.hero_count, frozenset())
+        # Timers spawning after the wave ends are never seen: record them as skipped
+        missed = len(timers) - sum(1 for _, kind, _ in events if kind == _ROUTE_SPAWN)
+        if missed:
+            outcome = {end: (damage, catches + (False,) * missed) for end, (damage, catches) in outcome.items()}
+        self._wave_cache[cache_key] = outcome
+        return outcome
+
+    def _route(self, wave: Dict, total_hp: int, end_state: ChapterState, damage: float,
+               catches: Tuple[bool, ...]) -> WaveRoute:
+        ratio = damage / total_hp if total_hp > 0 else math.inf
+        return WaveRoute(damage, ratio, catches, end_state)
+
+    def solve_wave(self, wave: Dict, state: ChapterState = ChapterState(),
+                   best_end: ChapterState = None, worst_end: ChapterState = None) -> WaveRoutes:
+        """Best/worst routes through one wave, plus which choices any clearing route must make"""
+        total_hp, _ = self.analyzer.calculate_zomboid_hp(wave)
+        best_states = self.solve_wave_states(wave, state, maximize=True)
+        worst_states = self.solve_wave_states(wave, state, maximize=False)
+        if best_end is None:
+            best_end = max(best_states, key=lambda end: best_states[end][0])
+        if worst_end is None:
+            worst_end = min(worst_states, key=lambda end: worst_states[end][0])
+        best = self._route(wave, total_hp, best_end, *best_states[best_end])
+        worst = self._route(wave, total_hp, worst_end, *worst_states[worst_end])
+
+        # A choice is required when no route making the opposite choice clears the wave
+        required = []
+        for position, caught in enumerate(best.catches):
+            flipped = self.solve_wave_states(wave, state, maximize=True, forced=((position, not caught),))
+            best_flipped = max((damage for damage, _ in flipped.values()), default=-math.inf)
+            required.append(best.ratio >= 1.0 and best_flipped < total_hp)
+
+        return WaveRoutes(
+            wave_id=wave['waveId'],
+            wave_name=wave['waveName'],
+            total_hp=total_hp,
+            start_state=state,
+            timers=self.route_timers(wave),
+            best=best,
+            worst=worst,
+            required=required,
+        )
+
+    def solve_chapter(self, chapter: Dict, state: ChapterState = ChapterState()) -> ChapterRoutes:
+        """
+        Routes through a whole chapter. The best route maximizes the weakest
+        wave's ratio (a chapter is only as clearable as its hardest wave), the
+        worst route minimizes it; each wave's end state feeds the next wave.
+        """
+        waves = chapter['waves']
+        memo = {}
+
+        def search(w: int, start: ChapterState, maximize: bool):
+            key = (w, start, maximize)
+            if key in memo:
+                return memo[key]
+            if w == len(waves):
+                return math.inf, ()
+            total_hp, _ = self.analyzer.calculate_zomboid_hp(waves[w])
+            chosen = None
+            for end_state, (damage, _) in self.solve_wave_states(waves[w], start, maximize).items():
+                ratio = damage / total_hp if total_hp > 0 else math.inf
+                rest, ends = search(w + 1, end_state, maximize)
+                value = min(ratio, rest)
+                if chosen is None or (value > chosen[0] if maximize else value < chosen[0]):
+                    chosen = (value, (end_state,) + ends)
+            memo[key] = chosen
+            return chosen
+
+        routes = {}
+        for maximize in (True, False):
+            _, ends = search(0, state, maximize)
+            wave_routes = []
+            current = state
+            for wave, end_state in zip(waves, ends):
+                if maximize:
+                    wave_routes.append(self.solve_wave(wave, current, best_end=end_state))
+                else:
+                    wave_routes.append(self.solve_wave(wave, current, worst_end=end_state))
+                current = end_state
+            routes[maximize] = wave_routes
+        return ChapterRoutes(chapter, state, routes[True], routes[False])
+
+    def solve_campaign(self) -> List[ChapterRoutes]:
+        """Every chapter from the starting state ProgressManager would give it"""
+        campaign = []
+        state = ChapterState()
+        for chapter in self.analyzer.chapters:
+            campaign.append(self.solve_chapter(chapter, state))
+            state = self.analyzer.chapter_end_state(chapter, state)
+        return campaign
+
+def format_route(timers: List[RouteTimer], catches: Tuple[bool, ...]) -> str:
+    if not timers:
+        return "no timers"
+    return ", ".join(f"{'catch' if caught else 'skip'} {timer.label}" for timer, caught in zip(timers, catches))
+
+def run_routes(analyzer: BalanceAnalyzer):
+    """Report the best and worst timer routes through every wave and chapter"""
+    import time
+
+    solver = RouteSolver(analyzer)
+    start = time.perf_counter()
+    campaign = solver.solve_campaign()
+    elapsed = time.perf_counter() - start
+
+    print("=" * 80)
+    print("ZOMBOID ASSAULT - TIMER ROUTE SOLVER")
+    print("=" * 80)
+
+    unique = []
+    unclearable = []
+    timer_count = 0
+    for chapter_routes in campaign:
+        chapter = chapter_routes.chapter
+        best = ChapterRoutes.bottleneck(chapter_routes.best, 'best')
+        worst = ChapterRoutes.bottleneck(chapter_routes.worst, 'worst')
+        print(f"\n[CHAPTER] {chapter['chapterName']} ({chapter['chapterId']})")
+        print(f"  Weakest wave: {best:.2f}x on the best route, {worst:.2f}x on the worst")
+        for routes, worst_routes in zip(chapter_routes.best, chapter_routes.worst):
+            timer_count += len(routes.timers)
+            end = routes.best.end_state
+            print(f"  [WAVE {routes.wave_id}] {routes.wave_name}: best {routes.best.ratio:.2f}x "
+                  f"(ends T{end.weapon_tier}, {end.hero_count} hero{'es' if end.hero_count != 1 else ''}), worst {worst_routes.worst.ratio:.2f}x")
+            print(f"    Best route:  {format_route(routes.timers, routes.best.catches)}")
+            print(f"    Worst route: {format_route(worst_routes.timers, worst_routes.worst.catches)}")
+            if not routes.clearable:
+                print("    [UNCLEARABLE] No catch/skip route deals enough damage")
+                unclearable.append(routes)
+            elif routes.unique_route:
+                print("    [ONE ROUTE] Only this exact catch/skip sequence clears the wave")
+                unique.append(routes)
+            elif any(routes.required):
+                pinned = [timer.label for timer, needed in zip(routes.timers, routes.required) if needed]
+                print(f"    Required: {', '.join(pinned)}")
+
+    waves = sum(len(chapter_routes.best) for chapter_routes in campaign)
+    print(f"\nSolved {waves} waves ({timer_count} timers, {solver.states_visited:,} states) in {elapsed * 1000:.1f} ms")
+    if unclearable:
+        print(f"[WARNING]: {len(unclearable)} waves cannot be cleared by any route")
+    if unique:
+        print(f"[WARNING]: {len(unique)} waves can only be cleared by one exact route")
+    if not unclearable and not unique:
+        print("[SUCCESS] Every wave has more than one clearing route.")
+
+class AnalyzerProfiler:
+    """
+    Opt-in instrumentation for a BalanceAnalyzer.
+
+        with AnalyzerProfiler(analyzer) as profiler:
+            analyzer.print_report()
+        profiler.print_table()
+
+    While active, the analyzer instance's public methods are wrapped to
+    record wall time (inclusive and self) and call counts, plus how many
+    waves, timeline segments and weapon upgrades were processed. Nothing is
+    wrapped outside the with-block, so a disabled profiler costs nothing.
+    With stats_file, a cProfile run is also written there for pstats/snakeviz.
+    """
+
+    METHOD_PREFIXES = ('load_', 'find_', 'build_', 'calculate_', 'analyze_', 'print_', 'write_')
+
+    def __init__(self, analyzer: BalanceAnalyzer, stats_file: str = None):
+        self.analyzer = analyzer
+        self.stats_file = stats_file
+        self.calls: Dict[str, int] = {}
+        self.total_time: Dict[str, float] = {}
+        self.self_time: Dict[str, float] = {}
+        self.counters = {'waves': 0, 'segments': 0, 'upgrades': 0}
+        self.wall_time = 0.0
+        self._stack: List[float] = []  # Child time accumulated by each active call
+        self._cprofile = None
+        self._started = 0.0
+
+    def method_names(self) -> List[str]:
+        return sorted(name for name in dir(BalanceAnalyzer)
+                      if name.startswith(self.METHOD_PREFIXES) and callable(getattr(BalanceAnalyzer, name)))
+
+    def _wrap(self, name: str, method):
+        import time
+
+        def wrapper(*args, **kwargs):
+            self._stack.append(0.0)
+            start = time.perf_counter()
+            try:
+                result = method(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                children = self._stack.pop()
+                if self._stack:
+                    self._stack[-1] += elapsed
+                self.calls[name] = self.calls.get(name, 0) + 1
+                self.total_time[name] = self.total_time.get(name, 0.0) + elapsed
+                self.self_time[name] = self.self_time.get(name, 0.0) + elapsed - children
+
+            if name == 'analyze_wave':
+                self.counters['waves'] += 1
+            elif name == 'calculate_segments':
+                self.counters['segments'] += len(result)
+            elif name == 'find_weapon_upgrades':
+                self.counters['upgrades'] += len(result)
+            return result
+
+        return wrapper
+
+    def __enter__(self) -> "AnalyzerProfiler":
+        import time
+
+        for name in self.method_names():
+            setattr(self.analyzer, name, self._wrap(name, getattr(self.analyzer, name)))
+        if self.stats_file:
+            import cProfile
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        import time
+
+        self.wall_time += time.perf_counter() - self._started
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            self._cprofile.dump_stats(self.stats_file)
+            self._cprofile = None
+        # Drop the instance wrappers so the class methods are used again
+        for name in self.method_names():
+            self.analyzer.__dict__.pop(name, None)
+        return False
+
+    def print_table(self, stream=None):
+        """Compact hot-spot table, hottest (self time) first"""
+        stream = stream or sys.stdout
+        wall = self.wall_time or 1e-9
+        lines = [
+            "",
+            "=" * 80,
+            "[PROFILE] Hot spots (wall time)",
+            "=" * 80,
+            f"  {'Method':<30} {'Calls':>9} {'Total ms':>10} {'Self ms':>10} {'Self %':>7}",
+        ]
+        for name in sorted(self.calls, key=lambda n: self.self_time[n], reverse=True):
+            lines.append(
+                f"  {name:<30} {self.calls[name]:>9,} {self.total_time[name] * 1000:>10.1f} "
+                f"{self.self_time[name] * 1000:>10.1f} {self.self_time[name] / wall * 100:>6.1f}%"
+            )
+        lines.append(
+            f"\n  Total {wall * 1000:.1f} ms: {self.counters['waves']:,} waves, "
+            f"{self.counters['segments']:,} segments, {self.counters['upgrades']:,} upgrades processed"
+        )
+        if self.stats_file:
+            lines.append(f"  cProfile stats written to {self.stats_file}")
+        stream.write("\n".join(lines) + "\n")
+
+class ConfigWatcher:
+    """
+    Re-analyzes chapters as config files are saved.
+
+    Polls file modification times under the config directory. Only changed
+    chapter files are re-read. Thanks to the content-hash result store, only
+    those chapters, and later chapters whose starting state changes as a
+    result, are analyzed again.
+    """
+
+    POLL_INTERVAL = 0.02  # Seconds between checks
+
+    def __init__(self, analyzer: BalanceAnalyzer):
+        self.analyzer = analyzer
+        self.entity_files = {
+            analyzer.config_dir / "entities" / "weapons.json",
+            analyzer.config_dir / "entities" / "zomboids.json",
+            analyzer.config_dir / "game-settings.json",
+        }
+
+    def snapshot(self) -> Dict[Path, Tuple[int, int]]:
+        """(mtime, size) of every watched file"""
+        files = {}
+        chapters_dir = self.analyzer.config_dir / "chapters"
+        paths = list(self.entity_files) + [path for path in chapters_dir.glob("chapter-*.json") if "test" not in path.name]
+        for path in paths:
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files[path] = (stat.st_mtime_ns, stat.st_size)
+        return files
+
+    def reload(self, changed: List[Path]) -> bool:
+        """Re-read changed files; returns False if a file could not be parsed (e.g. mid-save)"""
+        analyzer = self.analyzer
+        try:
+            if any(path in self.entity_files for path in changed):
+                analyzer.load_entities()
+
+            chapters = dict(zip(analyzer.chapter_paths, analyzer.chapters))
+            paths = sorted(path for path in self.snapshot() if path not in self.entity_files)
+            for path in paths:
+                if path in changed or path not in chapters:
+                    chapters[path] = analyzer.load_chapter(path)
+        except (OSError, ValueError) as error:
+            print(f"[WATCH] Skipping reload: {error}")
+            return False
+
+        analyzer.chapter_paths = paths
+        analyzer.chapters = [chapters[path] for path in paths]
+        return True
+
+    def reanalyze(self) -> int:
+        """Analyze chapters with no stored result and print them; returns how many were analyzed"""
+        analyzer = self.analyzer
+        analyzed = 0
+        state = ChapterState()
+        for chapter in analyzer.chapters:
+            cached = analyzer.results.contains(chapter, state)
+            analyses = analyzer.analyze_chapter_cached(chapter, state)
+            if not cached:
+                analyzed += 1
+                print(f"\n[CHAPTER] {chapter['chapterName']} ({chapter['chapterId']}) - starting T{state.weapon_tier}")
+                for analysis in analyses:
+                    flags = ""
+                    if analysis.overkill_ratio < 1.0:
+                        flags += " [WARNING: damage short]"
+                    if analysis.bullet_ratio < 1.3:
+                        flags += " [WARNING: bullets < 1.3x]"
+                    print(f"  [WAVE {analysis.wave_id}] {analysis.wave_name}: {analysis.grade} ({analysis.overkill_ratio:.2f}x), "
+                          f"bullets {analysis.bullet_grade} ({analysis.bullet_ratio:.2f}x){flags}")
+            state = analyzer.chapter_end_state(chapter, state)
+        return analyzed
+
+    def run(self):
+        import time
+
+        print(f"[WATCH] Watching {self.analyzer.config_dir} (Ctrl+C to stop)")
+        self.reanalyze()
+        previous = self.snapshot()
+        pending = set()  # Changed files that failed to parse; retried on the next save
+        try:
+            while True:
+                time.sleep(self.POLL_INTERVAL)
+                current = self.snapshot()
+                if current == previous:
+                    continue
+                changed = pending | {path for path in set(current) | set(previous) if current.get(path) != previous.get(path)}
+                previous = current
+                start = time.perf_counter()
+                if not self.reload(list(changed)):
+                    pending = changed
+                else:
+                    pending = set()
+                    analyzed = self.reanalyze()
+                    elapsed = (time.perf_counter() - start) * 1000
+                    names = ", ".join(sorted(path.name for path in changed))
+                    print(f"\n[WATCH] {names} changed: re-analyzed {analyzed} chapter(s) in {elapsed:.1f} ms")
+        except KeyboardInterrupt:
+            print("\n[WATCH] Stopped")
+
+# Game log lines, as written by server/logger.cjs: "[timestamp] [LEVEL] message"
+LOG_LINE = re.compile(r"\[(?P<time>[^\]]+)\] \[(?P<level>\w+)\] (?P<message>.*)")
+# Messages the calibration cares about, as logged by GameScene and WaveManager
+LOG_EVENTS = (
+    ('chapter_start', re.compile(r"GameScene: Starting chapter (?P<chapter>\S+) with Tier (?P<tier>\d+), (?P<heroes>\d+) heroes")),
+    ('wave_start', re.compile(r"Wave (?P<wave>\d+) started: ")),
+    ('timer', re.compile(r"Timer (?P<how>exited|completed instantly): (?P<type>\w+) with value (?P<value>-?[\d.]+)")),
+    ('wave_complete', re.compile(r"Wave (?P<wave>\d+) complete!")),
+    ('game_over', re.compile(r"Game Over!")),
+    ('pause', re.compile(r"Game paused$")),
+    ('resume', re.compile(r"Game resumed$")),
+)
+
+@dataclass
+class LogEvent:
+    time: float      # Unix seconds
+    kind: str        # First LOG_EVENTS name whose pattern matched
+    fields: Dict[str, str]
+
+def read_log_lines(path: Path, offset: int = 0):
+    """
+    Yield (end offset, line) for each complete line after `offset`.
+    Reads one line at a time, so memory stays constant however large the
+    log is. A trailing line without a newline is still being written and
+    is left for the next read.
+    """
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        for raw in f:
+            if not raw.endswith(b"\n"):
+                break
+            offset += len(raw)
+            yield offset, raw.decode('utf-8', 'replace').rstrip("\r\n")
+
+def parse_log_events(lines):
+    """Yield (end offset, LogEvent) for the lines of read_log_lines that match a LOG_EVENTS pattern"""
+    from datetime import datetime
+
+    for offset, line in lines:
+        match = LOG_LINE.match(line)
+        if not match:
+            continue
+        message = match['message']
+        for kind, pattern in LOG_EVENTS:
+            event = pattern.match(message)
+            if event:
+                break
+        else:
+            continue
+        try:
+            # Browser ISO timestamps end in Z, which fromisoformat only accepts from Python 3.11
+            timestamp = datetime.fromisoformat(match['time'].replace('Z', '+00:00')).timestamp()
+        except ValueError:
+            continue
+        yield offset, LogEvent(timestamp, kind, event.groupdict())
+
+@dataclass
+class WaveObservations:
+    """Running totals for one wave (or a pool of waves); constant size however many sessions are ingested"""
+    attempts: int = 0
+    clears: int = 0
+    game_overs: int = 0
+    clear_seconds: float = 0.0       # Sum of in-game time to clear, over clears
+    catches: int = 0                 # Timers shot to their max value, with a known spawn time
+    catch_speed_sum: float = 0.0
+    catch_speed_sum_sq: float = 0.0
+    upgrades_seen: int = 0
+    upgrades_caught: int = 0
+
+    def merge(self, other: "WaveObservations"):
+        for name, value in asdict(other).items():
+            setattr(self, name, getattr(self, name) + value)
+
+    @property
+    def catch_speed(self) -> float:
+        return self.catch_speed_sum / self.catches if self.catches else 0.0
+
+    @property
+    def catch_speed_std(self) -> float:
+        if self.catches < 2:
+            return 0.0
+        variance = (self.catch_speed_sum_sq - self.catch_speed_sum ** 2 / self.catches) / (self.catches - 1)
+        return math.sqrt(max(variance, 0.0))
+
+    @property
+    def catch_success(self) -> float:
+        return self.upgrades_caught / self.upgrades_seen if self.upgrades_seen else 0.0
+
+    @property
+    def clear_rate(self) -> float:
+        return self.clears / self.attempts if self.attempts else 0.0
+
+class CalibrationProfile:
+    """
+    Model constants fitted from gameplay logs (logs/game.log).
+
+    Log lines are streamed from the last ingested byte offset and folded
+    into per-wave running totals, keyed "chapterId/waveNumber":
+    - Catch speed: a timer that completes instantly went from its startValue
+      to its final value between its spawn (wave start + spawnTime, minus
+      time spent paused) and the log line.
+    - Catch success: the share of weapon upgrade timers that ended at 0 or
+      above.
+    - Outcomes: wave attempts, clears, game overs and time to clear.
+    Shots and hits are not logged, so accuracy and targeting stay at the
+    model's defaults.
+
+    A fit uses the wave's own samples once it has MIN_SAMPLES of them, then
+    its chapter's, then all chapters'. apply() writes the fitted catch speed
+    into each wave's "calibration" block, which every analysis mode reads.
+    The game clears the log when a chapter starts. A file that is shorter
+    than the saved offset, or starts with a different first line, is
+    re-read from the beginning.
+    """
+
+    MIN_SAMPLES = 3
+
+    def __init__(self):
+        self.log_offset = 0
+        self.log_head = ""       # sha1 of the log's first line at log_offset
+        self.waves: Dict[str, WaveObservations] = {}
+        self.session: Dict = {}  # Play session in progress at log_offset
+
+    @classmethod
+    def load(cls, path: Path) -> "CalibrationProfile":
+        """Profile saved at `path`, or an empty one if there is none yet"""
+        profile = cls()
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return profile
+        profile.log_offset = data.get('log_offset', 0)
+        profile.log_head = data.get('log_head', "")
+        profile.session = data.get('session', {})
+        profile.waves = {key: WaveObservations(**values) for key, values in data.get('waves', {}).items()}
+        return profile
+
+    def save(self, path: Path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            'log_offset': self.log_offset,
+            'log_head': self.log_head,
+            'session': self.session,
+            'waves': {key: asdict(observations) for key, observations in sorted(self.waves.items())},
+            'fitted': self.fitted(),
+        }
+        temp_path = path.with_suffix('.tmp')
+        with open(temp_path, 'w') as f:
+            json.dump(data, f, indent=2)
+            f.write("\n")
+        os.replace(temp_path, path)
+
+    @staticmethod
+    def _head(path: Path) -> str:
+        with open(path, 'rb') as f:
+            return hashlib.sha1(f.readline()).hexdigest()
+
+    def ingest(self, path: Path, analyzer: BalanceAnalyzer) -> Tuple[int, int]:
+        """Fold the log's new lines into the running totals; returns (bytes read, events used)"""
+        path = Path(path)
+        head = self._head(path)
+        if path.stat().st_size < self.log_offset or head != self.log_head:
+            # The log was cleared or replaced since the last ingest
+            self.log_offset = 0
+            self.session = {}
+        self.log_head = head
+
+        chapters = {chapter['chapterId']: chapter for chapter in analyzer.chapters}
+        start = self.log_offset
+        events = 0
+        for offset, event in parse_log_events(read_log_lines(path, self.log_offset)):
+            self.observe(event, chapters)
+            self.log_offset = offset
+            events += 1
+        # Skip trailing lines that held no events too
+        for offset, _ in read_log_lines(path, self.log_offset):
+            self.log_offset = offset
+        return self.log_offset - start, events
+
+    def _observations(self, session: Dict) -> WaveObservations:
+        key = f"{session['chapter']}/{session['wave']}"
+        return self.waves.setdefault(key, WaveObservations())
+
+    def observe(self, event: LogEvent, chapters: Dict[str, Dict]):
+        """Advance the session state machine by one log event"""
+        session = self.session
+        kind = event.kind
+        if kind == 'chapter_start':
+            self.session = {'chapter': event.fields['chapter'], 'wave': None}
+            return
+        if not session.get('chapter'):
+            return  # Joined mid-session; wait for the next chapter start
+        if kind == 'wave_start':
+            session.update(wave=int(event.fields['wave']), start=event.time, paused=0.0, paused_at=None, timers={})
+            self._observations(session).attempts += 1
+            return
+        if session.get('wave') is None:
+            return
+
+        if session['paused_at'] is not None:
+            paused = session['paused'] + event.time - session['paused_at']
+        else:
+            paused = session['paused']
+        game_time = event.time - session['start'] - paused
+        observations = self._observations(session)
+
+        if kind == 'pause':
+            session['paused_at'] = event.time
+        elif kind == 'resume':
+            session['paused'], session['paused_at'] = paused, None
+        elif kind == 'timer':
+            timer_type = event.fields['type']
+            value = float(event.fields['value'])
+            # The n-th logged timer of a type is matched to the n-th one the wave spawns
+            nth = session['timers'].get(timer_type, 0)
+            session['timers'][timer_type] = nth + 1
+            if timer_type == 'weapon_upgrade_timer':
+                observations.upgrades_seen += 1
+                observations.upgrades_caught += value >= 0
+            chapter = chapters.get(session['chapter'])
+            waves = chapter['waves'] if chapter else []
+            if event.fields['how'] != 'completed instantly' or not 0 < session['wave'] <= len(waves):
+                return
+            timers = sorted((timer for timer in waves[session['wave'] - 1]['spawnPattern'].get('timers', [])
+                             if timer['type'] == timer_type), key=lambda timer: timer['spawnTime'])
+            if nth < len(timers):
+                timer = timers[nth]
+                elapsed = game_time - timer['spawnTime']
+                if elapsed > 0:
+                    speed = (value - timer.get('startValue', -50)) / elapsed
+                    observations.catches += 1
+                    observations.catch_speed_sum += speed
+                    observations.catch_speed_sum_sq += speed * speed
+        elif kind == 'wave_complete':
+            observations.clears += 1
+            observations.clear_seconds += game_time
+            session['wave'] = None
+        elif kind == 'game_over':
+            observations.game_overs += 1
+            session['wave'] = None
+
+    def pooled(self, chapter_id: str = None) -> WaveObservations:
+        """Totals over one chapter's waves, or over every wave"""
+        total = WaveObservations()
+        for key, observations in self.waves.items():
+            if chapter_id is None or key.rsplit("/", 1)[0] == chapter_id:
+                total.merge(observations)
+        return total
+
+    def catch_speed(self, chapter_id: str, wave_number: int) -> float:
+        """Fitted catch speed for a wave, or None when there are too few samples anywhere"""
+        for observations in (self.waves.get(f"{chapter_id}/{wave_number}"), self.pooled(chapter_id), self.pooled()):
+            if observations is not None and observations.catches >= self.MIN_SAMPLES:
+                return observations.catch_speed
+        return None
+
+    def fitted(self) -> Dict:
+        """Fitted values per wave key, plus the all-chapter pool under '*'"""
+        result = {}
+        for key, observations in sorted(self.waves.items()) + [('*', self.pooled())]:
+            result[key] = {
+                'samples': observations.catches,
+                'catch_points_per_second': observations.catch_speed if observations.catches else None,
+                'catch_success': observations.catch_success if observations.upgrades_seen else None,
+                'clear_rate': observations.clear_rate if observations.attempts else None,
+            }
+        return result
+
+    def apply(self, analyzer: BalanceAnalyzer) -> int:
+        """Write fitted catch speeds into the loaded waves; returns how many waves were calibrated"""
+        # Decode any lazily loaded chapters so the edits stick
+        analyzer.chapters = list(analyzer.chapters)
+        calibrated = 0
+        for chapter in analyzer.chapters:
+            for number, wave in enumerate(chapter['waves'], 1):
+                speed = self.catch_speed(chapter['chapterId'], number)
+                if speed is not None:
+                    wave['calibration'] = {'catchPointsPerSecond': round(speed, 3)}
+                    calibrated += 1
+        return calibrated
+
+def run_ingest(analyzer: BalanceAnalyzer, log_path: Path, profile_path: Path):
+    """Ingest new gameplay log lines and report the fitted model constants"""
+    import time
+
+    profile = CalibrationProfile.load(profile_path)
+    start = time.perf_counter()
+    try:
+        read, events = profile.ingest(log_path, analyzer)
+    except OSError as error:
+        # Usually the first run, before the game has written logs/game.log
+        print(f"[ERROR]: Cannot read gameplay log {log_path}: {error.strerror or error}")
+        sys.exit(1)
+    elapsed = time.perf_counter() - start
+    profile.save(profile_path)
+
+    print("=" * 80)
+    print("ZOMBOID ASSAULT - GAMEPLAY LOG CALIBRATION")
+    print("=" * 80)
+    print(f"Read {read:,} new bytes of {log_path} ({events:,} events) in {elapsed * 1000:.1f} ms")
+
+    def describe(observations: WaveObservations) -> str:
+        parts = [f"{observations.clears}/{observations.attempts} cleared"]
+        if observations.clears:
+            parts.append(f"avg clear {observations.clear_seconds / observations.clears:.1f}s")
+        if observations.catches:
+            parts.append(f"catch {observations.catch_speed:.1f}±{observations.catch_speed_std:.1f} pts/s "
+                         f"({observations.catches} samples)")
+        if observations.upgrades_seen:
+            parts.append(f"upgrades caught {observations.upgrades_caught}/{observations.upgrades_seen}")
+        return ", ".join(parts)
+
+    for chapter in analyzer.chapters:
+        rows = [(number, profile.waves[f"{chapter['chapterId']}/{number}"])
+                for number in range(1, len(chapter['waves']) + 1)
+                if f"{chapter['chapterId']}/{number}" in profile.waves]
+        if not rows:
+            continue
+        print(f"\n[CHAPTER] {chapter['chapterName']} ({chapter['chapterId']})")
+        for number, observations in rows:
+            speed = profile.catch_speed(chapter['chapterId'], number)
+            fitted = f" -> model {speed:.1f} pts/s" if speed is not None else ""
+            print(f"  [WAVE {number}] {chapter['waves'][number - 1]['waveName']}: {describe(observations)}{fitted}")
+
+    overall = profile.pooled()
+    print(f"\nAll waves: {describe(overall)}")
+    if overall.catches >= CalibrationProfile.MIN_SAMPLES:
+        print(f"Model default {CATCH_POINTS_PER_SECOND:g} pts/s; fitted {overall.catch_speed:.1f} pts/s")
+    else:
+        print(f"[WARNING]: Fewer than {CalibrationProfile.MIN_SAMPLES} timer catches logged; "
+              f"the model keeps {CATCH_POINTS_PER_SECOND:g} pts/s")
+    print(f"Profile written to {profile_path} (apply with --calibration)")
+
+class RevisionAnalyzer(BalanceAnalyzer):
+    """BalanceAnalyzer over config files held in memory (e.g. git blobs), keyed by path relative to the config dir"""
+
+    def __init__(self, config_dir: str, files: Dict[str, bytes]):
+        super().__init__(config_dir)
+        self.files = files
+
+    def read_config(self, relative: str) -> bytes:
+        try:
+            return self.files[relative]
+        except KeyError:
+            raise FileNotFoundError(relative) from None
+
+    def chapter_files(self) -> List[Path]:
+        names = sorted(Path(relative).name for relative in self.files if relative.startswith("chapters/"))
+        return [self.config_dir / "chapters" / name
+                for name in names if fnmatch.fnmatch(name, "chapter-*.json") and "test" not in name]
+
+class GitObjectReader:
+    """
+    Reads objects from a repository's object store through one long-lived
+    `git cat-file --batch` process, so no files are checked out. Tree
+    listings are cached by tree id: commits that share a subtree are only
+    read once.
+    """
+
+    def __init__(self, repo: Path):
+        import subprocess
+
+        self.repo = Path(repo)
+        self._process = subprocess.Popen(["git", "cat-file", "--batch"], cwd=self.repo,
+                                         stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        self._trees: Dict[str, Dict[str, str]] = {}
+
+    def read(self, spec: str) -> Tuple[str, str, bytes]:
+        """(object id, type, content) of a revision spec such as "<commit>:public/config"; None if missing"""
+        self._process.stdin.write(spec.encode('utf-8') + b"\n")
+        self._process.stdin.flush()
+        header = self._process.stdout.readline().split()
+        if len(header) != 3:
+            return None
+        object_id, object_type, size = header[0].decode(), header[1].decode(), int(header[2])
+        content = self._process.stdout.read(size)
+        self._process.stdout.read(1)  # Trailing newline
+        return object_id, object_type, content
+
+    def tree_files(self, tree_id: str) -> Dict[str, str]:
+        """Blob id of every file below a tree, keyed by relative path"""
+        files = self._trees.get(tree_id)
+        if files is not None:
+            return files
+        files = {}
+        _, _, content = self.read(tree_id)
+        position = 0
+        # Tree entries: "<mode> <name>\0<20-byte object id>"
+        while position < len(content):
+            space = content.index(b" ", position)
+            nul = content.index(b"\0", space)
+            mode = content[position:space]
+            name = content[space + 1:nul].decode('utf-8')
+            object_id = content[nul + 1:nul + 21].hex()
+            position = nul + 21
+            if mode == b"40000":
+                for relative, blob_id in self.tree_files(object_id).items():
+                    files[f"{name}/{relative}"] = blob_id
+            else:
+                files[name] = object_id
+        self._trees[tree_id] = files
+        return files
+
+    def close(self):
+        self._process.stdin.close()
+        self._process.wait()
+
+@dataclass
+class HistoryCommit:
+    commit: str
+    short: str
+    timestamp: int
+    subject: str
+    config_tree: str  # Tree id of the config directory; equal ids mean identical configs
+
+@dataclass
+class WaveHistoryPoint:
+    chapter_id: str
+    wave_id: int
+    wave_name: str
+    grade: str
+    overkill_ratio: float
+    bullet_grade: str
+    bullet_ratio: float
+
+def _history_worker_analyze(task: Tuple[str, Dict[str, bytes]]) -> List[WaveHistoryPoint]:
+    """Analyze one config state from in-memory files"""
+    config_dir, files = task
+    analyzer = RevisionAnalyzer(config_dir, files)
+    analyzer.load_configs(verbose=False)
+    return [
+        WaveHistoryPoint(chapter['chapterId'], analysis.wave_id, analysis.wave_name, analysis.grade,
+                         analysis.overkill_ratio, analysis.bullet_grade, analysis.bullet_ratio)
+        for chapter, analyses in analyzer.iter_campaign() for analysis in analyses
+    ]
+
+class BalanceHistory:
+    """
+    Grades of every wave across a range of git commits.
+
+    Walks the first-parent history of A..B (plus A itself as the baseline)
+    and keeps only commits that change the config directory's tree. Each
+    distinct tree (reverts map back to an earlier state) is analyzed once,
+    from blobs read through GitObjectReader, in parallel worker processes.
+    The working tree is never touched.
+    """
+
+    def __init__(self, analyzer: BalanceAnalyzer, workers: int = None):
+        import subprocess
+
+        self.analyzer = analyzer
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        config_dir = analyzer.config_dir.resolve()
+        self.repo = Path(subprocess.run(["git", "rev-parse", "--show-toplevel"], cwd=config_dir, check=True,
+                                        capture_output=True, text=True).stdout.strip())
+        self.prefix = config_dir.relative_to(self.repo.resolve()).as_posix()
+
+    def _git(self, *arguments: str) -> str:
+        import subprocess
+
+        result = subprocess.run(["git", *arguments], cwd=self.repo, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise ValueError(result.stderr.strip() or f"git {' '.join(arguments)} failed")
+        return result.stdout
+
+    def commits(self, revision_range: str, reader: GitObjectReader) -> Tuple[List[HistoryCommit], int]:
+        """Commits in the range that change the configs, oldest first; also returns how many were walked"""
+        start, dots, end = revision_range.partition("..")
+        end = end or "HEAD"
+        if not dots:
+            start, end = revision_range, "HEAD"
+        # Baseline: the start commit itself, then everything after it on the first-parent chain
+        log = self._git("log", "-1", "--format=%H%x1f%h%x1f%ct%x1f%s", start, "--")
+        log += self._git("log", "--first-parent", "--reverse", "--format=%H%x1f%h%x1f%ct%x1f%s", f"{start}..{end}", "--")
+
+        commits, walked, previous = [], 0, None
+        for line in log.splitlines():
+            commit, short, timestamp, subject = line.split("\x1f", 3)
+            walked += 1
+            tree = reader.read(f"{commit}:{self.prefix}")
+            if tree is None or tree[1] != 'tree' or tree[0] == previous:
+                continue
+            previous = tree[0]
+            commits.append(HistoryCommit(commit, short, int(timestamp), subject, tree[0]))
+        return commits, walked
+
+    def run(self, revision_range: str) -> Tuple[List[HistoryCommit], Dict[str, List[WaveHistoryPoint]], int]:
+        """(config-changing commits, analysis per config tree id, commits walked)"""
+        reader = GitObjectReader(self.repo)
+        try:
+            commits, walked = self.commits(revision_range, reader)
+            blobs: Dict[str, bytes] = {}
+            tasks = {}
+            for commit in commits:
+                if commit.config_tree in tasks:
+                    continue
+                files = {}
+                for relative, blob_id in reader.tree_files(commit.config_tree).items():
+                    if relative.endswith(".json"):
+                        if blob_id not in blobs:
+                            blobs[blob_id] = reader.read(blob_id)[2]
+                        files[relative] = blobs[blob_id]
+                tasks[commit.config_tree] = (str(self.analyzer.config_dir), files)
+        finally:
+            reader.close()
+
+        trees = list(tasks)
+        if self.workers > 1 and len(trees) > 1:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(trees))) as executor:
+                outputs = list(executor.map(_history_worker_analyze, tasks.values()))
+        else:
+            outputs = [_history_worker_analyze(task) for task in tasks.values()]
+        return commits, dict(zip(trees, outputs)), walked
+
+def run_history(analyzer: BalanceAnalyzer, revision_range: str, workers: int = None):
+    """Print how each wave's grades change across the config commits in a git range"""
+    import time
+    from datetime import datetime
+
+    start = time.perf_counter()
+    try:
+        history = BalanceHistory(analyzer, workers)
+        commits, analyses, walked = history.run(revision_range)
+    except (ValueError, OSError) as error:
+        print(f"[ERROR]: Cannot read balance history for {revision_range}: {error}")
+        sys.exit(1)
+    elapsed = time.perf_counter() - start
+
+    print("=" * 80)
+    print(f"ZOMBOID ASSAULT - BALANCE HISTORY ({revision_range})")
+    print("=" * 80)
+    if not commits:
+        print(f"[WARNING]: No commit in {revision_range} has a {history.prefix} directory")
+        return
+
+    def point_text(point: WaveHistoryPoint) -> str:
+        return f"{point.grade} ({point.overkill_ratio:.2f}x), bullets {point.bullet_grade} ({point.bullet_ratio:.2f}x)"
+
+    changed_waves = set()
+    harder = easier = 0
+    previous = {}
+    grades: Dict[Tuple[str, int], List[Tuple[str, float, str]]] = {}  # Wave -> (grade letter, ratio, commit) steps
+    for index, commit in enumerate(commits):
+        points = {(point.chapter_id, point.wave_id): point for point in analyses[commit.config_tree]}
+        date = datetime.fromtimestamp(commit.timestamp).strftime("%Y-%m-%d")
+        if index == 0:
+            print(f"\n[BASELINE] {commit.short} {date} {commit.subject}: {len(points)} waves")
+            for key, point in points.items():
+                grades[key] = [(point.grade.split()[0], point.overkill_ratio, "")]
+            previous = points
+            continue
+
+        lines = []
+        for key in sorted(set(points) | set(previous)):
+            old, new = previous.get(key), points.get(key)
+            if old is None:
+                lines.append(f"  + {key[0]} [WAVE {key[1]}] {new.wave_name}: {point_text(new)}")
+            elif new is None:
+                lines.append(f"  - {key[0]} [WAVE {key[1]}] {old.wave_name}: removed")
+            elif (old.grade, old.bullet_grade) != (new.grade, new.bullet_grade) or \
+                    abs(old.overkill_ratio - new.overkill_ratio) >= 0.005 or abs(old.bullet_ratio - new.bullet_ratio) >= 0.005:
+                if new.overkill_ratio < old.overkill_ratio:
+                    harder += 1
+                elif new.overkill_ratio > old.overkill_ratio:
+                    easier += 1
+                lines.append(f"    {key[0]} [WAVE {key[1]}] {new.wave_name}: {point_text(old)} -> {point_text(new)}")
+            else:
+                continue
+            changed_waves.add(key)
+        print(f"\n[COMMIT] {commit.short} {date} {commit.subject}: {len(lines)} waves changed")
+        for line in lines:
+            print(line)
+        for key, point in points.items():
+            steps = grades.setdefault(key, [])
+            letter = point.grade.split()[0]
+            if not steps or steps[-1][0] != letter:
+                steps.append((letter, point.overkill_ratio, commit.short if steps or index else ""))
+        previous = points
+
+    regraded = {key: steps for key, steps in grades.items() if len(steps) > 1}
+    if regraded:
+        print("\n[TIMELINE] Grade changes per wave")
+        names = {(point.chapter_id, point.wave_id): point.wave_name for points in analyses.values() for point in points}
+        for key in sorted(regraded):
+            steps = " -> ".join(f"{letter} {ratio:.2f}x" + (f" ({short})" if short else "")
+                                for letter, ratio, short in regraded[key])
+            print(f"  {key[0]} [WAVE {key[1]}] {names[key]}: {steps}")
+
+    print(f"\nWalked {walked} commits: {len(commits)} change {history.prefix} "
+          f"({len(analyses)} distinct config states analyzed) in {elapsed:.2f}s")
+    print(f"{len(changed_waves)} waves changed; {harder} edits lowered a wave's DPS ratio, {easier} raised it")
+
+# Per-process state for service workers
+_worker_service_analyzer = None
+
+def _service_worker_init(config_dir: str, calibrations: List[Dict]):
+    global _worker_service_analyzer
+    _worker_service_analyzer = BalanceAnalyzer(config_dir)
+    _worker_service_analyzer.load_configs(verbose=False)
+    restore_calibrations(_worker_service_analyzer, calibrations)
+
+def _service_worker_run(task: Tuple[str, Dict]):
+    """Run one CPU-heavy service job on this worker's analyzer; returns a JSON-ready value"""
+    job, params = task
+    analyzer = _worker_service_analyzer
+    if job == 'simulate':
+        simulator = EventSimulator(analyzer, params['targeting'])
+        results = simulator.simulate_chapter(params['chapter'], params['weapon_tier'])
+        return [asdict(result) for result in results]
+
+    if job == 'monte_carlo':
+        skill = SkillModel(
+            catch_speed=Distribution.parse(params['catch_speed'], low=0.5),
+            hit_rate=Distribution.parse(params['hit_rate'], 0.0, 1.0),
+            catch_success=Distribution.parse(params['catch_success'], 0.0, 1.0),
+        )
+        result = MonteCarloAnalyzer(analyzer, skill, workers=1).run(params['trials'], params['seed'])
+        records = []
+        index = 0
+        for chapter in analyzer.chapters:
+            for wave in chapter['waves']:
+                records.append({
+                    'chapter_id': chapter['chapterId'],
+                    'wave_id': wave['waveId'],
+                    'wave_name': wave['waveName'],
+                    'overkill_percentiles': result.overkill_percentiles[:, index].tolist(),
+                    'bullet_percentiles': result.bullet_percentiles[:, index].tolist(),
+                    'clear_rate': float(result.clear_rate[index]),
+                })
+                index += 1
+        return {'trials': result.trials, 'percentiles': list(PERCENTILES), 'waves': records}
+
+    if job == 'sensitivity':
+        records = []
+        for chapter, sensitivities in SensitivityAnalyzer(analyzer).analyze_campaign():
+            for wave in sensitivities:
+                record = asdict(wave)
+                record['chapter_id'] = chapter['chapterId']
+                record['impacts'] = [asdict(impact) for impact in wave.ranked()[:params['top']]]
+                records.append(record)
+        return records
+
+    raise ValueError(f"Unknown service job '{job}'")
+
+def _json_default(value):
+    """json.dumps fallback for NumPy scalars and arrays"""
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+class BalanceService:
+    """
+    Long-running HTTP/JSON front end for BalanceAnalyzer.
+
+    Configs and results stay warm in memory between requests, and config
+    files are polled as in ConfigWatcher, so edits are picked up without a
+    restart. Wave and chapter analysis run inline on the event loop (a few
+    milliseconds, served from the result store when the content hash is
+    known). Simulations and sweeps go to a process pool whose workers load
+    the same configs. Identical concurrent POSTs (same path, query and JSON
+    body) share one in-flight computation.
+
+    Endpoints:
+        GET  /health             configs loaded, wave count
+        GET  /stats              request counts, coalesced requests, latency percentiles
+        POST /analyze/wave       {"wave": {...}, "weaponTier": 1} or a bare wave
+        POST /analyze/chapter    {"chapter": {...}, "weaponTier": .., "heroCount": ..} or a bare chapter
+        POST /simulate           chapter body as above, plus optional "targeting"
+        POST /monte-carlo        {"trials", "seed", "catchSpeed", "hitRate", "catchSuccess"}
+        POST /sensitivity        {"top": 3}
+
+    Analysis endpoints accept ?details=1 to include the per-wave breakdown.
+    A chapter whose chapterId matches a loaded chapter starts from that
+    chapter's campaign state unless the request gives one.
+    """
+
+    MAX_BODY = 10 * 2**20        # Same limit as server/logger.cjs
+    POLL_INTERVAL = 1.0          # Seconds between config file checks
+    LATENCY_WINDOW = 10000       # Recent requests kept for /stats percentiles
+
+    def __init__(self, analyzer: BalanceAnalyzer, workers: int = None):
+        from collections import deque
+
+        self.analyzer = analyzer
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.watcher = ConfigWatcher(analyzer)
+        self.executor = None
+        self.inflight = {}
+        self.latencies = deque(maxlen=self.LATENCY_WINDOW)
+        self.counters = {'requests': 0, 'coalesced': 0, 'errors': 0, 'reloads': 0}
+        self.routes = {
+            ('GET', '/health'): self.health,
+            ('GET', '/stats'): self.stats,
+            ('POST', '/analyze/wave'): self.analyze_wave,
+            ('POST', '/analyze/chapter'): self.analyze_chapter,
+            ('POST', '/simulate'): self.simulate,
+            ('POST', '/monte-carlo'): self.monte_carlo,
+            ('POST', '/sensitivity'): self.sensitivity,
+        }
+
+    # -- Handlers: (payload, query) -> JSON-ready value; bad input raises KeyError/TypeError/ValueError
+
+    async def health(self, payload, query):
+        chapters = self.analyzer.chapters
+        return {'status': 'ok', 'chapters': len(chapters), 'waves': sum(len(chapter['waves']) for chapter in chapters)}
+
+    async def stats(self, payload, query):
+        latencies = sorted(self.latencies)
+
+        def percentile(p: float) -> float:
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))] * 1000
+
+        results = self.analyzer.results
+        return dict(self.counters, inflight=len(self.inflight), cache_hits=results.hits, cache_misses=results.misses,
+                    latency_ms={'p50': percentile(50), 'p99': percentile(99), 'max': percentile(100)})
+
+    async def analyze_wave(self, payload, query):
+        wave = payload.get('wave', payload)
+        state = ChapterState(int(payload.get('weaponTier', 1)), int(payload.get('heroCount', 1)))
+        # A one-wave chapter keys the result store like any other chapter
+        analysis = self.analyzer.analyze_chapter_cached({'waves': [wave]}, state)[0]
+        return analysis.record(self.details(query))
+
+    async def analyze_chapter(self, payload, query):
+        chapter, state = self.chapter_request(payload)
+        details = self.details(query)
+        return {
+            'chapter_id': chapter.get('chapterId'),
+            'weapon_tier': state.weapon_tier,
+            'hero_count': state.hero_count,
+            'waves': [analysis.record(details) for analysis in self.analyzer.analyze_chapter_cached(chapter, state)],
+        }
+
+    async def simulate(self, payload, query):
+        chapter, state = self.chapter_request(payload)
+        targeting = payload.get('targeting', 'nearest')
+        if targeting not in EventSimulator.TARGETING_POLICIES:
+            raise ValueError(f"Unknown targeting policy '{targeting}'")
+        return await self.offload('simulate', {'chapter': chapter, 'weapon_tier': state.weapon_tier, 'targeting': targeting})
+
+    async def monte_carlo(self, payload, query):
+        require_numpy()
+        params = {
+            'trials': int(payload.get('trials', 1000)),
+            'seed': int(payload.get('seed', 0)),
+            'catch_speed': payload.get('catchSpeed', "normal:8,2"),
+            'hit_rate': payload.get('hitRate', "beta:9,1"),
+            'catch_success': payload.get('catchSuccess', "0.9"),
+        }
+        # Parse here so bad distributions fail fast with a 400 instead of inside a worker
+        Distribution.parse(params['catch_speed'])
+        Distribution.parse(params['hit_rate'])
+        Distribution.parse(params['catch_success'])
+        return await self.offload('monte_carlo', params)
+
+    async def sensitivity(self, payload, query):
+        require_numpy()
+        return await self.offload('sensitivity', {'top': int(payload.get('top', 3))})
+
+    # -- Helpers
+
+    @staticmethod
+    def details(query: Dict) -> bool:
+        return query.get('details', ['0'])[-1] not in ('0', 'false', '')
+
+    def chapter_request(self, payload: Dict) -> Tuple[Dict, ChapterState]:
+        """Chapter and starting state for a chapter request body"""
+        chapter = payload.get('chapter', payload)
+        if not isinstance(chapter.get('waves'), list):
+            raise ValueError("chapter has no 'waves' list")
+        state = ChapterState()
+        for index, loaded in enumerate(self.analyzer.chapters):
+            if loaded.get('chapterId') == chapter.get('chapterId'):
+                state = self.analyzer.get_chapter_starting_state(index)
+                break
+        state = ChapterState(int(payload.get('weaponTier', state.weapon_tier)),
+                             int(payload.get('heroCount', state.hero_count)))
+        return chapter, state
+
+    async def offload(self, job: str, params: Dict):
+        """Run a CPU-heavy job on the worker pool without blocking the event loop"""
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        if self.workers < 1:
+            # No pool: still keep the loop responsive by using a thread
+            return await loop.run_in_executor(None, self._run_local, job, params)
+        if self.executor is None:
+            from concurrent.futures import ProcessPoolExecutor
+            self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_service_worker_init,
+                                                initargs=(str(self.analyzer.config_dir),
+                                                          wave_calibrations(self.analyzer.chapters)))
+        return await loop.run_in_executor(self.executor, _service_worker_run, (job, params))
+
+    def _run_local(self, job: str, params: Dict):
+        global _worker_service_analyzer
+        _worker_service_analyzer = self.analyzer
+        return _service_worker_run((job, params))
+
+    def restart_pool(self):
+        """Drop the worker pool so the next heavy job starts workers on the current configs"""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+
+    async def coalesce(self, key: Tuple, compute):
+        """Await compute(), sharing one in-flight result between identical concurrent requests"""
+        import asyncio
+
+        future = self.inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(compute())
+            self.inflight[key] = future
+            future.add_done_callback(lambda _: self.inflight.pop(key, None))
+        else:
+            self.counters['coalesced'] += 1
+        # Shield so one client disconnecting does not cancel the shared work
+        return await asyncio.shield(future)
+
+    async def dispatch(self, method: str, target: str, body: bytes) -> Tuple[int, object]:
+        """(HTTP status, JSON-ready response) for one request"""
+        from urllib.parse import parse_qs, urlsplit
+
+        url = urlsplit(target)
+        handler = self.routes.get((method, url.path))
+        if handler is None:
+            known = any(path == url.path for _, path in self.routes)
+            return (405 if known else 404), {'error': f"{method} {url.path} not supported"}
+
+        query = parse_qs(url.query)
+        try:
+            payload = json.loads(body) if body else {}
+            if not isinstance(payload, dict):
+                raise ValueError("request body must be a JSON object")
+            if method != 'POST':
+                return 200, await handler(payload, query)
+            key = (url.path, url.query, ChapterResultStore.chapter_hash(payload))
+            return 200, await self.coalesce(key, lambda: handler(payload, query))
+        except (KeyError, TypeError, ValueError) as error:
+            self.counters['errors'] += 1
+            message = f"missing field {error}" if isinstance(error, KeyError) else str(error)
+            return 400, {'error': message}
+        except Exception as error:  # Keep serving; report the failure to the client
+            self.counters['errors'] += 1
+            print(f"[SERVICE] {method} {url.path} failed: {error!r}", file=sys.stderr)
+            return 500, {'error': f"{type(error).__name__}: {error}"}
+
+    async def handle_connection(self, reader, writer):
+        """Serve HTTP/1.1 requests (with keep-alive) on one connection"""
+        import asyncio
+        import time
+
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode('latin-1').partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                parts = request_line.decode('latin-1').split()
+                length = int(headers.get('content-length', 0) or 0) if len(parts) == 3 else -1
+                if length < 0 or length > self.MAX_BODY:
+                    status = 400 if length < 0 else 413
+                    await self.respond(writer, status, {'error': "bad request line" if length < 0 else "body too large"}, False)
+                    break
+                method, target, version = parts
+                body = await reader.readexactly(length) if length else b""
+
+                start = time.perf_counter()
+                if method == 'OPTIONS':
+                    status, response = 204, None
+                else:
+                    self.counters['requests'] += 1
+                    status, response = await self.dispatch(method, target, body)
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                await self.respond(writer, status, response, keep_alive)
+                self.latencies.append(time.perf_counter() - start)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def respond(writer, status: int, response, keep_alive: bool):
+        from http import HTTPStatus
+
+        body = b"" if response is None else json.dumps(response, default=_json_default).encode('utf-8')
+        head = (
+            f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            # CORS for in-browser debug tools, as in server/logger.cjs
+            "Access-Control-Allow-Origin: *\r\n"
+            "Access-Control-Allow-Headers: Content-Type\r\n"
+            "Access-Control-Allow-Methods: GET, POST, OPTIONS\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode('latin-1') + body)
+        await writer.drain()
+
+    async def watch_configs(self):
+        """Reload changed config files in the background, like --watch"""
+        import asyncio
+
+        previous = self.watcher.snapshot()
+        while True:
+            await asyncio.sleep(self.POLL_INTERVAL)
+            current = self.watcher.snapshot()
+            if current == previous:
+                continue
+            changed = [path for path in set(current) | set(previous) if current.get(path) != previous.get(path)]
+            if self.watcher.reload(changed):
+                previous = current
+                self.counters['reloads'] += 1
+                self.restart_pool()
+                print(f"[SERVICE] Reloaded {', '.join(sorted(path.name for path in changed))}")
+
+    async def serve(self, host: str, port: int):
+        import asyncio
+
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        watcher = asyncio.ensure_future(self.watch_configs())
+        print(f"[SERVICE] Balance analyzer listening on http://{host}:{port} ({self.workers} workers, Ctrl+C to stop)")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            watcher.cancel()
+            self.restart_pool()
+
+def run_service(analyzer: BalanceAnalyzer, host: str, port: int, workers: int = None):
+    """Serve analyses over HTTP until interrupted"""
+    import asyncio
+
+    service = BalanceService(analyzer, workers)
+    # Warm the result store with the loaded campaign before taking requests
+    for _ in analyzer.iter_campaign():
+        pass
+    try:
+        asyncio.run(service.serve(host, port))
+    except KeyboardInterrupt:
+        print("\n[SERVICE] Stopped")
+
+def main():
+    parser = argparse.ArgumentParser(description="Zomboid Assault chapter balance analyzer")
+    parser.add_argument("--batch", action="store_true",
+                        help="analyze all waves with the vectorized NumPy engine")
+    parser.add_argument("--simulate", action="store_true",
+                        help="run the discrete-event spawn/kill simulation for time-to-breach")
+    parser.add_argument("--targeting", default="nearest", choices=EventSimulator.TARGETING_POLICIES,
+                        help="which zomboid the simulated player shoots first (default: nearest)")
+    parser.add_argument("--game-sim", action="store_true",
+                        help="play every wave in the headless fixed-timestep game simulator and compare with the grades "
+                             "(each play runs at ~1000x real time or faster on one core)")
+    parser.add_argument("--policy", default="timers", choices=GameSimulator.POLICIES,
+                        help="player policy for --game-sim (default: timers)")
+    parser.add_argument("--seeds", type=int, default=8, help="plays per wave for --game-sim (default: 8)")
+    parser.add_argument("--pools", action="store_true",
+                        help="estimate peak live entities per wave and recommend ObjectPool sizes")
+    parser.add_argument("--entity-budget", type=int, default=DEFAULT_ENTITY_BUDGET,
+                        help=f"live entities per frame --pools flags waves above (default: {DEFAULT_ENTITY_BUDGET})")
+    parser.add_argument("--heroes", type=int, default=None,
+                        help="squad size --pools assumes (default: maxHeroCount from heroes.json)")
+    parser.add_argument("--hp-curve", action="store_true",
+                        help="bin every wave in time and report spawned/killable HP and the peak backlog")
+    parser.add_argument("--resolution", type=float, default=0.1,
+                        help="bin width in seconds for --hp-curve (default: 0.1)")
+    parser.add_argument("--curve", default=None, choices=("ascii", "csv"),
+                        help="with --hp-curve, draw problem waves as ASCII bars or write their curves as CSV")
+    parser.add_argument("--sensitivity", action="store_true",
+                        help="rank the config fields that change each wave's overkill and bullet ratios the most")
+    parser.add_argument("--top", type=int, default=3, help="fields listed per wave for --sensitivity (default: 3)")
+    parser.add_argument("--routes", action="store_true",
+                        help="search the best and worst timer catch/skip routes through every wave and chapter")
+    parser.add_argument("--monte-carlo", action="store_true",
+                        help="sample player skill over many seeded trials and report percentile ratios")
+    parser.add_argument("--trials", type=int, default=10000, help="trials for --monte-carlo (default: 10000)")
+    parser.add_argument("--catch-speed", default="normal:8,2",
+                        help="timer points/sec distribution for --monte-carlo (default: normal:8,2)")
+    parser.add_argument("--hit-rate", default="beta:9,1",
+                        help="accuracy distribution for --monte-carlo (default: beta:9,1)")
+    parser.add_argument("--catch-success", default="0.9",
+                        help="chance to land each upgrade timer for --monte-carlo (default: 0.9)")
+    parser.add_argument("--watch", action="store_true",
+                        help="re-analyze chapters whenever files under public/config change")
+    parser.add_argument("--history", default=None, metavar="A..B",
+                        help="per-wave grade timeline across the commits in a git range that change the configs")
+    parser.add_argument("--ingest-log", nargs="?", const="", default=None, metavar="LOG",
+                        help="fit model constants from new lines of a gameplay log (default: logs/game.log)")
+    parser.add_argument("--calibration", default=None,
+                        help="calibration profile to apply to every mode, and to update with --ingest-log "
+                             "(default for --ingest-log: logs/calibration.json)")
+    parser.add_argument("--serve", action="store_true",
+                        help="run a long-lived HTTP/JSON analysis service with configs and results kept warm")
+    parser.add_argument("--host", default="127.0.0.1", help="address for --serve (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=3101, help="port for --serve (default: 3101)")
+    parser.add_argument("--stream", nargs="+", default=None, metavar="SOURCE",
+                        help="report on chapter files, directories, globs or JSONL bundles one chapter at a time "
+                             "instead of public/config/chapters")
+    parser.add_argument("--max-listed", type=int, default=None,
+                        help=f"problem waves listed per summary list, worst first "
+                             f"(default: all, or {STREAM_LISTED_WAVES} with --stream)")
+    parser.add_argument("--cache-dir", default=None,
+                        help="on-disk result cache (default: .balance_cache next to this script)")
+    parser.add_argument("--no-cache", action="store_true", help="do not read or write the on-disk result cache")
+    parser.add_argument("--format", default="text", choices=("text", "json", "jsonl", "csv"),
+                        help="report format; json/jsonl/csv stream one record per wave (default: text)")
+    parser.add_argument("--details", action="store_true",
+                        help="include the per-wave breakdown in json/jsonl records")
+    parser.add_argument("--profile", action="store_true",
+                        help="print per-method wall time and call counts after the run")
+    parser.add_argument("--profile-output", default=None,
+                        help="also write cProfile stats to this file (implies --profile)")
+    parser.add_argument("--autobalance", action="store_true",
+                        help="search wave parameters until every wave grades inside the target bands")
+    parser.add_argument("--target-grade", default="A-C",
+                        help="DPS grade band for --autobalance (default: A-C)")
+    parser.add_argument("--target-bullet-grade", default="A-C",
+                        help="bullet grade band for --autobalance (default: A-C)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes for --autobalance/--monte-carlo/--serve/--history (default: CPU count)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for --autobalance/--monte-carlo/--game-sim")
+    parser.add_argument("--output", default="balance_proposals",
+                        help="directory for proposed chapter JSON (default: balance_proposals)")
+    args = parser.parse_args()
+
+    # Determine config directory
+    script_dir = Path(__file__).parent
+    config_dir = script_dir / "public" / "config"
+
+    if not config_dir.exists():
+        print(f"Error: Config directory not found at {config_dir}")
+        return
+
+    if args.ingest_log is not None:
+        args.ingest_log = args.ingest_log or str(script_dir / "logs" / "game.log")
+        args.calibration = args.calibration or str(script_dir / "logs" / "calibration.json")
+
+    cache_dir = None if args.no_cache else Path(args.cache_dir or script_dir / ".balance_cache")
+    analyzer = BalanceAnalyzer(config_dir, cache_dir)
+
+    if not (args.profile or args.profile_output):
+        run(analyzer, args)
+        return
+
+    with AnalyzerProfiler(analyzer, args.profile_output) as profiler:
+        run(analyzer, args)
+    # Keep structured stdout clean
+    profiler.print_table(sys.stdout if args.format == "text" else sys.stderr)
+
+def run(analyzer: BalanceAnalyzer, args):
+    """Load configs and run the mode selected on the command line"""
+    verbose = args.format == "text" and args.curve != "csv"
+    analyzer.load_configs(verbose=verbose)
+
+    if args.history:
+        run_history(analyzer, args.history, args.workers)
+        return
+
+    if args.ingest_log is not None:
+        run_ingest(analyzer, Path(args.ingest_log), Path(args.calibration))
+        return
+
+    if args.calibration:
+        calibrated = CalibrationProfile.load(Path(args.calibration)).apply(analyzer)
+        if verbose:
+            print(f"Calibrated timer catch speed for {calibrated} waves from {args.calibration}\n")
+
+    if args.watch:
+        ConfigWatcher(analyzer).run()
+        return
+
+    if args.serve:
+        run_service(analyzer, args.host, args.port, args.workers)
+        return
+
+    if args.batch:
+        run_batch(analyzer)
+        return
+
+    if args.autobalance:
+        run_autobalance(analyzer, args)
+        return
+
+    if args.monte_carlo:
+        run_monte_carlo(analyzer, args)
+        return
+
+    if args.hp_curve:
+        run_hp_curves(analyzer, args.resolution, args.curve)
+        return
+
+    if args.sensitivity:
+        run_sensitivity(analyzer, args.top)
+        return
+
+    if args.routes:
+        run_routes(analyzer)
+        return
+
+    if args.simulate:
+        run_simulation(analyzer, args.targeting)
+        return
+
+    if args.game_sim:
+        run_game_simulation(analyzer, args.policy, args.seeds, args.seed)
+        return
+
+    if args.pools:
+        run_pools(analyzer, args.entity_budget, args.heroes)
+        return
+
+    campaign = analyzer.stream_campaign(chapter for _, chapter in iter_chapter_sources(args.stream)) if args.stream else None
+    if args.format != "text":
+        analyzer.write_records(args.format, include_details=args.details, campaign=campaign)
+        return
+
+    limit = args.max_listed if args.max_listed is not None else STREAM_LISTED_WAVES if args.stream else None
+    analyzer.print_report(campaign, CampaignSummary(limit))
 
 if __name__ == "__main__":
     main()
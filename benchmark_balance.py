@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Zomboid Assault - Balance Analyzer Benchmark
+
+Measures the throughput of analyze_balance.py on synthetic campaigns:
+1. Generates seeded chapters in the same schema as public/config/chapters/*.json
+2. Times load_configs (JSON and compiled snapshot), analyze_wave, analyze_chapter and print_report separately
+3. Records waves/sec and peak memory per stage
+4. Compares against a stored baseline (benchmark_baseline.json) so slowdowns fail loudly;
+   a missing baseline is an error too. Stage times are stored in units of a fixed
+   pure-Python calibration workload timed in the same run, so the baseline holds
+   across machines
+
+Usage:
+    python benchmark_balance.py                         # 10 .. 10,000 waves
+    python benchmark_balance.py --sizes 10,1000000      # up to a million waves
+    python benchmark_balance.py --update-baseline       # record current numbers
+"""
+
+import argparse
+import contextlib
+import gc
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List
+
+from analyze_balance import BalanceAnalyzer
+
+STAGES = ("load_configs", "load_snapshot", "analyze_wave", "analyze_chapter", "print_report")
+TIMER_TYPES = ("hero_add_timer", "rapid_hero_timer", "weapon_upgrade_timer")
+COLUMNS = (['left'], ['right'], ['left', 'right'])
+# Stages faster than this in the current run are reported but not compared (timer noise dominates)
+MIN_COMPARE_SECONDS = 0.05
+CALIBRATION_WAVES = 500
+
+def generate_wave(rng: random.Random, wave_id: int, zomboid_ids: List[str], max_tier: int, tier: int) -> Dict:
+    """One random wave: 1-5 zomboid patterns and 0-3 timers"""
+    duration = rng.randint(20, 60)
+
+    zomboids = []
+    for _ in range(rng.randint(1, 5)):
+        zomboids.append({
+            "type": rng.choice(zomboid_ids),
+            "count": rng.randint(1, 60),
+            "spawnRate": round(rng.uniform(0.2, 3.0), 1),
+            "columns": rng.choice(COLUMNS),
+            "spawnDelay": rng.randint(0, duration // 2),
+        })
+
+    timers = []
+    for _ in range(rng.randint(0, 3)):
+        timer_type = rng.choice(TIMER_TYPES)
+        timer = {
+            "type": timer_type,
+            "spawnTime": rng.randint(2, duration - 5),
+            "column": rng.choice(("left", "right")),
+            "startValue": -5 * rng.randint(2, 11),
+        }
+        if timer_type == "weapon_upgrade_timer":
+            tier = min(tier + 1, max_tier)
+            timer['resetHeroCount'] = rng.random() < 0.5
+            timer['weaponTier'] = tier
+        timers.append(timer)
+
+    return {
+        "waveId": wave_id,
+        "waveName": f"Synthetic Wave {wave_id}",
+        "duration": duration,
+        "spawnPattern": {"zomboids": zomboids, "timers": timers},
+    }
+
+def generate_chapters(wave_count: int, zomboid_ids: List[str], max_tier: int,
+                      waves_per_chapter: int = 10, seed: int = 0) -> List[Dict]:
+    """Seeded chapter dicts totalling wave_count waves"""
+    rng = random.Random(seed)
+    chapters = []
+    tier = 1
+    for index in range(0, wave_count, waves_per_chapter):
+        number = len(chapters) + 1
+        waves = []
+        for wave_id in range(1, min(waves_per_chapter, wave_count - index) + 1):
+            wave = generate_wave(rng, wave_id, zomboid_ids, max_tier, tier)
+            waves.append(wave)
+        chapters.append({
+            "chapterId": f"chapter-{number:02d}",
+            "chapterName": f"Synthetic Chapter {number}",
+            "description": "Generated by benchmark_balance.py",
+            "unlockRequirement": f"chapter-{number - 1:02d}" if number > 1 else None,
+            "waves": waves,
+        })
+    return chapters
+
+def write_config_dir(source_dir: Path, target_dir: Path, chapters: List[Dict]):
+    """Config directory with the real entity files and generated chapters"""
+    shutil.copytree(source_dir / "entities", target_dir / "entities")
+    settings = source_dir / "game-settings.json"
+    if settings.exists():
+        shutil.copy(settings, target_dir / "game-settings.json")
+    chapters_dir = target_dir / "chapters"
+    chapters_dir.mkdir(parents=True)
+    # Zero-padded wide enough that sorted() keeps campaign order
+    width = max(2, len(str(len(chapters))))
+    for number, chapter in enumerate(chapters, 1):
+        with open(chapters_dir / f"chapter-{number:0{width}d}.json", "w") as f:
+            json.dump(chapter, f)
+
+def calibration_seconds() -> float:
+    """
+    Wall time of a fixed workload that does not touch the analyzer: a JSON
+    round trip and dict/float arithmetic over a seeded corpus, the same
+    mix of work as the stages. Stage times divided by it compare across
+    machines.
+    """
+    payload = json.dumps(generate_chapters(CALIBRATION_WAVES, ["a", "b", "c"], 7, seed=0))
+    start = time.perf_counter()
+    chapters = json.loads(payload)
+    totals = {}
+    for chapter in chapters:
+        for wave in chapter['waves']:
+            for pattern in wave['spawnPattern']['zomboids']:
+                hp = pattern['count'] * (1 + len(pattern['columns']))
+                totals[pattern['type']] = totals.get(pattern['type'], 0.0) + hp / pattern['spawnRate']
+    json.dumps(chapters, indent=2, sort_keys=True)
+    return time.perf_counter() - start
+
+def run_stages(config_dir: Path, repeat: int = 1) -> Dict[str, float]:
+    """
+    Best wall time of each stage, and of the calibration workload run
+    alongside them, over `repeat` runs, so one noisy run cannot fail the
+    comparison
+    """
+    timings = {}
+    # Like timeit, keep the collector out of the timings: its cost grows with whatever else is alive
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            current = time_stages(config_dir)
+            current['calibration'] = min(calibration_seconds(), calibration_seconds())
+            for stage, seconds in current.items():
+                timings[stage] = min(seconds, timings.get(stage, seconds))
+            gc.collect()
+    finally:
+        gc.enable()
+    return timings
+
+def time_stages(config_dir: Path) -> Dict[str, float]:
+    """Wall time of each stage on a fresh analyzer (no disk cache)"""
+    timings = {}
+    analyzer = BalanceAnalyzer(config_dir)
+
+    start = time.perf_counter()
+    analyzer.load_configs(verbose=False)
+    timings['load_configs'] = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        # The first load compiles the snapshot; the timed one maps it
+        BalanceAnalyzer(config_dir, cache_dir).load_configs(verbose=False)
+        start = time.perf_counter()
+        BalanceAnalyzer(config_dir, cache_dir).load_configs(verbose=False)
+        timings['load_snapshot'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for chapter in analyzer.chapters:
+        for wave in chapter['waves']:
+            analyzer.analyze_wave(wave, 1)
+    timings['analyze_wave'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for chapter in analyzer.chapters:
+        analyzer.analyze_chapter(chapter)
+    timings['analyze_chapter'] = time.perf_counter() - start
+
+    analyzer.results.clear()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        analyzer.print_report()
+        timings['print_report'] = time.perf_counter() - start
+
+    return timings
+
+def measure_memory(config_dir: Path) -> Dict[str, int]:
+    """Peak traced memory (bytes) of each stage; a separate pass because tracing slows everything down"""
+    peaks = {}
+    snapshot_dir = tempfile.mkdtemp()
+    BalanceAnalyzer(config_dir, snapshot_dir).load_configs(verbose=False)
+    tracemalloc.start()
+    try:
+        analyzer = BalanceAnalyzer(config_dir)
+        stages = {
+            "load_configs": lambda: analyzer.load_configs(verbose=False),
+            "load_snapshot": lambda: BalanceAnalyzer(config_dir, snapshot_dir).load_configs(verbose=False),
+            "analyze_wave": lambda: [analyzer.analyze_wave(wave, 1) for chapter in analyzer.chapters for wave in chapter['waves']],
+            "analyze_chapter": lambda: [analyzer.analyze_chapter(chapter) for chapter in analyzer.chapters],
+            "print_report": analyzer.print_report,
+        }
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            for stage in STAGES:
+                analyzer.results.clear()
+                tracemalloc.reset_peak()
+                stages[stage]()
+                peaks[stage] = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+        shutil.rmtree(snapshot_dir, ignore_errors=True)
+    return peaks
+
+def compare(results: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Stages whose calibrated throughput dropped more than `tolerance` below the baseline"""
+    regressions = []
+    for size, stages in results.items():
+        for stage, metrics in stages.items():
+            expected = baseline.get(size, {}).get(stage, {}).get("calibrated")
+            if not expected or metrics['seconds'] < MIN_COMPARE_SECONDS:
+                continue
+            # Calibrated times: a slower stage takes more calibration units
+            drop = 1 - expected / metrics['calibrated']
+            if drop > tolerance:
+                regressions.append(
+                    f"  - {size} waves / {stage}: {metrics['calibrated']:.2f} calibration units vs baseline "
+                    f"{expected:.2f} ({drop * 100:.0f}% slower)"
+                )
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Zomboid Assault balance analyzer")
+    parser.add_argument("--sizes", default="10,100,1000,10000",
+                        help="comma-separated wave counts to generate (default: 10,100,1000,10000)")
+    parser.add_argument("--waves-per-chapter", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="runs per size; each stage keeps its best time (default: 3)")
+    parser.add_argument("--no-memory", action="store_true", help="skip the (slower) peak-memory pass")
+    parser.add_argument("--baseline", default=str(Path(__file__).parent / "benchmark_baseline.json"),
+                        help="baseline file to compare against (default: benchmark_baseline.json)")
+    parser.add_argument("--update-baseline", action="store_true", help="write the current results as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed calibrated throughput drop before failing (default: 0.25 = 25%%)")
+    args = parser.parse_args()
+
+    source_dir = Path(__file__).parent / "public" / "config"
+    entities = BalanceAnalyzer(source_dir)
+    entities.load_entities()
+    zomboid_ids = list(entities.zomboids)
+    max_tier = max(entities.weapons)
+
+    print("=" * 80)
+    print("ZOMBOID ASSAULT - BALANCE ANALYZER BENCHMARK")
+    print("=" * 80)
+    print(f"{'Waves':>10}  {'Stage':<16} {'Time':>10} {'Calibrated':>11} {'Waves/sec':>14} {'Peak memory':>12}")
+
+    results = {}
+    for size in (int(value) for value in args.sizes.split(",")):
+        chapters = generate_chapters(size, zomboid_ids, max_tier, args.waves_per_chapter, args.seed)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config_dir = Path(temp_dir)
+            write_config_dir(source_dir, config_dir, chapters)
+            del chapters
+
+            timings = run_stages(config_dir, args.repeat)
+            peaks = {} if args.no_memory else measure_memory(config_dir)
+
+        stages = {}
+        for stage in STAGES:
+            seconds = timings[stage]
+            stages[stage] = {
+                "seconds": seconds,
+                "calibrated": seconds / timings['calibration'],
+                "waves_per_sec": size / seconds if seconds > 0 else 0.0,
+            }
+            if stage in peaks:
+                stages[stage]['peak_memory_bytes'] = peaks[stage]
+            memory = f"{peaks[stage] / 2**20:.1f} MB" if stage in peaks else "-"
+            print(f"{size:>10,}  {stage:<16} {seconds * 1000:>8.1f}ms {stages[stage]['calibrated']:>11.3f} "
+                  f"{stages[stage]['waves_per_sec']:>14,.0f} {memory:>12}")
+        results[str(size)] = stages
+
+    baseline_path = Path(args.baseline)
+    if args.update_baseline:
+        with open(baseline_path, "w") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+        print(f"\nBaseline written to {baseline_path}")
+        return
+
+    if not baseline_path.exists():
+        print(f"\n[ERROR]: No baseline at {baseline_path}; run with --update-baseline to record one.")
+        sys.exit(1)
+
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n[REGRESSION] {len(regressions)} stages slower than baseline (tolerance {args.tolerance * 100:.0f}%):")
+        for regression in regressions:
+            print(regression)
+        sys.exit(1)
+    print(f"\n[SUCCESS] No stage more than {args.tolerance * 100:.0f}% slower than baseline.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import analyze_balance  # noqa: E402
+
+
+@pytest.fixture
+def analyzer():
+    """The shipped campaign, loaded without the on-disk cache"""
+    analyzer = analyze_balance.BalanceAnalyzer(ROOT / "public" / "config")
+    analyzer.load_configs(verbose=False)
+    return analyzer
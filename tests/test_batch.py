@@ -0,0 +1,29 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from analyze_balance import BatchAnalyzer  # noqa: E402
+
+FIELDS = ('total_zomboid_hp', 'damage_capacity', 'weapon_tier_start', 'weapon_tier_end', 'overkill_ratio',
+          'bullets_available', 'bullets_needed', 'overkill_waste', 'bullet_ratio')
+
+
+def test_batch_matches_analyze_wave(analyzer):
+    engine = BatchAnalyzer(analyzer)
+    result = engine.analyze(engine.pack_campaign(analyzer.chapters))
+
+    index, tier = 0, 1
+    for chapter in analyzer.chapters:
+        for wave in chapter['waves']:
+            expected = analyzer.analyze_wave(wave, tier)
+            for field in FIELDS:
+                assert getattr(result, field)[index] == getattr(expected, field), (wave['waveName'], field)
+            assert result.grade(index) == expected.grade, wave['waveName']
+            assert result.bullet_grade(index) == expected.bullet_grade, wave['waveName']
+            tier = expected.weapon_tier_end
+            index += 1
+    assert index == len(result)
+
+
+def test_verify_against_scalar_is_clean(analyzer):
+    assert BatchAnalyzer(analyzer).verify_against_scalar(analyzer.chapters) == []
@@ -0,0 +1,13 @@
+from analyze_balance import restore_calibrations, wave_catch_speed, without_calibration
+
+
+def test_written_chapters_drop_calibration(analyzer):
+    chapter = analyzer.chapters[0]
+    restore_calibrations(analyzer, [{'catchPointsPerSecond': 5.0}] * len(chapter['waves']))
+
+    written = without_calibration(analyzer.chapters[0])
+
+    assert all('calibration' not in wave for wave in written['waves'])
+    assert written['waves'][0]['spawnPattern'] == analyzer.chapters[0]['waves'][0]['spawnPattern']
+    # The loaded campaign keeps its calibration for analysis
+    assert wave_catch_speed(analyzer.chapters[0]['waves'][0]) == 5.0
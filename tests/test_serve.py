@@ -0,0 +1,42 @@
+import asyncio
+import json
+
+from analyze_balance import BalanceService
+
+
+async def post(service, path, payload):
+    """One HTTP/1.1 request against the service on an ephemeral port; (status, JSON body)"""
+    server = await asyncio.start_server(service.handle_connection, '127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        body = json.dumps(payload).encode('utf-8')
+        writer.write(f"POST {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+                     f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode('latin-1') + body)
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+    finally:
+        server.close()
+        await server.wait_closed()
+
+    head, _, content = response.partition(b"\r\n\r\n")
+    status = int(head.split(b" ")[1])
+    return status, json.loads(content)
+
+
+def test_analyze_wave_round_trip(analyzer):
+    wave = analyzer.chapters[0]['waves'][0]
+    service = BalanceService(analyzer, workers=1)
+
+    status, response = asyncio.run(post(service, '/analyze/wave', {'wave': wave, 'weaponTier': 1}))
+
+    assert status == 200
+    assert response == json.loads(json.dumps(analyzer.analyze_wave(wave, 1).record()))
+    assert service.counters['requests'] == 1
+
+
+def test_unknown_route_is_404(analyzer):
+    status, response = asyncio.run(post(BalanceService(analyzer, workers=1), '/nope', {}))
+    assert status == 404
+    assert 'error' in response